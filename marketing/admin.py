@@ -86,6 +86,12 @@ class CarModelAdmin(admin.ModelAdmin):
 	prepopulated_fields = {"slug": ("name",)}
 	inlines = [CarVariantInline]
 
+	def save_model(self, request, obj, form, change):
+		# A powertrain picked here is deliberate, so backfill_powertrain must not reclassify it.
+		if not change or "powertrain" in form.changed_data:
+			obj.powertrain_classified = True
+		super().save_model(request, obj, form, change)
+
 
 @admin.register(CarVariant)
 class CarVariantAdmin(admin.ModelAdmin):
@@ -0,0 +1,103 @@
+"""
+In-process registry of manufacturer and model names and slugs.
+
+Each worker keeps one registry and reloads it when the inventory version
+changes, so resolving a slug or naming a filter costs no database round-trip.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .models import CarManufacturer, CarModel
+from .versioning import INVENTORY, get_version
+
+
+@dataclass(frozen=True)
+class ManufacturerEntry:
+	id: int
+	name: str
+	slug: str
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+	id: int
+	name: str
+	slug: str
+	manufacturer: ManufacturerEntry
+
+	@property
+	def full_name(self) -> str:
+		return f"{self.manufacturer.name} {self.name}"
+
+
+@dataclass(frozen=True)
+class CatalogueRegistry:
+	"""Active manufacturers and models, looked up by id or slug."""
+
+	version: int
+	manufacturers: dict[int, ManufacturerEntry]
+	models: dict[int, ModelEntry]
+	manufacturer_slugs: dict[str, int]
+	model_slugs: dict[str, int]
+
+	@classmethod
+	def load(cls, version: int) -> CatalogueRegistry:
+		manufacturers = {
+			row["id"]: ManufacturerEntry(**row)
+			for row in CarManufacturer.objects.filter(is_active=True).order_by("name").values("id", "name", "slug")
+		}
+		models = {}
+		model_rows = CarModel.objects.filter(is_active=True, manufacturer_id__in=manufacturers).order_by("name")
+		for row in model_rows.values("id", "name", "slug", "manufacturer_id"):
+			manufacturer = manufacturers[row.pop("manufacturer_id")]
+			models[row["id"]] = ModelEntry(manufacturer=manufacturer, **row)
+		return cls(
+			version=version,
+			manufacturers=manufacturers,
+			models=models,
+			manufacturer_slugs={entry.slug: entry.id for entry in manufacturers.values() if entry.slug},
+			model_slugs={entry.slug: entry.id for entry in models.values() if entry.slug},
+		)
+
+	def manufacturer(self, value) -> ManufacturerEntry | None:
+		"""Find an active manufacturer by id or slug."""
+		return self.manufacturers.get(_lookup_id(value, self.manufacturer_slugs))
+
+	def model(self, value) -> ModelEntry | None:
+		"""Find an active model by id or slug."""
+		return self.models.get(_lookup_id(value, self.model_slugs))
+
+	def manufacturer_by_slug(self, slug: str) -> ManufacturerEntry | None:
+		return self.manufacturers.get(self.manufacturer_slugs.get(slug))
+
+	def model_by_slug(self, slug: str) -> ModelEntry | None:
+		return self.models.get(self.model_slugs.get(slug))
+
+	def models_for(self, manufacturer_id: int) -> list[ModelEntry]:
+		"""Active models of one manufacturer, ordered by name."""
+		return [entry for entry in self.models.values() if entry.manufacturer.id == manufacturer_id]
+
+
+def _lookup_id(value, slugs: dict[str, int]) -> int | None:
+	if value is None or value == "":
+		return None
+	if isinstance(value, int):
+		return value
+	value = str(value).strip()
+	if value.isdigit():
+		return int(value)
+	return slugs.get(value)
+
+
+_registry: CatalogueRegistry | None = None
+
+
+def get_catalogue() -> CatalogueRegistry:
+	"""The registry for the current inventory version, reloading it if stale."""
+	global _registry
+	version = get_version(INVENTORY)
+	registry = _registry
+	if registry is None or registry.version != version:
+		registry = _registry = CatalogueRegistry.load(version)
+	return registry
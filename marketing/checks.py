@@ -0,0 +1,33 @@
+"""
+System checks for the marketing app.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose data lives in one process, so a version bump in one worker is
+# never seen by the others.
+PER_PROCESS_CACHES = (
+	"django.core.cache.backends.locmem.LocMemCache",
+	"django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_version_cache(app_configs, **kwargs):
+	backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+	if backend not in PER_PROCESS_CACHES:
+		return []
+	return [
+		Error(
+			"The default cache is not shared between processes.",
+			hint=(
+				"The content and inventory version counters live in the default cache; "
+				"with a per-process backend, admin edits invalidate only the worker that "
+				"made them. Set REDIS_URL or use a shared backend such as DatabaseCache."
+			),
+			obj=backend,
+			id="marketing.E001",
+		)
+	]
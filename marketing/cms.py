@@ -0,0 +1,174 @@
+"""
+Immutable snapshot of the marketing CMS content, built once per content version.
+
+Section copy, page configs, navigation links and the homepage and financing
+lists are small and rarely edited, so each worker reads them all together
+after a content change and views then read plain attributes with no queries.
+Fallback copy for pages without a config is merged in when the snapshot is
+built.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
+from typing import Mapping
+
+from django.db.models import QuerySet
+
+from .models import (
+	FinancingBenefit,
+	FinancingPageConfig,
+	FinancingSnapshotItem,
+	HomepageBrandMetric,
+	HomepageCategory,
+	HomepageContactCard,
+	HomepageFinancingHighlight,
+	HomepageFinancingStep,
+	HomepageHero,
+	HomepageSectionCopy,
+	HomepageValueProposition,
+	InventoryPageConfig,
+	NavigationLink,
+)
+from .versioning import CONTENT, get_version
+
+# Financing page copy used for any field the active config leaves blank.
+FINANCING_DEFAULTS = {
+	"hero_title": "Buy your dream car, now. Pay monthly.",
+	"hero_subtitle": "Todde Financing makes car ownership accessible with transparent offers, fair interest rates, and bundled protection.",
+	"hero_primary_cta_label": "Start now",
+	"hero_primary_cta_url": "/financing/",
+	"hero_secondary_cta_label": "Explore inventory",
+	"hero_secondary_cta_url": "/#inventory",
+	"hero_background_image_url": "https://images.unsplash.com/photo-1517677129300-07b130802f46?auto=format&fit=crop&w=1400&q=80",
+	"hero_callout_title": "Need advice?",
+	"hero_callout_text": "Book a free financing clinic every Friday at Todde hubs nationwide.",
+	"steps_heading": "How Todde Financing works",
+	"steps_subheading": "Eight clear steps to owning your vehicle with confidence.",
+	"benefits_heading": "What you get with every plan",
+	"benefits_subheading": "",
+	"eligibility_heading": "Eligibility snapshot",
+	"eligibility_description": "Minimum monthly income of ₦250,000, verifiable employment, and BVN confirmation.",
+	"eligibility_cta_label": "Review full requirements",
+	"eligibility_cta_url": "/financing/",
+	"testimonial_image_url": "https://images.unsplash.com/photo-1502877338535-766e1452684a?auto=format&fit=crop&w=900&q=80",
+	"testimonial_card_title": "Todde customer stories",
+	"testimonial_card_text": "“Financing with Todde helped our logistics business scale in 3 months.”",
+	"corporate_heading": "Bring Todde Financing to your business fleets",
+	"corporate_subheading": "Talk to us about flexible corporate plans, driver training, and maintenance coordination.",
+	"corporate_primary_cta_label": "Partner with Todde",
+	"corporate_primary_cta_url": "mailto:partners@todde.africa",
+	"corporate_secondary_cta_label": "Call +234 1700 1234",
+	"corporate_secondary_cta_url": "tel:+23417001234",
+	"corporate_availability_heading": "Available nationwide",
+	"corporate_availability_description": "Lagos • Abuja • Port Harcourt • Ibadan • Enugu",
+}
+
+DEFAULT_FINANCING_SNAPSHOT_ITEMS = (
+	SimpleNamespace(text="Pay only 30% upfront and get your keys within 48 hours of approval."),
+	SimpleNamespace(text="Automated payment reminders and flexible repayment channels."),
+	SimpleNamespace(text="Roadside assistance, insurance, and maintenance bundles included."),
+)
+
+DEFAULT_FINANCING_BENEFITS = (
+	SimpleNamespace(title="Comprehensive insurance", description="Comprehensive insurance coverage and annual renewals handled by Todde.", icon="heroicons:shield-check"),
+	SimpleNamespace(title="Dedicated support", description="Dedicated support agents for servicing, documentation, and payment plans.", icon="heroicons:lifebuoy"),
+	SimpleNamespace(title="Transparent pricing", description="Transparent pricing and zero hidden charges on every contract.", icon="heroicons:banknotes"),
+)
+
+EMPTY_SECTION_COPY = SimpleNamespace(heading="", subheading="", supporting_text="", cta_label="", cta_url="")
+
+
+class SectionCopyMap(dict):
+	"""Active section copy by slug; a slug with no entry reads as empty copy."""
+
+	def __missing__(self, slug):
+		return EMPTY_SECTION_COPY
+
+
+def _evaluated(queryset: QuerySet) -> QuerySet:
+	"""Fetch ``queryset`` now, so iterating or counting it later runs no query."""
+	len(queryset)
+	return queryset
+
+
+@dataclass(frozen=True)
+class FinancingContent:
+	"""The financing page config with defaults merged into every blank field."""
+
+	config: FinancingPageConfig | None
+	copy: Mapping[str, str]
+	snapshot_items: tuple
+	benefits: tuple
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+	"""Every active CMS entry the marketing pages show, as of one content version.
+
+	The list fields are evaluated querysets rather than tuples so templates
+	and callers can keep using the queryset API without touching the database.
+	"""
+
+	version: int
+	section_copy: SectionCopyMap
+	navigation_links: QuerySet
+	hero_slides: QuerySet
+	homepage_categories: QuerySet
+	value_props: QuerySet
+	brand_metrics: QuerySet
+	financing_highlights: QuerySet
+	financing_steps: QuerySet
+	contact_cards: QuerySet
+	inventory_configs: Mapping[str, InventoryPageConfig]
+	financing: FinancingContent
+
+	@classmethod
+	def load(cls, version: int) -> ContentSnapshot:
+		return cls(
+			version=version,
+			section_copy=SectionCopyMap(
+				(entry.slug, entry) for entry in HomepageSectionCopy.objects.filter(is_active=True)
+			),
+			navigation_links=_evaluated(NavigationLink.objects.filter(is_active=True)),
+			hero_slides=_evaluated(HomepageHero.objects.filter(is_active=True).order_by("order")),
+			homepage_categories=_evaluated(HomepageCategory.objects.filter(is_active=True).order_by("order")),
+			value_props=_evaluated(HomepageValueProposition.objects.filter(is_active=True)),
+			brand_metrics=_evaluated(HomepageBrandMetric.objects.filter(is_active=True)),
+			financing_highlights=_evaluated(HomepageFinancingHighlight.objects.filter(is_active=True)),
+			financing_steps=_evaluated(HomepageFinancingStep.objects.filter(is_active=True)),
+			contact_cards=_evaluated(HomepageContactCard.objects.filter(is_active=True)),
+			inventory_configs=MappingProxyType(
+				{config.slug: config for config in InventoryPageConfig.objects.filter(is_active=True)}
+			),
+			financing=_load_financing(),
+		)
+
+
+def _load_financing() -> FinancingContent:
+	config = FinancingPageConfig.objects.filter(is_active=True).order_by("slug").first()
+	if config is None:
+		copy = dict(FINANCING_DEFAULTS)
+	else:
+		copy = {field: config.resolve(field, default) for field, default in FINANCING_DEFAULTS.items()}
+	snapshot_items = tuple(FinancingSnapshotItem.objects.filter(is_active=True).order_by("order", "id"))
+	benefits = tuple(FinancingBenefit.objects.filter(is_active=True).order_by("order", "id"))
+	return FinancingContent(
+		config=config,
+		copy=MappingProxyType(copy),
+		snapshot_items=snapshot_items or DEFAULT_FINANCING_SNAPSHOT_ITEMS,
+		benefits=benefits or DEFAULT_FINANCING_BENEFITS,
+	)
+
+
+_snapshot: ContentSnapshot | None = None
+
+
+def get_content() -> ContentSnapshot:
+	"""The snapshot for the current content version, rebuilding it if stale."""
+	global _snapshot
+	version = get_version(CONTENT)
+	snapshot = _snapshot
+	if snapshot is None or snapshot.version != version:
+		snapshot = _snapshot = ContentSnapshot.load(version)
+	return snapshot
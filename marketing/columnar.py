@@ -0,0 +1,441 @@
+"""
+Optional in-memory columnar engine for the inventory listing pages.
+
+With NumPy installed and ``TODDE_INVENTORY_ENGINE = "columnar"`` each worker
+keeps the visible listings as column arrays, with one bitmap per value of the
+low-cardinality attributes, and answers filtering, sorting, counts and facets
+without touching the database; only the vehicles on the requested page are
+read. The snapshot is rebuilt when the inventory version changes and gives
+exactly the same results as the ORM path.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from pathlib import Path
+
+from django.conf import settings
+
+from .facets import (
+	FACET_EXCLUDED_FILTERS,
+	FILTER_KEYS,
+	PRICE_BAND_EDGES,
+	FacetOption,
+	InventoryFacets,
+	InventoryStats,
+	build_price_histogram,
+	build_year_histogram,
+	with_selected_options,
+)
+from .models import CarModel, CarVariant, CarVariantListing
+from .pagination import CountedPaginator, ResultCount, build_keyset_page, decode_keyset_cursor
+from .snapshot import SnapshotError, build_lock, prune_snapshots, read_snapshot, snapshot_path, write_snapshot
+from .versioning import INVENTORY, get_version
+
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+	np = None
+
+# Columns answered from per-value bitmaps, with the choices that order their facets.
+CATEGORICAL_COLUMNS = {
+	"body_type": CarModel.BodyType,
+	"transmission": CarVariant.Transmission,
+	"listing_type": CarVariant.ListingType,
+	"powertrain": CarModel.Powertrain,
+}
+
+# Sort fields and the column each one orders by, together with the pk.
+SORT_COLUMNS = {
+	"price": "price_cents",
+	"year": "year",
+}
+
+# Keeps out-of-range price filters inside int64 cents.
+_MAX_CENTS = 2**62
+
+
+def _cents(amount: Decimal, rounding: str) -> int:
+	cents = int((Decimal(amount) * 100).to_integral_value(rounding))
+	return max(min(cents, _MAX_CENTS), -_MAX_CENTS)
+
+
+def _amount(cents) -> Decimal:
+	return Decimal(int(cents)).scaleb(-2)
+
+
+class _PagedIds:
+	"""Sliceable sequence of listing ids that loads only the slice it is asked for."""
+
+	def __init__(self, ids, queryset):
+		self.ids = ids
+		self.queryset = queryset
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+	def __getitem__(self, index):
+		if not isinstance(index, slice):
+			return self[index : index + 1][0]
+		return _fetch_in_order(self.queryset, self.ids[index])
+
+
+def _fetch_in_order(queryset, ids) -> list:
+	ids = [int(pk) for pk in ids]
+	listings = {listing.pk: listing for listing in queryset.filter(pk__in=ids)}
+	return [listings[pk] for pk in ids if pk in listings]
+
+
+class ColumnarInventory:
+	"""Column snapshot of the visible listings for one inventory version.
+
+	``columns`` maps names to equal-length arrays: ``ids`` (in pk order),
+	``price_cents``, ``year``, ``manufacturer_ids``, ``model_ids``,
+	``price_band``, ``order.<field>`` for each sort field and, for each
+	categorical column, ``codes.<column>`` plus one ``bitmap.<column>.<code>``
+	per value in ``categories[column]``. The arrays may be memory-mapped
+	from a shared snapshot file and are never written to.
+	"""
+
+	def __init__(
+		self,
+		version: int,
+		columns: dict,
+		*,
+		categories: dict[str, list[str]],
+		manufacturer_names: dict[int, str],
+		model_labels: dict[int, str],
+	):
+		self.version = version
+		self.columns = columns
+		self.categories = categories
+		self.manufacturer_names = manufacturer_names
+		self.model_labels = model_labels
+		self.ids = columns["ids"]
+		self.price_cents = columns["price_cents"]
+		self.year = columns["year"]
+		self.manufacturer_ids = columns["manufacturer_ids"]
+		self.model_ids = columns["model_ids"]
+		self.price_band = columns["price_band"]
+		self.codes = {column: columns[f"codes.{column}"] for column in categories}
+		self.bitmaps = {
+			column: {value: columns[f"bitmap.{column}.{code}"] for code, value in enumerate(values)}
+			for column, values in categories.items()
+		}
+
+	@classmethod
+	def from_rows(cls, version: int, rows: list[dict]) -> ColumnarInventory:
+		size = len(rows)
+		columns = {
+			"ids": np.fromiter((row["variant_id"] for row in rows), dtype=np.int64, count=size),
+			"price_cents": np.fromiter((_cents(row["price"], ROUND_FLOOR) for row in rows), dtype=np.int64, count=size),
+			"year": np.fromiter((row["year"] for row in rows), dtype=np.int64, count=size),
+			"manufacturer_ids": np.fromiter((row["manufacturer_id"] for row in rows), dtype=np.int64, count=size),
+			"model_ids": np.fromiter((row["model_id"] for row in rows), dtype=np.int64, count=size),
+		}
+		edges = np.array([_cents(edge, ROUND_FLOOR) for edge in PRICE_BAND_EDGES], dtype=np.int64)
+		columns["price_band"] = np.searchsorted(edges, columns["price_cents"], side="right").astype(np.int16)
+		for field, column in SORT_COLUMNS.items():
+			columns[f"order.{field}"] = np.lexsort((columns["ids"], columns[column]))
+
+		categories = {}
+		for column, choices in CATEGORICAL_COLUMNS.items():
+			values = list(choices.values)
+			values += sorted({row[column] for row in rows} - set(values))
+			index = {value: code for code, value in enumerate(values)}
+			codes = np.fromiter((index[row[column]] for row in rows), dtype=np.int16, count=size)
+			columns[f"codes.{column}"] = codes
+			for code in index.values():
+				columns[f"bitmap.{column}.{code}"] = codes == code
+			categories[column] = values
+		return cls(
+			version,
+			columns,
+			categories=categories,
+			manufacturer_names={row["manufacturer_id"]: row["manufacturer_name"] for row in rows},
+			model_labels={row["model_id"]: f"{row['manufacturer_name']} {row['model_name']}" for row in rows},
+		)
+
+	@classmethod
+	def load(cls, version: int) -> ColumnarInventory:
+		"""Build the snapshot from the visible listings in the database."""
+		rows = (
+			CarVariantListing.objects.filter(is_visible=True)
+			.order_by("pk")
+			.values(
+				"variant_id",
+				"price",
+				"year",
+				"manufacturer_id",
+				"manufacturer_name",
+				"model_id",
+				"model_name",
+				*CATEGORICAL_COLUMNS,
+			)
+		)
+		return cls.from_rows(version, list(rows))
+
+	def write_snapshot(self, directory) -> Path:
+		"""Write this inventory as the shared snapshot file for its version."""
+		metadata = {
+			"categories": self.categories,
+			"manufacturer_names": {str(key): value for key, value in self.manufacturer_names.items()},
+			"model_labels": {str(key): value for key, value in self.model_labels.items()},
+		}
+		return write_snapshot(directory, self.version, self.columns, metadata)
+
+	@classmethod
+	def open_snapshot(cls, path) -> ColumnarInventory:
+		"""Memory-map a snapshot file; the columns are read-only views of it."""
+		version, columns, metadata = read_snapshot(path)
+		return cls(
+			version,
+			columns,
+			categories=metadata["categories"],
+			manufacturer_names={int(key): value for key, value in metadata["manufacturer_names"].items()},
+			model_labels={int(key): value for key, value in metadata["model_labels"].items()},
+		)
+
+	@classmethod
+	def shared(cls, version: int, directory) -> ColumnarInventory:
+		"""Map the snapshot for ``version`` from ``directory``, building it if no process has yet.
+
+		Builds are serialised across processes, so after a change one worker
+		writes the new snapshot and the others map it.
+		"""
+		path = snapshot_path(directory, version)
+		try:
+			return cls.open_snapshot(path)
+		except (FileNotFoundError, SnapshotError):
+			pass
+		with build_lock(directory):
+			try:
+				return cls.open_snapshot(path)
+			except (FileNotFoundError, SnapshotError):
+				cls.load(version).write_snapshot(directory)
+			prune_snapshots(directory, before=version)
+		return cls.open_snapshot(path)
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+	def _bitmap(self, column: str, value):
+		bitmap = self.bitmaps[column].get(value)
+		return bitmap if bitmap is not None else np.zeros(len(self), dtype=bool)
+
+	def _mask_for(self, key: str, value):
+		if key == "price_min":
+			return self.price_cents >= _cents(value, ROUND_CEILING)
+		if key == "price_max":
+			return self.price_cents <= _cents(value, ROUND_FLOOR)
+		if key == "year_min":
+			return self.year >= value
+		if key == "year_max":
+			return self.year <= value
+		if key == "year":
+			return self.year == value
+		if key == "category":
+			return self._bitmap("body_type", value)
+		if key == "transmission":
+			mask = np.zeros(len(self), dtype=bool)
+			for transmission in value:
+				mask |= self._bitmap("transmission", transmission)
+			return mask
+		if key == "manufacturer":
+			return self.manufacturer_ids == value
+		if key == "model":
+			return self.model_ids == value
+		return self._bitmap(key, value)
+
+	def _masks(self, filters: dict) -> dict:
+		return {
+			key: self._mask_for(key, value)
+			for key, value in filters.items()
+			if key in FILTER_KEYS and value not in (None, "", [])
+		}
+
+	def _base(self, listing_type: str | None):
+		if listing_type:
+			return self._bitmap("listing_type", listing_type)
+		return np.ones(len(self), dtype=bool)
+
+	@staticmethod
+	def _combine(base, masks: dict, keys):
+		combined = base.copy()
+		for key in keys:
+			combined &= masks[key]
+		return combined
+
+	def match(self, filters: dict, *, listing_type: str | None = None):
+		"""Boolean mask of the listings matching ``filters``."""
+		masks = self._masks(filters)
+		return self._combine(self._base(listing_type), masks, masks)
+
+	def count(self, filters: dict, *, listing_type: str | None = None) -> int:
+		return int(np.count_nonzero(self.match(filters, listing_type=listing_type)))
+
+	# Facets ---------------------------------------------------------------
+
+	def _choice_options(self, column: str, mask) -> tuple[FacetOption, ...]:
+		choices = CATEGORICAL_COLUMNS[column]
+		counts = np.bincount(self.codes[column][mask], minlength=len(choices.values))
+		return tuple(
+			FacetOption(value=value, label=label, count=int(counts[code]))
+			for code, (value, label) in enumerate(choices.choices)
+			if counts[code] > 0
+		)
+
+	@staticmethod
+	def _labelled_options(values, labels: dict) -> tuple[FacetOption, ...]:
+		keys, counts = np.unique(values, return_counts=True)
+		options = (
+			FacetOption(value=int(key), label=labels[int(key)], count=int(count))
+			for key, count in zip(keys, counts)
+		)
+		return tuple(sorted(options, key=lambda option: option.label))
+
+	@staticmethod
+	def _value_counts(values) -> dict[int, int]:
+		keys, counts = np.unique(values, return_counts=True)
+		return {int(key): int(count) for key, count in zip(keys, counts)}
+
+	def _stats(self, mask) -> InventoryStats:
+		if not mask.any():
+			return InventoryStats()
+		prices = self.price_cents[mask]
+		years = self.year[mask]
+		return InventoryStats(
+			min_price=_amount(prices.min()),
+			max_price=_amount(prices.max()),
+			min_year=int(years.min()),
+			max_year=int(years.max()),
+		)
+
+	def facets(self, filters: dict | None = None, *, listing_type: str | None = None) -> InventoryFacets:
+		"""Same result as ``load_inventory_facets`` for the visible listings."""
+		filters = filters or {}
+		base = self._base(listing_type)
+		masks = self._masks(filters)
+		partial = {
+			facet: self._combine(base, masks, masks.keys() - excluded)
+			for facet, excluded in FACET_EXCLUDED_FILTERS.items()
+		}
+		facets = InventoryFacets(
+			stats=self._stats(partial["stats"]),
+			categories=self._choice_options("body_type", partial["categories"]),
+			transmissions=self._choice_options("transmission", partial["transmissions"]),
+			manufacturers=self._labelled_options(self.manufacturer_ids[partial["manufacturers"]], self.manufacturer_names),
+			models=self._labelled_options(self.model_ids[partial["models"]], self.model_labels),
+			powertrains=self._choice_options("powertrain", partial["powertrains"]),
+			price_histogram=build_price_histogram(self._value_counts(self.price_band[partial["price_histogram"]])),
+			year_histogram=build_year_histogram(self._value_counts(self.year[partial["year_histogram"]])),
+		)
+		if not masks:
+			return facets
+
+		# Selected options that match nothing keep a zero count so they can be cleared.
+		manufacturer_labels = {int(key): self.manufacturer_names[int(key)] for key in np.unique(self.manufacturer_ids[base])}
+		model_labels = {int(key): self.model_labels[int(key)] for key in np.unique(self.model_ids[base])}
+		return InventoryFacets(
+			stats=facets.stats,
+			categories=with_selected_options(facets.categories, filters.get("category"), dict(CarModel.BodyType.choices)),
+			transmissions=with_selected_options(facets.transmissions, filters.get("transmission"), dict(CarVariant.Transmission.choices)),
+			manufacturers=with_selected_options(facets.manufacturers, filters.get("manufacturer"), manufacturer_labels),
+			models=with_selected_options(facets.models, filters.get("model"), model_labels),
+			powertrains=with_selected_options(facets.powertrains, filters.get("powertrain"), dict(CarModel.Powertrain.choices)),
+			price_histogram=facets.price_histogram,
+			year_histogram=facets.year_histogram,
+		)
+
+	# Pages ----------------------------------------------------------------
+
+	def _column(self, field: str):
+		return self.columns[SORT_COLUMNS[field]]
+
+	def _sorted_positions(self, mask, *, field: str, descending: bool):
+		"""Positions of the masked listings in (``field``, pk) order."""
+		order = self.columns[f"order.{field}"]
+		if descending:
+			order = order[::-1]
+		return order[mask[order]]
+
+	def paginate(
+		self,
+		spec,
+		*,
+		listing_type: str | None,
+		queryset,
+		per_page: int,
+		result_count: ResultCount,
+	):
+		"""The page for ``spec``, as ``paginate_by_keyset`` or the offset paginator would return it.
+
+		``queryset`` is the unfiltered listing queryset the page's vehicles are read from.
+		"""
+		field, descending = spec.ordering_field
+		mask = self.match(spec.as_selected_filters(), listing_type=listing_type)
+		positions = self._sorted_positions(mask, field=field, descending=descending)
+		ids = self.ids[positions]
+		if spec.page:
+			paginator = CountedPaginator(_PagedIds(ids, queryset), per_page, result_count=result_count)
+			return paginator.get_page(spec.page)
+
+		payload = decode_keyset_cursor(spec.cursor, sort=spec.sort, model=CarVariantListing, field=field)
+		if payload is None:
+			window = ids[: per_page + 1]
+		else:
+			keys = self._column(field)[positions]
+			value = Decimal(payload["v"]) * 100 if field == "price" else Decimal(int(payload["v"]))
+			pk = int(payload["id"])
+			if descending:
+				# Negating both columns turns the descending order into an ascending one.
+				keys, ids, value, pk = -keys, -ids, -value, -pk
+			if payload["d"] == "p":
+				stop = _seek(keys, ids, value, pk, side="left")
+				window = ids[max(stop - per_page - 1, 0) : stop][::-1]
+			else:
+				start = _seek(keys, ids, value, pk, side="right")
+				window = ids[start : start + per_page + 1]
+			if descending:
+				window = -window
+		rows = _fetch_in_order(queryset, window)
+		return build_keyset_page(rows, payload=payload, field=field, sort=spec.sort, per_page=per_page)
+
+
+def _seek(keys, ids, value: Decimal, pk: int, *, side: str) -> int:
+	"""Index in the ascending (``keys``, ``ids``) pairs where (``value``, ``pk``) belongs.
+
+	``side="right"`` lands after the cursor's own row, ``side="left"`` before it.
+	"""
+	floor = max(min(int(value.to_integral_value(ROUND_FLOOR)), _MAX_CENTS), -_MAX_CENTS)
+	if floor != value:
+		return int(np.searchsorted(keys, floor, side="right"))
+	low = int(np.searchsorted(keys, floor, side="left"))
+	high = int(np.searchsorted(keys, floor, side="right"))
+	return low + int(np.searchsorted(ids[low:high], pk, side=side))
+
+
+def columnar_available() -> bool:
+	return np is not None and getattr(settings, "TODDE_INVENTORY_ENGINE", "orm") == "columnar"
+
+
+_engine: ColumnarInventory | None = None
+
+
+def get_columnar_inventory() -> ColumnarInventory | None:
+	"""The engine for the current inventory version, or ``None`` when it is disabled.
+
+	With ``TODDE_INVENTORY_SNAPSHOT_DIR`` set, workers share one memory-mapped
+	snapshot file per version instead of each loading a private copy.
+	"""
+	global _engine
+	if not columnar_available():
+		return None
+	version = get_version(INVENTORY)
+	engine = _engine
+	if engine is None or engine.version != version:
+		directory = getattr(settings, "TODDE_INVENTORY_SNAPSHOT_DIR", None)
+		if directory:
+			engine = _engine = ColumnarInventory.shared(version, directory)
+		else:
+			engine = _engine = ColumnarInventory.load(version)
+	return engine
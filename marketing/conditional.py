@@ -0,0 +1,49 @@
+"""
+ETags for conditional GET, derived from the content version counters.
+
+The tags are computed from cache reads only, so ``condition`` can answer an
+unchanged request with 304 before the view queries or renders anything.
+
+A vehicle detail page is tagged with its own variant domain rather than the
+whole inventory, so one price change re-renders one page and its manufacturer's
+siblings (they show each other as related cards), not every detail page. Only
+content edits, manufacturer writes, ``rebuild_variant_listings`` and a new
+release move every detail tag. The "Recently Viewed" sidebar lists the most
+recently updated variants site-wide and is refreshed only when a page
+re-renders for one of those reasons.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from .versioning import CONTENT, INVENTORY, VEHICLE_PAGES, get_version, variant_domain
+
+
+def _etag(*domains: str) -> str:
+	stamp = ":".join([settings.TODDE_RELEASE, *(f"{domain}={get_version(domain)}" for domain in domains)])
+	return hashlib.sha1(stamp.encode()).hexdigest()
+
+
+def content_etag(request, *args, **kwargs) -> str:
+	return _etag(CONTENT)
+
+
+def inventory_etag(request, *args, **kwargs) -> str:
+	return _etag(INVENTORY)
+
+
+def page_etag(request, *args, **kwargs) -> str:
+	return _etag(INVENTORY, CONTENT)
+
+
+def variant_page_etag(request, variant_id: int, *args, **kwargs) -> str:
+	return _etag(CONTENT, VEHICLE_PAGES, variant_domain(variant_id))
+
+
+content_condition = condition(etag_func=content_etag)
+inventory_condition = condition(etag_func=inventory_etag)
+page_condition = condition(etag_func=page_etag)
+variant_page_condition = condition(etag_func=variant_page_etag)
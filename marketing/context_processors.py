@@ -1,56 +1,100 @@
 """
 Context processors for the marketing app.
 """
-from marketing.models import CarModel
+from __future__ import annotations
+
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.utils.functional import SimpleLazyObject
+
+from .cms import get_content
+from .models import CarModel, InventoryFacetBucket
+from .versioning import INVENTORY, get_version
+
+# Contact details shown in the site header and footer.
+SITE_CONTACT = {
+    "address": "Plot 24, Admiralty Rd, Lekki, Lagos",
+    "city": "Lagos",
+    "hours": "Mon-Sat: 8AM-6PM",
+    "support_email": "support@todde.africa",
+    "general_email": "hello@todde.africa",
+    "press_email": "press@todde.africa",
+    "partners_email": "partners@todde.africa",
+    "sales_phone": "+2347010012345",
+    "office_phone": "+23417001234",
+    "office_phone_display": "+234 1700 1234",
+}
+
+NAV_CATEGORY_LIMIT = 4
+
+# Navigation copy per body type; other body types fall back to their choice label.
+NAV_CATEGORY_COPY = {
+    "sedan": {"label": "Sedans", "description": "Comfortable city cars"},
+    "suv": {"label": "SUVs", "description": "Spacious family vehicles"},
+    "coupe": {"label": "Coupes", "description": "Stylish performance cars"},
+    "hatchback": {"label": "Hatchbacks", "description": "Efficient urban cars"},
+    "truck": {"label": "Trucks", "description": "Heavy-duty work vehicles"},
+    "van": {"label": "Vans", "description": "Spacious cargo vehicles"},
+}
+
+# Served when the facet table cannot be read, e.g. before migrations have run.
+FALLBACK_NAV_CATEGORIES = [
+    {"value": "sedan", "label": "Sedans", "description": "Comfortable city cars", "count": 0},
+    {"value": "suv", "label": "SUVs", "description": "Spacious family vehicles", "count": 0},
+    {"value": "coupe", "label": "Coupes", "description": "Stylish performance cars", "count": 0},
+]
+
+
+def _load_nav_categories() -> list[dict[str, object]]:
+    category_counts = {
+        entry["body_type"]: entry["total"]
+        for entry in InventoryFacetBucket.objects.values("body_type").annotate(total=Sum("variant_count"))
+    }
+    categories = []
+    for body_value, body_label in CarModel.BodyType.choices:
+        count = category_counts.get(body_value, 0)
+        if count > 0:
+            copy = NAV_CATEGORY_COPY.get(body_value, {"label": body_label, "description": f"{body_label} vehicles"})
+            categories.append({"value": body_value, **copy, "count": count})
+    return categories[:NAV_CATEGORY_LIMIT]
+
+
+_nav_categories: tuple[int, list[dict[str, object]]] | None = None
+
+
+def get_nav_categories() -> list[dict[str, object]]:
+    """Body types in stock for the navigation, computed once per inventory version."""
+    global _nav_categories
+    version = get_version(INVENTORY)
+    memo = _nav_categories
+    if memo is None or memo[0] != version:
+        try:
+            memo = _nav_categories = (version, _load_nav_categories())
+        except DatabaseError:
+            return FALLBACK_NAV_CATEGORIES
+    return memo[1]
+
+
+def get_navigation_links():
+    """Active navigation links from the content snapshot.
+
+    Returns an evaluated queryset, so iterating or counting it runs no query.
+    """
+    return get_content().navigation_links
 
 
 def navigation_context(request):
-    """Provide navigation-related context to all templates."""
-    
-    # Get available categories with proper labels
-    available_categories = []
-    
-    # Only include categories that have actual cars
-    from django.db.models import Count
-    from marketing.views import _inventory_queryset
-    
-    try:
-        base_queryset = _inventory_queryset(listing_type=None)
-        category_counts = {
-            entry["model__body_type"]: entry["total"]
-            for entry in base_queryset.values("model__body_type").annotate(total=Count("id"))
-        }
-        
-        category_mapping = {
-            "sedan": {"label": "Sedans", "description": "Comfortable city cars"},
-            "suv": {"label": "SUVs", "description": "Spacious family vehicles"},  
-            "coupe": {"label": "Coupes", "description": "Stylish performance cars"},
-            "hatchback": {"label": "Hatchbacks", "description": "Efficient urban cars"},
-            "truck": {"label": "Trucks", "description": "Heavy-duty work vehicles"},
-            "van": {"label": "Vans", "description": "Spacious cargo vehicles"},
+    """Site chrome shared by every page: navigation and contact details.
+
+    The navigation entries are lazy, so templates and fragments that never
+    read them cost nothing; they are built once per request however many
+    templates that request renders.
+    """
+    chrome = getattr(request, "_site_chrome", None)
+    if chrome is None:
+        chrome = request._site_chrome = {
+            "nav_links": SimpleLazyObject(get_navigation_links),
+            "nav_categories": SimpleLazyObject(get_nav_categories),
+            "site_contact": SITE_CONTACT,
         }
-        
-        for body_value, body_label in CarModel.BodyType.choices:
-            if category_counts.get(body_value, 0) > 0:
-                category_info = category_mapping.get(body_value, {
-                    "label": body_label, 
-                    "description": f"{body_label} vehicles"
-                })
-                available_categories.append({
-                    "value": body_value,
-                    "label": category_info["label"],
-                    "description": category_info["description"],
-                    "count": category_counts.get(body_value, 0),
-                })
-    
-    except Exception:
-        # Fallback to static categories if dynamic loading fails
-        available_categories = [
-            {"value": "sedan", "label": "Sedans", "description": "Comfortable city cars", "count": 0},
-            {"value": "suv", "label": "SUVs", "description": "Spacious family vehicles", "count": 0},
-            {"value": "coupe", "label": "Coupes", "description": "Stylish performance cars", "count": 0},
-        ]
-    
-    return {
-        "nav_categories": available_categories[:4]  # Limit to 4 items for clean UI
-    }
\ No newline at end of file
+    return chrome
@@ -0,0 +1,157 @@
+"""
+Streaming export of the active inventory for marketplace partners.
+
+Rows are read with a chunked ``iterator()`` and encoded incrementally, so
+memory use does not grow with the size of the inventory.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+
+from django.urls import reverse
+
+from .models import CarVariantListing
+
+EXPORT_FORMATS = {
+	"csv": "text/csv",
+	"jsonl": "application/x-ndjson",
+}
+
+EXPORT_FIELDS = (
+	"id",
+	"url",
+	"manufacturer",
+	"manufacturer_slug",
+	"model",
+	"model_slug",
+	"year",
+	"trim",
+	"body_type",
+	"powertrain",
+	"transmission",
+	"listing_type",
+	"price",
+	"currency",
+	"image_url",
+	"headline",
+	"mileage_km",
+	"location",
+	"updated_at",
+)
+
+DETAIL_FIELDS = ("headline", "mileage_km", "location")
+
+# Encoded output is flushed in pieces of roughly this many bytes.
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_export_rows(*, base_url: str = "", chunk_size: int = 2000) -> Iterator[dict[str, object]]:
+	"""Yield one dict per visible listing, ordered by variant id.
+
+	``base_url`` (scheme and host, no trailing slash) makes the detail URLs
+	absolute.
+	"""
+	rows = (
+		CarVariantListing.objects.filter(is_visible=True)
+		.order_by("pk")
+		.values(
+			"variant_id",
+			"manufacturer_name",
+			"manufacturer_slug",
+			"model_name",
+			"model_slug",
+			"year",
+			"trim",
+			"body_type",
+			"powertrain",
+			"transmission",
+			"listing_type",
+			"price",
+			"currency",
+			"image_url",
+			"updated_at",
+			"variant__detail__is_active",
+			*(f"variant__detail__{name}" for name in DETAIL_FIELDS),
+		)
+	)
+	for row in rows.iterator(chunk_size=chunk_size):
+		has_detail = bool(row["variant__detail__is_active"])
+		yield {
+			"id": row["variant_id"],
+			"url": base_url + reverse("marketing:vehicle_detail", args=[row["variant_id"]]),
+			"manufacturer": row["manufacturer_name"],
+			"manufacturer_slug": row["manufacturer_slug"],
+			"model": row["model_name"],
+			"model_slug": row["model_slug"],
+			"year": row["year"],
+			"trim": row["trim"],
+			"body_type": row["body_type"],
+			"powertrain": row["powertrain"],
+			"transmission": row["transmission"],
+			"listing_type": row["listing_type"],
+			"price": str(row["price"]),
+			"currency": row["currency"],
+			"image_url": row["image_url"],
+			**{name: row[f"variant__detail__{name}"] if has_detail else None for name in DETAIL_FIELDS},
+			"updated_at": row["updated_at"].isoformat(),
+		}
+
+
+def _buffered(lines: Iterable[str]) -> Iterator[bytes]:
+	buffer: list[str] = []
+	size = 0
+	for line in lines:
+		buffer.append(line)
+		size += len(line)
+		if size >= CHUNK_BYTES:
+			yield "".join(buffer).encode()
+			buffer, size = [], 0
+	if buffer:
+		yield "".join(buffer).encode()
+
+
+def _csv_lines(rows: Iterable[dict[str, object]]) -> Iterator[str]:
+	output = io.StringIO()
+	writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+	writer.writeheader()
+	for row in rows:
+		writer.writerow(row)
+		yield output.getvalue()
+		output.seek(0)
+		output.truncate()
+	yield output.getvalue()
+
+
+def _jsonl_lines(rows: Iterable[dict[str, object]]) -> Iterator[str]:
+	for row in rows:
+		yield json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+	"""Compress a byte stream into a single gzip member as it is produced."""
+	compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+	for chunk in chunks:
+		compressed = compressor.compress(chunk)
+		if compressed:
+			yield compressed
+	yield compressor.flush()
+
+
+def export_inventory(
+	export_format: str,
+	*,
+	compress: bool = False,
+	base_url: str = "",
+	chunk_size: int = 2000,
+) -> Iterator[bytes]:
+	"""Encoded export of the active inventory as ``csv`` or ``jsonl`` bytes."""
+	if export_format not in EXPORT_FORMATS:
+		raise ValueError(f"Unknown export format {export_format!r}.")
+	rows = iter_export_rows(base_url=base_url, chunk_size=chunk_size)
+	lines = _csv_lines(rows) if export_format == "csv" else _jsonl_lines(rows)
+	chunks = _buffered(lines)
+	return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,473 @@
+"""
+Facet computation for the inventory listing pages.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Min, Value, When
+
+from .models import CarModel, CarVariant, InventoryFacetBucket
+
+
+@dataclass(frozen=True)
+class FacetOption:
+	value: object
+	label: str
+	count: int
+
+
+@dataclass(frozen=True)
+class InventoryStats:
+	min_price: Decimal | None = None
+	max_price: Decimal | None = None
+	min_year: int | None = None
+	max_year: int | None = None
+
+
+@dataclass(frozen=True)
+class HistogramBin:
+	"""Variants with ``lower <= value < upper``; ``None`` leaves a side open."""
+
+	lower: Decimal | int | None
+	upper: Decimal | int | None
+	label: str
+	count: int
+
+
+@dataclass(frozen=True)
+class InventoryFacets:
+	stats: InventoryStats
+	categories: tuple[FacetOption, ...]
+	transmissions: tuple[FacetOption, ...]
+	manufacturers: tuple[FacetOption, ...]
+	models: tuple[FacetOption, ...]
+	powertrains: tuple[FacetOption, ...]
+	price_histogram: tuple[HistogramBin, ...] = ()
+	year_histogram: tuple[HistogramBin, ...] = ()
+
+
+# Lower edges of the price bands: roughly log-spaced steps of 1, 2, 3, 5 and
+# 7.5 per decade, from ₦1M to ₦750M. Band 0 is everything below the first edge.
+PRICE_BAND_EDGES = tuple(
+	Decimal(step) * 10**exponent
+	for exponent in (6, 7, 8)
+	for step in ("1", "2", "3", "5", "7.5")
+)
+
+
+def price_band(price: Decimal) -> int:
+	return bisect_right(PRICE_BAND_EDGES, price)
+
+
+def price_band_expression(field: str = "price") -> Case:
+	"""SQL equivalent of ``price_band`` for grouping queries."""
+	return Case(
+		*(When(**{f"{field}__lt": edge}, then=Value(band)) for band, edge in enumerate(PRICE_BAND_EDGES)),
+		default=Value(len(PRICE_BAND_EDGES)),
+	)
+
+
+def format_naira_short(amount: Decimal) -> str:
+	millions = amount / 10**6
+	return f"₦{millions.normalize():f}M"
+
+
+def build_price_histogram(band_counts: dict[int, int]) -> tuple[HistogramBin, ...]:
+	if not band_counts:
+		return ()
+	bins = []
+	for band in range(min(band_counts), max(band_counts) + 1):
+		lower = PRICE_BAND_EDGES[band - 1] if band else None
+		upper = PRICE_BAND_EDGES[band] if band < len(PRICE_BAND_EDGES) else None
+		if lower is None:
+			label = f"Under {format_naira_short(upper)}"
+		elif upper is None:
+			label = f"{format_naira_short(lower)}+"
+		else:
+			label = f"{format_naira_short(lower)}–{format_naira_short(upper)}"
+		bins.append(HistogramBin(lower=lower, upper=upper, label=label, count=band_counts.get(band, 0)))
+	return tuple(bins)
+
+
+def build_year_histogram(year_counts: dict[int, int]) -> tuple[HistogramBin, ...]:
+	if not year_counts:
+		return ()
+	return tuple(
+		HistogramBin(lower=year, upper=year + 1, label=str(year), count=year_counts.get(year, 0))
+		for year in range(min(year_counts), max(year_counts) + 1)
+	)
+
+
+def _merge_min(current, candidate):
+	if candidate is None:
+		return current
+	return candidate if current is None or candidate < current else current
+
+
+def _merge_max(current, candidate):
+	if candidate is None:
+		return current
+	return candidate if current is None or candidate > current else current
+
+
+def _rollup(rows: Iterable[dict], *, manufacturer_id: int | None) -> InventoryFacets:
+	min_price = max_price = min_year = max_year = None
+	category_counts: dict[str, int] = {}
+	transmission_counts: dict[str, int] = {}
+	powertrain_counts: dict[str, int] = {}
+	price_band_counts: dict[int, int] = {}
+	year_counts: dict[int, int] = {}
+	manufacturer_counts: dict[int, list] = {}
+	model_counts: dict[int, list] = {}
+	for row in rows:
+		total = row["total"]
+		min_price = _merge_min(min_price, row["min_price"])
+		max_price = _merge_max(max_price, row["max_price"])
+		min_year = _merge_min(min_year, row["min_year"])
+		max_year = _merge_max(max_year, row["max_year"])
+
+		body_type = row["body_type"]
+		category_counts[body_type] = category_counts.get(body_type, 0) + total
+		transmission = row["transmission"]
+		transmission_counts[transmission] = transmission_counts.get(transmission, 0) + total
+		powertrain = row["powertrain"]
+		powertrain_counts[powertrain] = powertrain_counts.get(powertrain, 0) + total
+		band = row["price_band"]
+		price_band_counts[band] = price_band_counts.get(band, 0) + total
+		year = row["min_year"]
+		year_counts[year] = year_counts.get(year, 0) + total
+
+		row_manufacturer_id = row["manufacturer_id"]
+		if row_manufacturer_id:
+			entry = manufacturer_counts.setdefault(row_manufacturer_id, [row["manufacturer_name"], 0])
+			entry[1] += total
+		if row["model_id"] and (manufacturer_id is None or row_manufacturer_id == manufacturer_id):
+			label = f"{row['manufacturer_name']} {row['model_name']}"
+			entry = model_counts.setdefault(row["model_id"], [label, 0])
+			entry[1] += total
+
+	categories = tuple(
+		FacetOption(value=body_value, label=body_label, count=category_counts[body_value])
+		for body_value, body_label in CarModel.BodyType.choices
+		if category_counts.get(body_value, 0) > 0
+	)
+	transmissions = tuple(
+		FacetOption(value=transmission_value, label=transmission_label, count=transmission_counts[transmission_value])
+		for transmission_value, transmission_label in CarVariant.Transmission.choices
+		if transmission_counts.get(transmission_value, 0) > 0
+	)
+	powertrains = tuple(
+		FacetOption(value=powertrain_value, label=powertrain_label, count=powertrain_counts[powertrain_value])
+		for powertrain_value, powertrain_label in CarModel.Powertrain.choices
+		if powertrain_counts.get(powertrain_value, 0) > 0
+	)
+	manufacturers = tuple(
+		sorted(
+			(FacetOption(value=key, label=label, count=count) for key, (label, count) in manufacturer_counts.items()),
+			key=lambda option: option.label,
+		)
+	)
+	models = tuple(
+		sorted(
+			(FacetOption(value=key, label=label, count=count) for key, (label, count) in model_counts.items()),
+			key=lambda option: option.label,
+		)
+	)
+	return InventoryFacets(
+		stats=InventoryStats(
+			min_price=min_price,
+			max_price=max_price,
+			min_year=min_year,
+			max_year=max_year,
+		),
+		categories=categories,
+		transmissions=transmissions,
+		manufacturers=manufacturers,
+		models=models,
+		powertrains=powertrains,
+		price_histogram=build_price_histogram(price_band_counts),
+		year_histogram=build_year_histogram(year_counts),
+	)
+
+
+def build_inventory_facets(queryset, *, manufacturer_id: int | None = None) -> InventoryFacets:
+	"""Compute every facet and the price/year bounds from a single grouped query.
+
+	The queryset is grouped on the finest facet grain (model x transmission x
+	year x price band); the other facets and the histograms are rolled up from
+	those rows in Python.
+	When ``manufacturer_id`` is given the model facet is limited to that brand.
+	"""
+	rows = (
+		queryset.order_by()
+		.values(
+			"transmission",
+			"model_id",
+			"year",
+			price_band=price_band_expression(),
+			body_type=F("model__body_type"),
+			powertrain=F("model__powertrain"),
+			manufacturer_id=F("model__manufacturer_id"),
+			manufacturer_name=F("model__manufacturer__name"),
+			model_name=F("model__name"),
+		)
+		.annotate(
+			total=Count("id"),
+			min_price=Min("price"),
+			max_price=Max("price"),
+			min_year=Min("year"),
+			max_year=Max("year"),
+		)
+	)
+	return _rollup(rows, manufacturer_id=manufacturer_id)
+
+
+PRICE_FILTER_KEYS = frozenset({"price_min", "price_max"})
+FILTER_KEYS = PRICE_FILTER_KEYS | {
+	"year_min",
+	"year_max",
+	"year",
+	"category",
+	"transmission",
+	"manufacturer",
+	"model",
+	"listing_type",
+	"powertrain",
+}
+
+# Filters ignored when counting each facet, so every option shows how many
+# results picking it would give under all the *other* active filters.
+FACET_EXCLUDED_FILTERS = {
+	"stats": frozenset({"price_min", "price_max", "year_min", "year_max", "year"}),
+	"categories": frozenset({"category"}),
+	"transmissions": frozenset({"transmission"}),
+	"manufacturers": frozenset({"manufacturer", "model"}),
+	"models": frozenset({"model"}),
+	"powertrains": frozenset({"powertrain"}),
+	"price_histogram": PRICE_FILTER_KEYS,
+	"year_histogram": frozenset({"year_min", "year_max", "year"}),
+}
+
+
+def _active_filter_keys(filters: dict) -> frozenset:
+	return frozenset(key for key, value in filters.items() if value not in (None, "", []))
+
+
+def _row_matches(row: dict, filters: dict, active_keys: frozenset) -> bool:
+	def active(key):
+		return key in active_keys
+
+	if active("price_min") and row["max_price"] < filters["price_min"]:
+		return False
+	if active("price_max") and row["min_price"] > filters["price_max"]:
+		return False
+	if active("year_min") and row["max_year"] < filters["year_min"]:
+		return False
+	if active("year_max") and row["min_year"] > filters["year_max"]:
+		return False
+	if active("year") and not row["min_year"] <= filters["year"] <= row["max_year"]:
+		return False
+	if active("category") and row["body_type"] != filters["category"]:
+		return False
+	if active("transmission") and row["transmission"] not in filters["transmission"]:
+		return False
+	if active("manufacturer") and row["manufacturer_id"] != filters["manufacturer"]:
+		return False
+	if active("model") and row["model_id"] != filters["model"]:
+		return False
+	if active("listing_type") and row["listing_type"] != filters["listing_type"]:
+		return False
+	if active("powertrain") and row["powertrain"] != filters["powertrain"]:
+		return False
+	return True
+
+
+def with_selected_options(options: tuple[FacetOption, ...], selected, labels: dict) -> tuple[FacetOption, ...]:
+	selected_values = selected if isinstance(selected, (list, tuple)) else [selected]
+	present = {option.value for option in options}
+	missing = [
+		FacetOption(value=value, label=labels[value], count=0)
+		for value in selected_values
+		if value not in (None, "") and value not in present and value in labels
+	]
+	return options + tuple(missing)
+
+
+def build_disjunctive_facets(rows: Iterable[dict], filters: dict | None = None) -> InventoryFacets:
+	"""Count each facet under every active filter except its own.
+
+	``rows`` are facet rows as produced by the bucket table or a grouped
+	projection; all facets are derived from them in memory. Selected options
+	that no longer match anything are kept with a zero count so they can still
+	be cleared.
+	"""
+	rows = list(rows)
+	filters = filters or {}
+	active_keys = _active_filter_keys(filters)
+	if not active_keys & FILTER_KEYS:
+		return _rollup(rows, manufacturer_id=None)
+
+	partial = {
+		facet: _rollup(
+			[row for row in rows if _row_matches(row, filters, active_keys - excluded)],
+			manufacturer_id=None,
+		)
+		for facet, excluded in FACET_EXCLUDED_FILTERS.items()
+	}
+	manufacturer_labels = {row["manufacturer_id"]: row["manufacturer_name"] for row in rows}
+	model_labels = {row["model_id"]: f"{row['manufacturer_name']} {row['model_name']}" for row in rows}
+	return InventoryFacets(
+		stats=partial["stats"].stats,
+		categories=with_selected_options(partial["categories"].categories, filters.get("category"), dict(CarModel.BodyType.choices)),
+		transmissions=with_selected_options(partial["transmissions"].transmissions, filters.get("transmission"), dict(CarVariant.Transmission.choices)),
+		manufacturers=with_selected_options(partial["manufacturers"].manufacturers, filters.get("manufacturer"), manufacturer_labels),
+		models=with_selected_options(partial["models"].models, filters.get("model"), model_labels),
+		powertrains=with_selected_options(partial["powertrains"].powertrains, filters.get("powertrain"), dict(CarModel.Powertrain.choices)),
+		price_histogram=partial["price_histogram"].price_histogram,
+		year_histogram=partial["year_histogram"].year_histogram,
+	)
+
+
+def _bucket_rows(listing_type: str | None) -> list[dict]:
+	buckets = InventoryFacetBucket.objects.all()
+	if listing_type:
+		buckets = buckets.filter(listing_type=listing_type)
+	return [
+		{
+			"listing_type": bucket["listing_type"],
+			"body_type": bucket["body_type"],
+			"powertrain": bucket["powertrain"],
+			"transmission": bucket["transmission"],
+			"manufacturer_id": bucket["manufacturer_id"],
+			"manufacturer_name": bucket["manufacturer_name"],
+			"model_id": bucket["model_id"],
+			"model_name": bucket["model_name"],
+			"price_band": bucket["price_band"],
+			"total": bucket["variant_count"],
+			"min_price": bucket["min_price"],
+			"max_price": bucket["max_price"],
+			"min_year": bucket["year"],
+			"max_year": bucket["year"],
+		}
+		for bucket in buckets.values(
+			"listing_type",
+			"body_type",
+			"powertrain",
+			"transmission",
+			"manufacturer_id",
+			"manufacturer_name",
+			"model_id",
+			"model_name",
+			"year",
+			"price_band",
+			"variant_count",
+			"min_price",
+			"max_price",
+		)
+	]
+
+
+def _projection_rows(queryset) -> list[dict]:
+	return [
+		{
+			**row,
+			"price_band": price_band(row["price"]),
+			"min_price": row["price"],
+			"max_price": row["price"],
+			"min_year": row["year"],
+			"max_year": row["year"],
+		}
+		for row in queryset.order_by()
+		.values(
+			"listing_type",
+			"body_type",
+			"powertrain",
+			"transmission",
+			"manufacturer_id",
+			"manufacturer_name",
+			"model_id",
+			"model_name",
+			"year",
+			"price",
+		)
+		.annotate(total=Count("pk"))
+	]
+
+
+def load_inventory_facets(*, listing_type: str | None = None, filters: dict | None = None, queryset=None) -> InventoryFacets:
+	"""Return filter-aware facets for a listing type in one query.
+
+	Facets are read from the pre-aggregated bucket table. Price filters cannot be
+	answered from buckets, so when one is active and the unfiltered listing
+	``queryset`` is supplied the rows come from a single grouped projection of it instead.
+	"""
+	filters = filters or {}
+	if queryset is not None and _active_filter_keys(filters) & PRICE_FILTER_KEYS:
+		rows = _projection_rows(queryset)
+	else:
+		rows = _bucket_rows(listing_type)
+	return build_disjunctive_facets(rows, filters)
+
+
+def refresh_facet_buckets(model_ids: Iterable[int] | None = None) -> int:
+	"""Recompute the facet buckets for the given car models, or for everything.
+
+	Returns the number of buckets written.
+	"""
+	variants = CarVariant.objects.filter(
+		is_active=True,
+		model__is_active=True,
+		model__manufacturer__is_active=True,
+	)
+	buckets = InventoryFacetBucket.objects.all()
+	if model_ids is not None:
+		model_ids = {model_id for model_id in model_ids if model_id}
+		if not model_ids:
+			return 0
+		variants = variants.filter(model_id__in=model_ids)
+		buckets = buckets.filter(model_id__in=model_ids)
+
+	rows = (
+		variants.order_by()
+		.values(
+			"listing_type",
+			"model__body_type",
+			"model__powertrain",
+			"transmission",
+			"model__manufacturer_id",
+			"model__manufacturer__name",
+			"model_id",
+			"model__name",
+			"year",
+			price_band=price_band_expression(),
+		)
+		.annotate(total=Count("id"), min_price=Min("price"), max_price=Max("price"))
+	)
+	with transaction.atomic():
+		buckets.delete()
+		created = InventoryFacetBucket.objects.bulk_create(
+			[
+				InventoryFacetBucket(
+					listing_type=row["listing_type"],
+					body_type=row["model__body_type"],
+					powertrain=row["model__powertrain"],
+					transmission=row["transmission"],
+					manufacturer_id=row["model__manufacturer_id"],
+					manufacturer_name=row["model__manufacturer__name"],
+					model_id=row["model_id"],
+					model_name=row["model__name"],
+					year=row["year"],
+					price_band=row["price_band"],
+					variant_count=row["total"],
+					min_price=row["min_price"],
+					max_price=row["max_price"],
+				)
+				for row in rows
+			]
+		)
+	return len(created)
@@ -0,0 +1,275 @@
+"""
+Canonical representation of the inventory filter query string.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field, replace
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+from urllib.parse import urlencode
+
+from django.db.models import Q
+
+from .catalogue import get_catalogue
+from .facets import format_naira_short
+from .models import CarModel, CarVariant
+
+DEFAULT_SORT = "price_low_high"
+
+# sort value -> (ordering field, descending)
+SORT_FIELDS = {
+	"price_low_high": ("price", False),
+	"price_high_low": ("price", True),
+	"year_new_old": ("year", True),
+	"year_old_new": ("year", False),
+}
+
+SORT_OPTIONS = [
+	{"value": "price_low_high", "label": "Price: Low to High"},
+	{"value": "price_high_low", "label": "Price: High to Low"},
+	{"value": "year_new_old", "label": "Year: New to Old"},
+	{"value": "year_old_new", "label": "Year: Old to New"},
+]
+
+# Price filters are widened by this fraction when suggesting relaxations.
+PRICE_RELAXATION = Decimal("0.2")
+
+# Every parameter the inventory views understand, in canonical order.
+KNOWN_PARAMETERS = (
+	"price_min",
+	"price_max",
+	"year_min",
+	"year_max",
+	"category",
+	"transmission",
+	"manufacturer",
+	"model",
+	"year",
+	"powertrain",
+	"listing_type",
+	"sort",
+	"page",
+	"cursor",
+	# Legacy alias for powertrain=electric.
+	"electric",
+)
+
+
+def _parse_decimal(value: str | None) -> Decimal | None:
+	if not value:
+		return None
+	try:
+		parsed = Decimal(value)
+	except (InvalidOperation, TypeError):
+		return None
+	return parsed if parsed.is_finite() else None
+
+
+def _parse_int(value: str | None) -> int | None:
+	if not value:
+		return None
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return None
+
+
+def _parse_catalogue_id(value: str | None, lookup: str) -> int | None:
+	"""Parse an id, or resolve a slug through the catalogue registry."""
+	parsed = _parse_int(value)
+	if parsed is not None or not value:
+		return parsed
+	entry = getattr(get_catalogue(), lookup)(value)
+	return entry.id if entry else None
+
+
+def _format_decimal(value: Decimal) -> str:
+	return format(value.normalize(), "f")
+
+
+@dataclass(frozen=True)
+class InventoryFilterSpec:
+	"""Parsed, validated and normalised inventory filters.
+
+	Two query strings that select the same results produce equal specs, the
+	same ``querystring()`` and the same ``key``.
+	"""
+
+	price_min: Decimal | None = None
+	price_max: Decimal | None = None
+	year_min: int | None = None
+	year_max: int | None = None
+	category: str | None = None
+	transmissions: tuple[str, ...] = ()
+	manufacturer: int | None = None
+	model: int | None = None
+	year: int | None = None
+	powertrain: str | None = None
+	listing_type: str | None = None
+	sort: str = DEFAULT_SORT
+	page: int | None = None
+	cursor: str | None = None
+	extra: tuple[tuple[str, str], ...] = field(default=(), compare=False)
+
+	@classmethod
+	def from_querydict(cls, query) -> InventoryFilterSpec:
+		transmission_choices = [value for value, _ in CarVariant.Transmission.choices]
+		requested_transmissions = set(query.getlist("transmission"))
+		category = query.get("category")
+		listing_type = query.get("listing_type")
+		powertrain = query.get("powertrain")
+		if powertrain not in dict(CarModel.Powertrain.choices):
+			powertrain = CarModel.Powertrain.ELECTRIC.value if query.get("electric") == "true" else None
+		sort = query.get("sort")
+		page = _parse_int(query.get("page"))
+		cursor = query.get("cursor") or None
+		return cls(
+			price_min=_parse_decimal(query.get("price_min")),
+			price_max=_parse_decimal(query.get("price_max")),
+			year_min=_parse_int(query.get("year_min")),
+			year_max=_parse_int(query.get("year_max")),
+			category=category if category in dict(CarModel.BodyType.choices) else None,
+			transmissions=tuple(value for value in transmission_choices if value in requested_transmissions),
+			manufacturer=_parse_catalogue_id(query.get("manufacturer"), "manufacturer"),
+			model=_parse_catalogue_id(query.get("model"), "model"),
+			year=_parse_int(query.get("year")),
+			powertrain=powertrain,
+			listing_type=listing_type if listing_type in dict(CarVariant.ListingType.choices) else None,
+			sort=sort if sort in SORT_FIELDS else DEFAULT_SORT,
+			page=page if page and page > 1 and not cursor else None,
+			cursor=cursor,
+			extra=tuple(
+				(key, value)
+				for key, values in query.lists()
+				if key not in KNOWN_PARAMETERS
+				for value in values
+			),
+		)
+
+	@property
+	def ordering_field(self) -> tuple[str, bool]:
+		return SORT_FIELDS[self.sort]
+
+	def as_selected_filters(self) -> dict[str, object]:
+		"""The active filters in the shape the inventory templates expect."""
+		selected: dict[str, object] = {}
+		if self.price_min is not None:
+			selected["price_min"] = self.price_min
+		if self.price_max is not None:
+			selected["price_max"] = self.price_max
+		if self.year_min is not None:
+			selected["year_min"] = self.year_min
+		if self.year_max is not None:
+			selected["year_max"] = self.year_max
+		if self.category:
+			selected["category"] = self.category
+		if self.transmissions:
+			selected["transmission"] = list(self.transmissions)
+		if self.manufacturer is not None:
+			selected["manufacturer"] = self.manufacturer
+		if self.model is not None:
+			selected["model"] = self.model
+		if self.year is not None:
+			selected["year"] = self.year
+		if self.powertrain:
+			selected["powertrain"] = self.powertrain
+		if self.listing_type:
+			selected["listing_type"] = self.listing_type
+		return selected
+
+	def filter_q(self) -> Q:
+		"""The filters as one ``Q`` over ``CarVariantListing`` fields."""
+		conditions = Q()
+		if self.price_min is not None:
+			conditions &= Q(price__gte=self.price_min)
+		if self.price_max is not None:
+			conditions &= Q(price__lte=self.price_max)
+		if self.year_min is not None:
+			conditions &= Q(year__gte=self.year_min)
+		if self.year_max is not None:
+			conditions &= Q(year__lte=self.year_max)
+		if self.category:
+			conditions &= Q(body_type=self.category)
+		if self.transmissions:
+			conditions &= Q(transmission__in=self.transmissions)
+		if self.manufacturer is not None:
+			conditions &= Q(manufacturer_id=self.manufacturer)
+		if self.model is not None:
+			conditions &= Q(model_id=self.model)
+		if self.year is not None:
+			conditions &= Q(year=self.year)
+		if self.powertrain:
+			conditions &= Q(powertrain=self.powertrain)
+		if self.listing_type:
+			conditions &= Q(listing_type=self.listing_type)
+		return conditions
+
+	def filter_queryset(self, queryset):
+		"""Apply the filters to a ``CarVariantListing`` queryset."""
+		return queryset.filter(self.filter_q())
+
+	def relaxations(self) -> list[tuple[str, InventoryFilterSpec]]:
+		"""Labelled specs that each loosen one active filter, for empty result pages."""
+		relaxed = []
+		if self.price_min is not None or self.price_max is not None:
+			price_min = price_max = None
+			if self.price_min is not None:
+				price_min = (self.price_min * (1 - PRICE_RELAXATION)).to_integral_value(ROUND_FLOOR)
+			if self.price_max is not None:
+				price_max = (self.price_max * (1 + PRICE_RELAXATION)).to_integral_value(ROUND_CEILING)
+			if price_max is None:
+				label = f"Price from {format_naira_short(price_min)}"
+			elif price_min is None:
+				label = f"Price up to {format_naira_short(price_max)}"
+			else:
+				label = f"Price {format_naira_short(price_min)}–{format_naira_short(price_max)}"
+			relaxed.append((label, self.with_changes(price_min=price_min, price_max=price_max)))
+		if self.year is not None or self.year_min is not None or self.year_max is not None:
+			relaxed.append(("Any year", self.with_changes(year=None, year_min=None, year_max=None)))
+		if self.transmissions:
+			relaxed.append(("Any transmission", self.with_changes(transmissions=())))
+		if self.category:
+			relaxed.append(("Any body type", self.with_changes(category=None)))
+		if self.powertrain:
+			relaxed.append(("Any powertrain", self.with_changes(powertrain=None)))
+		if self.model is not None:
+			relaxed.append(("Any model", self.with_changes(model=None)))
+		elif self.manufacturer is not None:
+			relaxed.append(("Any brand", self.with_changes(manufacturer=None)))
+		return [(label, spec.with_changes(page=None, cursor=None)) for label, spec in relaxed]
+
+	def filter_params(self) -> list[tuple[str, str]]:
+		params: list[tuple[str, str]] = []
+		for key, value in self.as_selected_filters().items():
+			if key == "transmission":
+				params.extend(("transmission", transmission) for transmission in value)
+			elif isinstance(value, Decimal):
+				params.append((key, _format_decimal(value)))
+			else:
+				params.append((key, str(value)))
+		return params
+
+	def querystring(self, *, include_extra: bool = True) -> str:
+		params = self.filter_params()
+		if self.sort != DEFAULT_SORT:
+			params.append(("sort", self.sort))
+		if self.page:
+			params.append(("page", str(self.page)))
+		if self.cursor:
+			params.append(("cursor", self.cursor))
+		if include_extra:
+			params.extend(self.extra)
+		return urlencode(params)
+
+	def with_changes(self, **changes) -> InventoryFilterSpec:
+		return replace(self, **changes)
+
+	@property
+	def filter_key(self) -> str:
+		"""Stable hash of the filters alone, shared by every page and sort order."""
+		return hashlib.sha1(urlencode(self.filter_params()).encode()).hexdigest()
+
+	@property
+	def key(self) -> str:
+		"""Stable hash of the filters, sort order and page position."""
+		return hashlib.sha1(self.querystring(include_extra=False).encode()).hexdigest()
@@ -0,0 +1,121 @@
+"""
+Maintenance of the flattened ``CarVariantListing`` read table and of the
+primary image stored on each variant.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import CarVariant, CarVariantImage, CarVariantListing
+
+
+def primary_images(variant_ids: Iterable[int]) -> dict[int, tuple[str, str]]:
+	"""Map each variant to its first active image with a source, as (url, alt).
+
+	Variants without one map to ``("", "")``.
+	"""
+	variant_ids = {pk for pk in variant_ids if pk}
+	images = dict.fromkeys(variant_ids, ("", ""))
+	candidates = CarVariantImage.objects.filter(variant_id__in=variant_ids, is_active=True).order_by("variant_id", "order", "id")
+	for image in candidates:
+		if images[image.variant_id][0]:
+			continue
+		source = (image.source_url or "").strip()
+		if source:
+			images[image.variant_id] = (source, image.alt_text)
+	return images
+
+
+def build_listing(variant: CarVariant) -> CarVariantListing:
+	model = variant.model
+	manufacturer = model.manufacturer
+	return CarVariantListing(
+		variant=variant,
+		manufacturer=manufacturer,
+		manufacturer_name=manufacturer.name,
+		manufacturer_slug=manufacturer.slug,
+		model=model,
+		model_name=model.name,
+		model_slug=model.slug,
+		body_type=model.body_type,
+		powertrain=model.powertrain,
+		transmission=variant.transmission,
+		listing_type=variant.listing_type,
+		year=variant.year,
+		trim=variant.trim,
+		price=variant.price,
+		currency=variant.currency,
+		image_url=variant.primary_image_url,
+		image_alt=variant.primary_image_alt,
+		is_visible=variant.is_active and model.is_active and manufacturer.is_active,
+	)
+
+
+def refresh_variant_listings(
+	*,
+	variant_ids: Iterable[int] | None = None,
+	model_ids: Iterable[int] | None = None,
+	manufacturer_ids: Iterable[int] | None = None,
+) -> int:
+	"""Rewrite the listing rows for the given variants, models or manufacturers.
+
+	With no arguments every row is rebuilt. The rewrite happens in one
+	transaction so readers never see a half-updated scope. Returns the number of
+	rows written.
+	"""
+	variants = CarVariant.objects.order_by().select_related("model", "model__manufacturer")
+	listings = CarVariantListing.objects.all()
+	scopes = (
+		("pk__in", "variant_id__in", variant_ids),
+		("model_id__in", "model_id__in", model_ids),
+		("model__manufacturer_id__in", "manufacturer_id__in", manufacturer_ids),
+	)
+	for variant_lookup, listing_lookup, ids in scopes:
+		if ids is None:
+			continue
+		ids = {pk for pk in ids if pk}
+		if not ids:
+			return 0
+		variants = variants.filter(**{variant_lookup: ids})
+		listings = listings.filter(**{listing_lookup: ids})
+
+	with transaction.atomic():
+		listings.delete()
+		created = CarVariantListing.objects.bulk_create([build_listing(variant) for variant in variants])
+	return len(created)
+
+
+def refresh_primary_images(variant_ids: Iterable[int]) -> set[int]:
+	"""Recompute the stored primary image of the given variants and their listings.
+
+	Rows are updated in place rather than rebuilt so this is safe to call while
+	a variant and its images are being deleted together. Returns the ids of the
+	variants whose stored image changed.
+	"""
+	images = primary_images(variant_ids)
+	current = {
+		pk: (image_url, image_alt)
+		for pk, image_url, image_alt in CarVariant.objects.filter(pk__in=images).values_list(
+			"pk", "primary_image_url", "primary_image_alt"
+		)
+	}
+	changed = {variant_id for variant_id, image in images.items() if variant_id in current and current[variant_id] != image}
+	if not changed:
+		return changed
+	variants = [
+		CarVariant(pk=variant_id, primary_image_url=images[variant_id][0], primary_image_alt=images[variant_id][1])
+		for variant_id in changed
+	]
+	stored = CarVariant.objects.filter(pk=OuterRef("variant_id"))
+	with transaction.atomic():
+		CarVariant.objects.bulk_update(variants, ["primary_image_url", "primary_image_alt"], batch_size=500)
+		CarVariantListing.objects.filter(variant_id__in=changed).update(
+			image_url=Subquery(stored.values("primary_image_url")[:1]),
+			image_alt=Subquery(stored.values("primary_image_alt")[:1]),
+			updated_at=timezone.now(),
+		)
+	return changed
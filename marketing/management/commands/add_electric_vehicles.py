@@ -39,6 +39,7 @@ class Command(BaseCommand):
                 name=model_data["name"],
                 defaults={
                     'body_type': model_data["body_type"],
+                    'powertrain': CarModel.Powertrain.ELECTRIC,
                     'is_active': True
                 }
             )
@@ -63,6 +64,7 @@ class Command(BaseCommand):
             name="Leaf",
             defaults={
                 'body_type': CarModel.BodyType.HATCHBACK,
+                'powertrain': CarModel.Powertrain.ELECTRIC,
                 'is_active': True
             }
         )
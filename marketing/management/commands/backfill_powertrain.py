@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from marketing.facets import refresh_facet_buckets
+from marketing.listings import refresh_variant_listings
+from marketing.models import CarModel
+from marketing.versioning import INVENTORY, bump_version
+
+# Matched as whole words against "<manufacturer> <model>", first match wins.
+POWERTRAIN_PATTERNS = (
+	(CarModel.Powertrain.HYBRID, re.compile(r"\b(prius|hybrid|phev|hev|i8)\b")),
+	(CarModel.Powertrain.ELECTRIC, re.compile(r"\b(tesla|leaf|bolt|i3|ev|electric|e-tron|taycan|ioniq 5)\b")),
+	(CarModel.Powertrain.DIESEL, re.compile(r"\b(diesel|tdi|crdi|d-4d|dci)\b")),
+)
+
+
+def classify_powertrain(manufacturer_name: str, model_name: str) -> str:
+	names = f"{manufacturer_name} {model_name}".lower()
+	for powertrain, pattern in POWERTRAIN_PATTERNS:
+		if pattern.search(names):
+			return powertrain
+	return CarModel.Powertrain.PETROL
+
+
+class Command(BaseCommand):
+	help = "Classify car models by powertrain from their names, in batches."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--batch-size", type=int, default=500, help="Car models per transaction.")
+		parser.add_argument(
+			"--overwrite",
+			action="store_true",
+			help="Also reclassify models that were already classified or have a non-default powertrain.",
+		)
+		parser.add_argument("--dry-run", action="store_true", help="Report the changes without saving them.")
+
+	def handle(self, *args, **options):
+		batch_size = max(options["batch_size"], 1)
+		models = CarModel.objects.select_related("manufacturer").order_by("pk")
+		if not options["overwrite"]:
+			models = models.filter(powertrain=CarModel.Powertrain.PETROL, powertrain_classified=False)
+
+		changed_totals: Counter[str] = Counter()
+		last_pk = 0
+		while True:
+			batch = list(models.filter(pk__gt=last_pk)[:batch_size])
+			if not batch:
+				break
+			last_pk = batch[-1].pk
+
+			changed = []
+			for model in batch:
+				powertrain = classify_powertrain(model.manufacturer.name, model.name)
+				if powertrain != model.powertrain:
+					model.powertrain = powertrain
+					model.updated_at = timezone.now()
+					changed.append(model)
+					changed_totals[powertrain] += 1
+			if options["dry_run"]:
+				continue
+
+			for model in batch:
+				model.powertrain_classified = True
+			model_ids = {model.pk for model in changed}
+			with transaction.atomic():
+				CarModel.objects.bulk_update(batch, ["powertrain", "powertrain_classified", "updated_at"])
+				if model_ids:
+					refresh_variant_listings(model_ids=model_ids)
+					refresh_facet_buckets(model_ids)
+
+		if changed_totals and not options["dry_run"]:
+			bump_version(INVENTORY)
+		summary = ", ".join(f"{count} {powertrain}" for powertrain, count in sorted(changed_totals.items())) or "no changes"
+		prefix = "Would update" if options["dry_run"] else "Updated"
+		self.stdout.write(self.style.SUCCESS(f"{prefix} {sum(changed_totals.values())} car models ({summary})."))
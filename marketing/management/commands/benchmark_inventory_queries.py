@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from marketing.models import (
+	CarManufacturer,
+	CarModel,
+	CarVariant,
+	CarVariantImage,
+	CarVariantListing,
+)
+
+INDEXED_MODELS = (CarVariant, CarVariantImage, CarVariantListing)
+
+
+class Command(BaseCommand):
+	help = (
+		"Time the inventory hot queries with and without the inventory indexes and print their query plans. "
+		"Everything, including the synthetic data, runs in a transaction that is rolled back."
+	)
+
+	def add_arguments(self, parser):
+		parser.add_argument("--variants", type=int, default=50000, help="Synthetic variants to create (0 to use existing data).")
+		parser.add_argument("--repeat", type=int, default=20, help="Runs per query; the median is reported.")
+		parser.add_argument("--no-plans", action="store_true", help="Only print timings.")
+
+	def handle(self, *args, **options):
+		with transaction.atomic():
+			if options["variants"]:
+				self.stdout.write(f"Creating {options['variants']} synthetic variants…")
+				self._create_synthetic_inventory(options["variants"])
+			self._analyze()
+
+			after = self._measure(options["repeat"])
+			self._drop_indexes()
+			self._analyze()
+			before = self._measure(options["repeat"])
+			transaction.set_rollback(True)
+
+		for label, (before_ms, before_plan) in before.items():
+			after_ms, after_plan = after[label]
+			self.stdout.write(self.style.MIGRATE_HEADING(label))
+			self.stdout.write(f"  without indexes: {before_ms:8.2f} ms")
+			self.stdout.write(f"  with indexes:    {after_ms:8.2f} ms")
+			if not options["no_plans"]:
+				self.stdout.write("  plan without indexes:")
+				self.stdout.write(self._indent(before_plan))
+				self.stdout.write("  plan with indexes:")
+				self.stdout.write(self._indent(after_plan))
+		self.stdout.write(self.style.SUCCESS("Benchmark finished; all changes were rolled back."))
+
+	def _hot_queries(self):
+		visible = CarVariantListing.objects.filter(is_visible=True)
+		middle = visible.order_by("price", "pk")[visible.count() // 2 : visible.count() // 2 + 1].first()
+		sample = visible.order_by("pk").first()
+		if sample is None:
+			return {}
+		sample_ids = list(visible.order_by("price", "pk").values_list("pk", flat=True)[:12])
+		return {
+			"Inventory page, price low to high": visible.order_by("price", "pk")[:13],
+			"Registered cars, year new to old": visible.filter(listing_type=CarVariant.ListingType.REGISTERED).order_by("-year", "-pk")[:13],
+			"Inventory keyset page from the middle": visible.filter(
+				Q(price__gte=middle.price) & (Q(price__gt=middle.price) | Q(pk__gt=middle.pk))
+			).order_by("price", "pk")[:13],
+			"Bounded result count": visible.order_by().values("pk")[:1001],
+			"Detail related vehicles": visible.filter(manufacturer_id=sample.manufacturer_id).exclude(pk=sample.pk).order_by("-year")[:3],
+			"Variants API": visible.filter(model_id=sample.model_id).order_by("-year", "trim"),
+			"Primary images for a page": CarVariantImage.objects.filter(is_active=True, variant_id__in=sample_ids).order_by("order", "id"),
+			"Recently updated variants": CarVariant.objects.filter(is_active=True).order_by("-updated_at")[:3],
+		}
+
+	def _measure(self, repeat: int) -> dict[str, tuple[float, str]]:
+		results = {}
+		for label, queryset in self._hot_queries().items():
+			timings = []
+			for _ in range(max(repeat, 1)):
+				started = time.perf_counter()
+				list(queryset.all())
+				timings.append((time.perf_counter() - started) * 1000)
+			results[label] = (statistics.median(timings), queryset.explain())
+		return results
+
+	def _drop_indexes(self):
+		quote_name = connection.ops.quote_name
+		with connection.cursor() as cursor:
+			for model in INDEXED_MODELS:
+				for index in model._meta.indexes:
+					cursor.execute(f"DROP INDEX {quote_name(index.name)}")
+
+	def _analyze(self):
+		if connection.vendor in ("sqlite", "postgresql"):
+			with connection.cursor() as cursor:
+				cursor.execute("ANALYZE")
+
+	def _create_synthetic_inventory(self, count: int):
+		rng = random.Random(2024)
+		manufacturers = CarManufacturer.objects.bulk_create(
+			[CarManufacturer(name=f"Benchmark Make {index}", slug=f"benchmark-make-{index}") for index in range(40)]
+		)
+		models = CarModel.objects.bulk_create(
+			[
+				CarModel(
+					manufacturer=manufacturer,
+					name=f"Model {index}",
+					slug=f"{manufacturer.slug}-model-{index}",
+					body_type=rng.choice(CarModel.BodyType.values),
+				)
+				for manufacturer in manufacturers
+				for index in range(10)
+			]
+		)
+		variants = CarVariant.objects.bulk_create(
+			[
+				CarVariant(
+					model=models[index % len(models)],
+					year=rng.randint(2005, 2025),
+					trim=f"Benchmark {index}",
+					price=Decimal(rng.randrange(2_000_000, 150_000_000, 50_000)),
+					transmission=rng.choice(CarVariant.Transmission.values),
+					listing_type=rng.choice(CarVariant.ListingType.values),
+					is_active=rng.random() > 0.1,
+				)
+				for index in range(count)
+			],
+			batch_size=1000,
+		)
+		CarVariantImage.objects.bulk_create(
+			[
+				CarVariantImage(variant=variant, image_url=f"https://example.com/benchmark/{variant.pk}.jpg", order=order)
+				for variant in variants
+				for order in range(2)
+			],
+			batch_size=1000,
+		)
+		model_by_id = {model.pk: model for model in models}
+		manufacturer_by_id = {manufacturer.pk: manufacturer for manufacturer in manufacturers}
+		listings = []
+		for variant in variants:
+			model = model_by_id[variant.model_id]
+			manufacturer = manufacturer_by_id[model.manufacturer_id]
+			listings.append(
+				CarVariantListing(
+					variant=variant,
+					manufacturer=manufacturer,
+					manufacturer_name=manufacturer.name,
+					manufacturer_slug=manufacturer.slug,
+					model=model,
+					model_name=model.name,
+					model_slug=model.slug,
+					body_type=model.body_type,
+					transmission=variant.transmission,
+					listing_type=variant.listing_type,
+					year=variant.year,
+					trim=variant.trim,
+					price=variant.price,
+					image_url=f"https://example.com/benchmark/{variant.pk}.jpg",
+					is_visible=variant.is_active,
+				)
+			)
+		CarVariantListing.objects.bulk_create(listings, batch_size=1000)
+
+	@staticmethod
+	def _indent(text: str) -> str:
+		return "\n".join(f"    {line}" for line in text.splitlines())
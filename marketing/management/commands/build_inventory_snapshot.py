@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from marketing import columnar
+from marketing.snapshot import prune_snapshots
+from marketing.versioning import INVENTORY, get_version
+
+
+class Command(BaseCommand):
+	help = "Write the shared columnar inventory snapshot for the current inventory version."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--directory",
+			help="Snapshot directory; defaults to the TODDE_INVENTORY_SNAPSHOT_DIR setting.",
+		)
+
+	def handle(self, *args, **options):
+		if columnar.np is None:
+			raise CommandError("NumPy is required to build inventory snapshots.")
+		directory = options["directory"] or getattr(settings, "TODDE_INVENTORY_SNAPSHOT_DIR", None)
+		if not directory:
+			raise CommandError("Pass --directory or set TODDE_INVENTORY_SNAPSHOT_DIR.")
+
+		version = get_version(INVENTORY)
+		inventory = columnar.ColumnarInventory.load(version)
+		path = inventory.write_snapshot(directory)
+		removed = prune_snapshots(directory, before=version)
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Wrote {len(inventory)} listings to {path} ({path.stat().st_size} bytes); removed {removed} older snapshots."
+			)
+		)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+
+from django.core.management.base import BaseCommand
+
+from marketing.export import EXPORT_FORMATS, export_inventory
+
+
+class Command(BaseCommand):
+	help = "Write the active inventory as CSV or JSON Lines for marketplace partners."
+
+	def add_arguments(self, parser):
+		parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+		parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output.")
+		parser.add_argument("--base-url", default="", help="Scheme and host prefixed to the vehicle URLs, e.g. https://todde.africa.")
+		parser.add_argument("--output", "-o", help="File to write to; defaults to standard output.")
+		parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched from the database per query.")
+
+	def handle(self, *args, **options):
+		chunks = export_inventory(
+			options["format"],
+			compress=options["gzip"],
+			base_url=options["base_url"].rstrip("/"),
+			chunk_size=max(options["chunk_size"], 1),
+		)
+		if options["output"]:
+			with open(options["output"], "wb") as output:
+				written = self._write(chunks, output)
+			self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}."))
+		elif options["gzip"]:
+			self._write(chunks, sys.stdout.buffer)
+		else:
+			for chunk in chunks:
+				self.stdout.write(chunk.decode(), ending="")
+
+	@staticmethod
+	def _write(chunks, output) -> int:
+		written = 0
+		for chunk in chunks:
+			output.write(chunk)
+			written += len(chunk)
+		return written
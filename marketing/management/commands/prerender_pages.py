@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from marketing.prerender import export_pages
+
+
+class Command(BaseCommand):
+	help = "Render the marketing, landing and vehicle pages to static HTML, re-rendering only pages that changed."
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			"--directory",
+			help="Export directory; defaults to the TODDE_PRERENDER_DIR setting.",
+		)
+		parser.add_argument(
+			"--host",
+			help="Host the pages are rendered for; defaults to the first ALLOWED_HOSTS entry.",
+		)
+		parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes to render with.")
+		parser.add_argument("--force", action="store_true", help="Re-render every page, even if its ETag is unchanged.")
+
+	def handle(self, *args, **options):
+		directory = options["directory"] or getattr(settings, "TODDE_PRERENDER_DIR", None)
+		if not directory:
+			raise CommandError("Pass --directory or set TODDE_PRERENDER_DIR.")
+		host = options["host"] or next((host for host in settings.ALLOWED_HOSTS if host not in ("*", "")), None)
+		if not host:
+			raise CommandError("Pass --host; ALLOWED_HOSTS names no concrete host.")
+
+		result = export_pages(directory, host=host, jobs=max(options["jobs"], 1), force=options["force"])
+		for url in result.skipped:
+			self.stderr.write(self.style.WARNING(f"Skipped {url}: not a cacheable 200 response."))
+		self.stdout.write(
+			self.style.SUCCESS(
+				f"Rendered {len(result.rendered)} pages, kept {len(result.unchanged)} unchanged and removed {len(result.removed)} in {directory}."
+			)
+		)
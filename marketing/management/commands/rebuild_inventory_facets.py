@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from marketing.facets import refresh_facet_buckets
+from marketing.versioning import INVENTORY, bump_version
+
+
+class Command(BaseCommand):
+	help = "Rebuild the pre-aggregated inventory facet buckets from live variants."
+
+	def handle(self, *args, **options):
+		self.stdout.write("Rebuilding inventory facet buckets…")
+		written = refresh_facet_buckets()
+		bump_version(INVENTORY)
+		self.stdout.write(self.style.SUCCESS(f"Wrote {written} facet buckets."))
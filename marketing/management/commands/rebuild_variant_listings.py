@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from marketing.listings import refresh_primary_images, refresh_variant_listings
+from marketing.models import CarVariant
+from marketing.versioning import INVENTORY, VEHICLE_PAGES, bump_version
+
+
+class Command(BaseCommand):
+	help = "Rebuild the variant primary images and the flattened listing table from the catalogue."
+
+	def handle(self, *args, **options):
+		self.stdout.write("Rebuilding car variant listings…")
+		refresh_primary_images(CarVariant.objects.values_list("pk", flat=True))
+		written = refresh_variant_listings()
+		bump_version(INVENTORY)
+		bump_version(VEHICLE_PAGES)
+		self.stdout.write(self.style.SUCCESS(f"Wrote {written} variant listings."))
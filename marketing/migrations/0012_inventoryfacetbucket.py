@@ -0,0 +1,81 @@
+# Generated by Django 5.0.14 on 2026-10-18 00:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def populate_facet_buckets(apps, schema_editor):
+    CarVariant = apps.get_model("marketing", "CarVariant")
+    InventoryFacetBucket = apps.get_model("marketing", "InventoryFacetBucket")
+
+    rows = (
+        CarVariant.objects.filter(
+            is_active=True,
+            model__is_active=True,
+            model__manufacturer__is_active=True,
+        )
+        .order_by()
+        .values(
+            "listing_type",
+            "model__body_type",
+            "transmission",
+            "model__manufacturer_id",
+            "model__manufacturer__name",
+            "model_id",
+            "model__name",
+            "year",
+        )
+        .annotate(total=Count("id"), min_price=Min("price"), max_price=Max("price"))
+    )
+    InventoryFacetBucket.objects.bulk_create(
+        [
+            InventoryFacetBucket(
+                listing_type=row["listing_type"],
+                body_type=row["model__body_type"],
+                transmission=row["transmission"],
+                manufacturer_id=row["model__manufacturer_id"],
+                manufacturer_name=row["model__manufacturer__name"],
+                model_id=row["model_id"],
+                model_name=row["model__name"],
+                year=row["year"],
+                variant_count=row["total"],
+                min_price=row["min_price"],
+                max_price=row["max_price"],
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0011_carvariantimage_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryFacetBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('listing_type', models.CharField(choices=[('registered', 'Registered'), ('foreign-used', 'Foreign Used')], max_length=20)),
+                ('body_type', models.CharField(choices=[('sedan', 'Sedan'), ('suv', 'SUV'), ('coupe', 'Coupe'), ('hatchback', 'Hatchback'), ('truck', 'Truck'), ('van', 'Van'), ('other', 'Other')], max_length=30)),
+                ('transmission', models.CharField(choices=[('automatic', 'Automatic'), ('manual', 'Manual'), ('cvt', 'CVT'), ('dual-clutch', 'Dual Clutch'), ('other', 'Other')], max_length=20)),
+                ('manufacturer_name', models.CharField(max_length=120)),
+                ('model_name', models.CharField(max_length=120)),
+                ('year', models.PositiveIntegerField()),
+                ('variant_count', models.PositiveIntegerField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('manufacturer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='marketing.carmanufacturer')),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='marketing.carmodel')),
+            ],
+            options={
+                'verbose_name': 'Inventory facet bucket',
+                'verbose_name_plural': 'Inventory facet buckets',
+                'unique_together': {('listing_type', 'body_type', 'transmission', 'manufacturer', 'model', 'year')},
+            },
+        ),
+        migrations.RunPython(populate_facet_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Prefetch
+
+
+def populate_variant_listings(apps, schema_editor):
+    CarVariant = apps.get_model("marketing", "CarVariant")
+    CarVariantImage = apps.get_model("marketing", "CarVariantImage")
+    CarVariantListing = apps.get_model("marketing", "CarVariantListing")
+
+    listings = []
+    variants = CarVariant.objects.select_related("model", "model__manufacturer").prefetch_related(
+        Prefetch(
+            "images",
+            queryset=CarVariantImage.objects.filter(is_active=True).order_by("order", "id"),
+        )
+    )
+    for variant in variants:
+        model = variant.model
+        manufacturer = model.manufacturer
+        image_url, image_alt = "", ""
+        for image in variant.images.all():
+            source = (image.image.url if image.image else image.image_url or "").strip()
+            if source:
+                image_url, image_alt = source, image.alt_text
+                break
+        listings.append(
+            CarVariantListing(
+                variant=variant,
+                manufacturer=manufacturer,
+                manufacturer_name=manufacturer.name,
+                manufacturer_slug=manufacturer.slug,
+                model=model,
+                model_name=model.name,
+                model_slug=model.slug,
+                body_type=model.body_type,
+                transmission=variant.transmission,
+                listing_type=variant.listing_type,
+                year=variant.year,
+                trim=variant.trim,
+                price=variant.price,
+                currency=variant.currency,
+                image_url=image_url,
+                image_alt=image_alt,
+                is_visible=variant.is_active and model.is_active and manufacturer.is_active,
+            )
+        )
+    CarVariantListing.objects.bulk_create(listings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0012_inventoryfacetbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarVariantListing',
+            fields=[
+                ('variant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='marketing.carvariant')),
+                ('manufacturer_name', models.CharField(max_length=120)),
+                ('manufacturer_slug', models.SlugField(blank=True, max_length=140)),
+                ('model_name', models.CharField(max_length=120)),
+                ('model_slug', models.SlugField(blank=True, max_length=160)),
+                ('body_type', models.CharField(choices=[('sedan', 'Sedan'), ('suv', 'SUV'), ('coupe', 'Coupe'), ('hatchback', 'Hatchback'), ('truck', 'Truck'), ('van', 'Van'), ('other', 'Other')], max_length=30)),
+                ('transmission', models.CharField(choices=[('automatic', 'Automatic'), ('manual', 'Manual'), ('cvt', 'CVT'), ('dual-clutch', 'Dual Clutch'), ('other', 'Other')], max_length=20)),
+                ('listing_type', models.CharField(choices=[('registered', 'Registered'), ('foreign-used', 'Foreign Used')], max_length=20)),
+                ('year', models.PositiveIntegerField()),
+                ('trim', models.CharField(blank=True, max_length=120)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('currency', models.CharField(default='NGN', max_length=3)),
+                ('image_url', models.CharField(blank=True, max_length=500)),
+                ('image_alt', models.CharField(blank=True, max_length=160)),
+                ('is_visible', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('manufacturer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='marketing.carmanufacturer')),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='marketing.carmodel')),
+            ],
+            options={
+                'verbose_name': 'Car variant listing',
+                'verbose_name_plural': 'Car variant listings',
+            },
+        ),
+        migrations.RunPython(populate_variant_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0013_carvariantlisting'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carvariant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='variant_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['variant', 'order', 'id'], name='variantimage_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['price', 'variant'], name='listing_visible_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['year', 'variant'], name='listing_visible_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['listing_type', 'price', 'variant'], name='listing_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['listing_type', 'year', 'variant'], name='listing_type_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['manufacturer', 'year'], name='listing_manufacturer_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['model', '-year', 'trim'], name='listing_model_year_idx'),
+        ),
+    ]
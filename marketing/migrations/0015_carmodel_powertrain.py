@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0014_inventory_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='inventoryfacetbucket',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='carmodel',
+            name='powertrain',
+            field=models.CharField(choices=[('petrol', 'Petrol'), ('diesel', 'Diesel'), ('hybrid', 'Hybrid'), ('electric', 'Electric')], db_index=True, default='petrol', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='carvariantlisting',
+            name='powertrain',
+            field=models.CharField(choices=[('petrol', 'Petrol'), ('diesel', 'Diesel'), ('hybrid', 'Hybrid'), ('electric', 'Electric')], default='petrol', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='inventoryfacetbucket',
+            name='powertrain',
+            field=models.CharField(choices=[('petrol', 'Petrol'), ('diesel', 'Diesel'), ('hybrid', 'Hybrid'), ('electric', 'Electric')], default='petrol', max_length=20),
+        ),
+        migrations.AlterUniqueTogether(
+            name='inventoryfacetbucket',
+            unique_together={('listing_type', 'body_type', 'powertrain', 'transmission', 'manufacturer', 'model', 'year')},
+        ),
+        migrations.AddIndex(
+            model_name='carvariantlisting',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['powertrain', 'price', 'variant'], name='listing_powertrain_price_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:14
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_primary_images_from_listings(apps, schema_editor):
+    CarVariant = apps.get_model("marketing", "CarVariant")
+    CarVariantListing = apps.get_model("marketing", "CarVariantListing")
+
+    listings = CarVariantListing.objects.filter(variant_id=OuterRef("pk"))
+    CarVariant.objects.filter(listing__isnull=False).update(
+        primary_image_url=Subquery(listings.values("image_url")[:1]),
+        primary_image_alt=Subquery(listings.values("image_alt")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0015_carmodel_powertrain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carvariant',
+            name='primary_image_alt',
+            field=models.CharField(blank=True, editable=False, max_length=160),
+        ),
+        migrations.AddField(
+            model_name='carvariant',
+            name='primary_image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(copy_primary_images_from_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.0.14 on 2026-10-18 01:18
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, Count, Max, Min, Value, When
+
+# Frozen copy of marketing.facets.PRICE_BAND_EDGES at the time of this migration.
+PRICE_BAND_EDGES = tuple(
+    Decimal(step) * 10**exponent
+    for exponent in (6, 7, 8)
+    for step in ("1", "2", "3", "5", "7.5")
+)
+
+
+def rebuild_facet_buckets(apps, schema_editor):
+    CarVariant = apps.get_model("marketing", "CarVariant")
+    InventoryFacetBucket = apps.get_model("marketing", "InventoryFacetBucket")
+
+    rows = (
+        CarVariant.objects.filter(
+            is_active=True,
+            model__is_active=True,
+            model__manufacturer__is_active=True,
+        )
+        .order_by()
+        .values(
+            "listing_type",
+            "model__body_type",
+            "model__powertrain",
+            "transmission",
+            "model__manufacturer_id",
+            "model__manufacturer__name",
+            "model_id",
+            "model__name",
+            "year",
+            price_band=Case(
+                *(When(price__lt=edge, then=Value(band)) for band, edge in enumerate(PRICE_BAND_EDGES)),
+                default=Value(len(PRICE_BAND_EDGES)),
+            ),
+        )
+        .annotate(total=Count("id"), min_price=Min("price"), max_price=Max("price"))
+    )
+    InventoryFacetBucket.objects.all().delete()
+    InventoryFacetBucket.objects.bulk_create(
+        [
+            InventoryFacetBucket(
+                listing_type=row["listing_type"],
+                body_type=row["model__body_type"],
+                powertrain=row["model__powertrain"],
+                transmission=row["transmission"],
+                manufacturer_id=row["model__manufacturer_id"],
+                manufacturer_name=row["model__manufacturer__name"],
+                model_id=row["model_id"],
+                model_name=row["model__name"],
+                year=row["year"],
+                price_band=row["price_band"],
+                variant_count=row["total"],
+                min_price=row["min_price"],
+                max_price=row["max_price"],
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0016_carvariant_primary_image'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='inventoryfacetbucket',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='inventoryfacetbucket',
+            name='price_band',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Index into marketing.facets.PRICE_BAND_EDGES'),
+        ),
+        migrations.RunPython(rebuild_facet_buckets, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='inventoryfacetbucket',
+            unique_together={('listing_type', 'body_type', 'powertrain', 'transmission', 'manufacturer', 'model', 'year', 'price_band')},
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.14 on 2026-10-18 02:02
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of backfill_powertrain.POWERTRAIN_PATTERNS at the time of this migration.
+POWERTRAIN_PATTERNS = (
+    ("hybrid", re.compile(r"\b(prius|hybrid|phev|hev|i8)\b")),
+    ("electric", re.compile(r"\b(tesla|leaf|bolt|i3|ev|electric|e-tron|taycan|ioniq 5)\b")),
+    ("diesel", re.compile(r"\b(diesel|tdi|crdi|d-4d|dci)\b")),
+)
+
+
+def classify_powertrains(apps, schema_editor):
+    CarModel = apps.get_model("marketing", "CarModel")
+    CarVariantListing = apps.get_model("marketing", "CarVariantListing")
+    InventoryFacetBucket = apps.get_model("marketing", "InventoryFacetBucket")
+
+    # 0015 added every model as petrol; anything else was set deliberately since.
+    CarModel.objects.exclude(powertrain="petrol").update(powertrain_classified=True)
+    changed = {}
+    for model_id, manufacturer_name, model_name in CarModel.objects.filter(powertrain="petrol").values_list(
+        "pk", "manufacturer__name", "name"
+    ):
+        names = f"{manufacturer_name} {model_name}".lower()
+        for powertrain, pattern in POWERTRAIN_PATTERNS:
+            if pattern.search(names):
+                changed.setdefault(powertrain, []).append(model_id)
+                break
+    for powertrain, model_ids in changed.items():
+        CarModel.objects.filter(pk__in=model_ids).update(powertrain=powertrain)
+        # Every listing row and bucket of a model shares its powertrain, so
+        # moving them all at once cannot collide with another bucket.
+        CarVariantListing.objects.filter(model_id__in=model_ids).update(powertrain=powertrain)
+        InventoryFacetBucket.objects.filter(model_id__in=model_ids).update(powertrain=powertrain)
+    CarModel.objects.update(powertrain_classified=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0017_inventoryfacetbucket_price_band'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carmodel',
+            name='powertrain_classified',
+            field=models.BooleanField(default=False, editable=False, help_text='Set once an admin or backfill_powertrain has chosen the powertrain; the backfill then leaves it alone.'),
+        ),
+        migrations.RunPython(classify_powertrains, migrations.RunPython.noop),
+    ]
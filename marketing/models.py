@@ -2,9 +2,15 @@ from __future__ import annotations
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.templatetags.static import static
 from django.utils.text import slugify
 
 
+def format_price(price, currency: str) -> str:
+	price_value = f"{price:,.0f}" if price == price.to_integral_value() else f"{price:,.2f}"
+	return f"₦{price_value}" if currency.upper() == "NGN" else f"{currency} {price_value}"
+
+
 class TimeStampedModel(models.Model):
 
 	created_at = models.DateTimeField(auto_now_add=True)
@@ -56,6 +62,12 @@ class CarModel(TimeStampedModel):
 		VAN = ("van", "Van")
 		OTHER = ("other", "Other")
 
+	class Powertrain(models.TextChoices):
+		PETROL = ("petrol", "Petrol")
+		DIESEL = ("diesel", "Diesel")
+		HYBRID = ("hybrid", "Hybrid")
+		ELECTRIC = ("electric", "Electric")
+
 	manufacturer = models.ForeignKey(
 		CarManufacturer,
 		on_delete=models.CASCADE,
@@ -68,6 +80,17 @@ class CarModel(TimeStampedModel):
 		choices=BodyType.choices,
 		default=BodyType.SEDAN,
 	)
+	powertrain = models.CharField(
+		max_length=20,
+		choices=Powertrain.choices,
+		default=Powertrain.PETROL,
+		db_index=True,
+	)
+	powertrain_classified = models.BooleanField(
+		default=False,
+		editable=False,
+		help_text="Set once an admin or backfill_powertrain has chosen the powertrain; the backfill then leaves it alone.",
+	)
 	is_active = models.BooleanField(default=True)
 
 	class Meta:
@@ -121,10 +144,16 @@ class CarVariant(TimeStampedModel):
 		default=ListingType.REGISTERED,
 	)
 	is_active = models.BooleanField(default=True)
+	# First active image with a source, maintained by the image signals.
+	primary_image_url = models.CharField(max_length=500, blank=True, editable=False)
+	primary_image_alt = models.CharField(max_length=160, blank=True, editable=False)
 
 	class Meta:
 		ordering = ("-year", "model__name")
 		unique_together = ("model", "year", "trim")
+		indexes = [
+			models.Index(fields=["-updated_at"], condition=models.Q(is_active=True), name="variant_active_recent_idx"),
+		]
 
 	def __str__(self) -> str:
 		trim_display = f" {self.trim}" if self.trim else ""
@@ -132,8 +161,11 @@ class CarVariant(TimeStampedModel):
 
 	@property
 	def formatted_price(self) -> str:
-		price_value = f"{self.price:,.0f}" if self.price == self.price.to_integral_value() else f"{self.price:,.2f}"
-		return f"₦{price_value}" if self.currency.upper() == "NGN" else f"{self.currency} {price_value}"
+		return format_price(self.price, self.currency)
+
+	@property
+	def primary_image_is_placeholder(self) -> bool:
+		return not self.primary_image_url
 
 
 class CarVariantDetail(TimeStampedModel):
@@ -187,6 +219,9 @@ class CarVariantImage(OrderableModel):
 		ordering = ("order", "id")
 		verbose_name = "Car variant image"
 		verbose_name_plural = "Car variant images"
+		indexes = [
+			models.Index(fields=["variant", "order", "id"], condition=models.Q(is_active=True), name="variantimage_active_order_idx"),
+		]
 
 	def __str__(self) -> str:
 		return f"Image for {self.variant}"
@@ -243,6 +278,116 @@ class CarVariantSpecification(OrderableModel):
 		return f"{self.label}: {self.value}"
 
 
+class InventoryFacetBucket(models.Model):
+	"""Pre-aggregated variant counts per facet combination, maintained by signals."""
+
+	listing_type = models.CharField(max_length=20, choices=CarVariant.ListingType.choices)
+	body_type = models.CharField(max_length=30, choices=CarModel.BodyType.choices)
+	powertrain = models.CharField(max_length=20, choices=CarModel.Powertrain.choices, default=CarModel.Powertrain.PETROL)
+	transmission = models.CharField(max_length=20, choices=CarVariant.Transmission.choices)
+	manufacturer = models.ForeignKey(
+		CarManufacturer,
+		on_delete=models.CASCADE,
+		related_name="+",
+	)
+	manufacturer_name = models.CharField(max_length=120)
+	model = models.ForeignKey(
+		CarModel,
+		on_delete=models.CASCADE,
+		related_name="+",
+	)
+	model_name = models.CharField(max_length=120)
+	year = models.PositiveIntegerField()
+	price_band = models.PositiveSmallIntegerField(default=0, help_text="Index into marketing.facets.PRICE_BAND_EDGES")
+	variant_count = models.PositiveIntegerField(default=0)
+	min_price = models.DecimalField(max_digits=12, decimal_places=2)
+	max_price = models.DecimalField(max_digits=12, decimal_places=2)
+
+	class Meta:
+		unique_together = ("listing_type", "body_type", "powertrain", "transmission", "manufacturer", "model", "year", "price_band")
+		verbose_name = "Inventory facet bucket"
+		verbose_name_plural = "Inventory facet buckets"
+
+	def __str__(self) -> str:
+		return f"{self.manufacturer_name} {self.model_name} {self.year} ({self.variant_count})"
+
+
+class CarVariantListing(models.Model):
+	"""Flattened copy of a variant and its catalogue for listing queries, maintained by signals."""
+
+	variant = models.OneToOneField(
+		CarVariant,
+		on_delete=models.CASCADE,
+		primary_key=True,
+		related_name="listing",
+	)
+	manufacturer = models.ForeignKey(
+		CarManufacturer,
+		on_delete=models.CASCADE,
+		related_name="+",
+	)
+	manufacturer_name = models.CharField(max_length=120)
+	manufacturer_slug = models.SlugField(max_length=140, blank=True)
+	model = models.ForeignKey(
+		CarModel,
+		on_delete=models.CASCADE,
+		related_name="+",
+	)
+	model_name = models.CharField(max_length=120)
+	model_slug = models.SlugField(max_length=160, blank=True)
+	body_type = models.CharField(max_length=30, choices=CarModel.BodyType.choices)
+	powertrain = models.CharField(max_length=20, choices=CarModel.Powertrain.choices, default=CarModel.Powertrain.PETROL)
+	transmission = models.CharField(max_length=20, choices=CarVariant.Transmission.choices)
+	listing_type = models.CharField(max_length=20, choices=CarVariant.ListingType.choices)
+	year = models.PositiveIntegerField()
+	trim = models.CharField(max_length=120, blank=True)
+	price = models.DecimalField(max_digits=12, decimal_places=2)
+	currency = models.CharField(max_length=3, default="NGN")
+	image_url = models.CharField(max_length=500, blank=True)
+	image_alt = models.CharField(max_length=160, blank=True)
+	is_visible = models.BooleanField(default=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		verbose_name = "Car variant listing"
+		verbose_name_plural = "Car variant listings"
+		# Listing pages filter visible rows (optionally by listing type) and seek
+		# along (price | year, pk); descending sorts walk the same indexes backwards.
+		indexes = [
+			models.Index(fields=["price", "variant"], condition=models.Q(is_visible=True), name="listing_visible_price_idx"),
+			models.Index(fields=["year", "variant"], condition=models.Q(is_visible=True), name="listing_visible_year_idx"),
+			models.Index(fields=["listing_type", "price", "variant"], condition=models.Q(is_visible=True), name="listing_type_price_idx"),
+			models.Index(fields=["listing_type", "year", "variant"], condition=models.Q(is_visible=True), name="listing_type_year_idx"),
+			models.Index(fields=["powertrain", "price", "variant"], condition=models.Q(is_visible=True), name="listing_powertrain_price_idx"),
+			models.Index(fields=["manufacturer", "year"], condition=models.Q(is_visible=True), name="listing_manufacturer_year_idx"),
+			models.Index(fields=["model", "-year", "trim"], condition=models.Q(is_visible=True), name="listing_model_year_idx"),
+		]
+
+	def __str__(self) -> str:
+		trim_display = f" {self.trim}" if self.trim else ""
+		return f"{self.manufacturer_name} {self.model_name} {self.year}{trim_display}"
+
+	@property
+	def id(self) -> int:
+		return self.variant_id
+
+	@property
+	def formatted_price(self) -> str:
+		return format_price(self.price, self.currency)
+
+	@property
+	def display_image_url(self) -> str:
+		return self.image_url or static("images/vehicle-placeholder.svg")
+
+	@property
+	def display_image_alt(self) -> str:
+		return self.image_alt or f"{self.manufacturer_name} {self.model_name} {self.year}"
+
+	@property
+	def display_image_is_placeholder(self) -> bool:
+		return not self.image_url
+
+
 class NavigationLink(OrderableModel):
 	label = models.CharField(max_length=120)
 	href = models.CharField(max_length=255)
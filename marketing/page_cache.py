@@ -0,0 +1,48 @@
+"""
+Full-response cache for anonymous requests to version-tagged pages.
+
+A cached page is stored under its ETag, which is derived from the version
+counters of everything it shows. Saving any of that content (in the admin or
+elsewhere) bumps a counter, so the next request renders afresh without an
+explicit purge.
+"""
+from __future__ import annotations
+
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+def cache_anonymous_page(etag_func):
+	"""Serve repeat anonymous GETs of the decorated view from the cache.
+
+	The query string is not part of the key, so only decorate views whose
+	output does not depend on it (campaign parameters then share one entry).
+	"""
+
+	def decorator(view):
+		@wraps(view)
+		def wrapper(request, *args, **kwargs):
+			if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+				return view(request, *args, **kwargs)
+
+			cache_key = f"marketing:page:{request.path}:{etag_func(request, *args, **kwargs)}"
+			cached = cache.get(cache_key)
+			if cached is not None:
+				content, content_type = cached
+				return HttpResponse(content, content_type=content_type)
+
+			response = view(request, *args, **kwargs)
+			if response.status_code == 200 and not response.streaming and not response.cookies:
+				cache.set(
+					cache_key,
+					(response.content, response["Content-Type"]),
+					getattr(settings, "TODDE_PAGE_CACHE_TIMEOUT", 3600),
+				)
+			return response
+
+		return wrapper
+
+	return decorator
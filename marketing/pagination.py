@@ -0,0 +1,297 @@
+"""
+Keyset (seek) pagination for the inventory listings.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Q, QuerySet
+
+
+MAX_ID = 2**63
+
+
+def encode_cursor(payload: dict) -> str:
+	raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+	return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> dict | None:
+	if not token:
+		return None
+	try:
+		raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+		payload = json.loads(raw)
+	except (binascii.Error, ValueError, UnicodeDecodeError):
+		return None
+	if not isinstance(payload, dict) or not {"s", "v", "id", "o", "d"} <= payload.keys():
+		return None
+	if not all(type(payload[key]) is int for key in ("id", "o")) or payload["d"] not in ("n", "p"):
+		return None
+	# Out-of-range numbers would overflow the database's integer columns.
+	if not 0 < payload["id"] < MAX_ID or not 0 <= payload["o"] < MAX_ID:
+		return None
+	return payload
+
+
+class KeysetPage:
+	"""A page of results addressed by a (sort key, id) cursor instead of an offset.
+
+	It mirrors the parts of ``django.core.paginator.Page`` the inventory template
+	uses so either kind of page can be rendered by the same markup.
+	"""
+
+	is_keyset = True
+
+	def __init__(
+		self,
+		object_list: list,
+		*,
+		offset: int,
+		per_page: int,
+		has_next: bool,
+		has_previous: bool,
+		next_cursor: str | None,
+		previous_cursor: str | None,
+	):
+		self.object_list = object_list
+		self.offset = offset
+		self.per_page = per_page
+		self._has_next = has_next
+		self._has_previous = has_previous
+		self.next_cursor = next_cursor
+		self.previous_cursor = previous_cursor
+
+	def __iter__(self):
+		return iter(self.object_list)
+
+	def __len__(self) -> int:
+		return len(self.object_list)
+
+	def __getitem__(self, index):
+		return self.object_list[index]
+
+	@property
+	def number(self) -> int:
+		return self.offset // self.per_page + 1
+
+	def has_next(self) -> bool:
+		return self._has_next
+
+	def has_previous(self) -> bool:
+		return self._has_previous
+
+	def has_other_pages(self) -> bool:
+		return self._has_next or self._has_previous
+
+	def start_index(self) -> int:
+		return self.offset + 1 if self.object_list else 0
+
+	def end_index(self) -> int:
+		return self.offset + len(self.object_list)
+
+
+def decode_keyset_cursor(cursor: str | None, *, sort: str, model, field: str) -> dict | None:
+	"""Decode ``cursor`` for ``sort``; cursors minted for another sort order or with a bad value are ignored."""
+	payload = decode_cursor(cursor)
+	if payload is not None and payload["s"] != sort:
+		return None
+	if payload is not None:
+		model_field = model._meta.get_field(field)
+		try:
+			# The field's validators also bound the value to what the column can hold.
+			model_field.run_validators(model_field.to_python(payload["v"]))
+		except ValidationError:
+			return None
+	return payload
+
+
+def build_keyset_page(rows: list, *, payload: dict | None, field: str, sort: str, per_page: int) -> KeysetPage:
+	"""Assemble a ``KeysetPage`` from up to ``per_page + 1`` rows read from the cursor.
+
+	``rows`` are in the direction of travel: the requested order when paging
+	forwards, the reverse order when following a previous-page cursor.
+	"""
+	if payload is not None and payload["d"] == "p":
+		has_previous = len(rows) > per_page
+		object_list = rows[:per_page][::-1]
+		offset = max(payload["o"] - len(object_list), 0) if has_previous else 0
+		has_next = True
+	else:
+		offset = payload["o"] if payload is not None else 0
+		has_next = len(rows) > per_page
+		object_list = rows[:per_page]
+		has_previous = payload is not None
+
+	def token(item, direction: str, position: int) -> str:
+		return encode_cursor({
+			"s": sort,
+			"v": str(getattr(item, field)),
+			"id": item.pk,
+			"o": position,
+			"d": direction,
+		})
+
+	next_cursor = token(object_list[-1], "n", offset + len(object_list)) if has_next and object_list else None
+	previous_cursor = token(object_list[0], "p", offset) if has_previous and object_list else None
+	return KeysetPage(
+		object_list,
+		offset=offset,
+		per_page=per_page,
+		has_next=has_next,
+		has_previous=has_previous,
+		next_cursor=next_cursor,
+		previous_cursor=previous_cursor,
+	)
+
+
+def paginate_by_keyset(
+	queryset,
+	*,
+	field: str,
+	descending: bool,
+	sort: str,
+	cursor: str | None,
+	per_page: int,
+) -> KeysetPage:
+	"""Return one page of ``queryset`` ordered by (``field``, pk).
+
+	The cost of fetching a page does not depend on how deep it is: every page is
+	a single indexed range scan of ``per_page + 1`` rows starting at the cursor.
+	Cursors minted for a different sort order are ignored.
+	"""
+	ordering = (f"-{field}", "-pk") if descending else (field, "pk")
+	reverse_ordering = (field, "pk") if descending else (f"-{field}", "-pk")
+	payload = decode_keyset_cursor(cursor, sort=sort, model=queryset.model, field=field)
+
+	# The redundant inclusive bound lets the database seek the (field, pk) index
+	# instead of scanning it to evaluate the OR.
+	def after(value, pk) -> Q:
+		lookup = "lt" if descending else "gt"
+		return Q(**{f"{field}__{lookup}e": value}) & (Q(**{f"{field}__{lookup}": value}) | Q(**{f"pk__{lookup}": pk}))
+
+	def before(value, pk) -> Q:
+		lookup = "gt" if descending else "lt"
+		return Q(**{f"{field}__{lookup}e": value}) & (Q(**{f"{field}__{lookup}": value}) | Q(**{f"pk__{lookup}": pk}))
+
+	if payload is not None and payload["d"] == "p":
+		rows = list(queryset.filter(before(payload["v"], payload["id"])).order_by(*reverse_ordering)[: per_page + 1])
+	else:
+		if payload is not None:
+			queryset = queryset.filter(after(payload["v"], payload["id"]))
+		rows = list(queryset.order_by(*ordering)[: per_page + 1])
+	return build_keyset_page(rows, payload=payload, field=field, sort=sort, per_page=per_page)
+
+
+@dataclass(frozen=True)
+class ResultCount:
+	value: int
+	is_estimate: bool = False
+
+	@property
+	def display(self) -> str:
+		return f"{self.value:,}+" if self.is_estimate else f"{self.value:,}"
+
+
+class InventoryCountProvider:
+	"""Count filtered inventory once per filter set and inventory version.
+
+	Exact counts are cached under ``key`` (a canonical description of the filter
+	set) and the current inventory version, so paging through results never
+	recounts. Above ``TODDE_INVENTORY_COUNT_ESTIMATE_THRESHOLD`` matches the
+	count is bounded and reported as an estimate such as "1,000+".
+	"""
+
+	def __init__(self, *, version: int, threshold: int | None = None, timeout: int | None = None):
+		self.version = version
+		self.threshold = threshold if threshold is not None else getattr(settings, "TODDE_INVENTORY_COUNT_ESTIMATE_THRESHOLD", None)
+		self.timeout = timeout if timeout is not None else getattr(settings, "TODDE_INVENTORY_COUNT_CACHE_TIMEOUT", 600)
+
+	def _cache_key(self, key: str) -> str:
+		digest = hashlib.sha1(key.encode()).hexdigest()
+		return f"marketing:count:{self.version}:{self.threshold}:{digest}"
+
+	def for_total(self, total: int) -> ResultCount:
+		"""The result count to report for an exact ``total`` counted elsewhere."""
+		if self.threshold and total > self.threshold:
+			return ResultCount(self.threshold, True)
+		return ResultCount(total)
+
+	def count(self, queryset, key: str) -> ResultCount:
+		cache_key = self._cache_key(key)
+		cached = cache.get(cache_key)
+		if cached is not None:
+			return ResultCount(*cached)
+		if self.threshold:
+			bounded = queryset.order_by()[: self.threshold + 1].count()
+			result = ResultCount(self.threshold, True) if bounded > self.threshold else ResultCount(bounded)
+		else:
+			result = ResultCount(queryset.count())
+		cache.set(cache_key, (result.value, result.is_estimate), self.timeout)
+		return result
+
+
+class CountedPaginator(Paginator):
+	"""A ``Paginator`` that takes its object count from a ``ResultCount``.
+
+	An estimated count is only a lower bound, so page numbers are not checked
+	against it. The requested page is fetched with one extra row instead, and
+	``rows_seen`` (how many rows that showed to exist) extends the count so
+	``has_next`` and the page links reach past the estimate.
+	"""
+
+	def __init__(self, object_list, per_page, *, result_count: ResultCount, rows_seen: int = 0, **kwargs):
+		super().__init__(object_list, per_page, **kwargs)
+		self.result_count = result_count
+		self.rows_seen = rows_seen
+
+	@property
+	def count(self) -> int:
+		return max(self.result_count.value, self.rows_seen)
+
+	@property
+	def num_pages(self) -> int:
+		if self.count == 0 and not self.allow_empty_first_page:
+			return 0
+		return -(-max(1, self.count - self.orphans) // self.per_page)
+
+	def validate_number(self, number) -> int:
+		if not self.result_count.is_estimate:
+			return super().validate_number(number)
+		try:
+			if isinstance(number, float) and not number.is_integer():
+				raise ValueError
+			number = int(number)
+		except (TypeError, ValueError):
+			raise PageNotAnInteger(self.error_messages["invalid_page"])
+		if number < 1:
+			raise EmptyPage(self.error_messages["min_page"])
+		return number
+
+	def page(self, number):
+		if not self.result_count.is_estimate:
+			return super().page(number)
+		number = self.validate_number(number)
+		bottom = (number - 1) * self.per_page
+		rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+		if not rows and number > 1:
+			raise EmptyPage(self.error_messages["no_results"])
+		self.rows_seen = max(self.rows_seen, bottom + len(rows))
+		return self._get_page(rows[: self.per_page], number, self)
+
+	def get_page(self, number):
+		try:
+			return super().get_page(number)
+		except EmptyPage:
+			# Past the end of an estimated result: count exactly, this once, to find the real last page.
+			objects = self.object_list
+			self.rows_seen = objects.count() if isinstance(objects, QuerySet) else len(objects)
+			return self.page(self.num_pages)
@@ -0,0 +1,212 @@
+"""
+Static export of the anonymous marketing pages.
+
+Each page is rendered through the normal request handler as an anonymous GET
+and written under the export directory, next to a manifest that records the
+ETag it was rendered at. The ETags come from the same version counters as
+conditional GET, so a later export re-renders only the pages whose tag has
+moved and deletes files for pages that no longer exist. That comparison only
+carries across runs when the counters live in a shared cache such as Redis;
+with a per-process cache every export renders every page.
+
+A page without a query string is written to ``<path>/index.html`` and a
+filtered landing page to ``<path>/index.<query string>.html``; the manifest
+maps every URL to its file for the web server or CDN upload step. Only an
+exact match of the canonical query string may be answered from a file.
+"""
+from __future__ import annotations
+
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+
+from .conditional import page_etag, variant_page_etag
+from .filters import InventoryFilterSpec
+from .models import CarVariantListing
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass(frozen=True)
+class StaticPage:
+	url: str
+	etag: str
+
+	@property
+	def file(self) -> str:
+		return page_file(self.url)
+
+
+@dataclass
+class ExportResult:
+	rendered: list[str] = field(default_factory=list)
+	unchanged: list[str] = field(default_factory=list)
+	skipped: list[str] = field(default_factory=list)
+	removed: list[str] = field(default_factory=list)
+
+
+def page_file(url: str) -> str:
+	"""Path of the file for ``url``, relative to the export directory."""
+	parts = urlsplit(url)
+	name = f"index.{parts.query}.html" if parts.query else "index.html"
+	return f"{parts.path.strip('/')}/{name}".lstrip("/")
+
+
+def list_pages() -> list[StaticPage]:
+	"""Every page to export, tagged with the ETag its content is at now."""
+	etag = page_etag(None)
+	pages = [
+		StaticPage(reverse(name), etag)
+		for name in (
+			"marketing:home",
+			"marketing:financing",
+			"marketing:all_cars",
+			"marketing:registered_cars",
+			"marketing:foreign_used_cars",
+		)
+	]
+
+	all_cars = reverse("marketing:all_cars")
+	visible = CarVariantListing.objects.filter(is_visible=True)
+	pairs = list(visible.order_by("manufacturer_id", "model_id").values_list("manufacturer_id", "model_id").distinct())
+	manufacturer_ids = sorted({manufacturer_id for manufacturer_id, _ in pairs})
+	for manufacturer_id in manufacturer_ids:
+		spec = InventoryFilterSpec(manufacturer=manufacturer_id)
+		pages.append(StaticPage(f"{all_cars}?{spec.querystring()}", etag))
+	for manufacturer_id, model_id in pairs:
+		spec = InventoryFilterSpec(manufacturer=manufacturer_id, model=model_id)
+		pages.append(StaticPage(f"{all_cars}?{spec.querystring()}", etag))
+
+	for variant_id in visible.order_by("pk").values_list("pk", flat=True):
+		url = reverse("marketing:vehicle_detail", args=[variant_id])
+		pages.append(StaticPage(url, variant_page_etag(None, variant_id)))
+	return pages
+
+
+_handler: BaseHandler | None = None
+
+
+def _get_handler() -> BaseHandler:
+	global _handler
+	if _handler is None:
+		handler = BaseHandler()
+		handler.load_middleware()
+		_handler = handler
+	return _handler
+
+
+def _request(url: str, host: str) -> WSGIRequest:
+	parts = urlsplit(url)
+	return WSGIRequest(
+		{
+			"REQUEST_METHOD": "GET",
+			"PATH_INFO": parts.path,
+			"QUERY_STRING": parts.query,
+			"SCRIPT_NAME": "",
+			"SERVER_NAME": host,
+			"SERVER_PORT": "443",
+			"HTTP_HOST": host,
+			"wsgi.url_scheme": "https",
+			"wsgi.input": io.BytesIO(),
+		}
+	)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+	path.parent.mkdir(parents=True, exist_ok=True)
+	descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".page-", suffix=".tmp")
+	try:
+		with os.fdopen(descriptor, "wb") as output:
+			output.write(data)
+		# mkstemp creates the file owner-only; the web server may run as another user.
+		os.chmod(temporary, 0o644)
+		os.replace(temporary, path)
+	except BaseException:
+		Path(temporary).unlink(missing_ok=True)
+		raise
+
+
+def render_page(url: str, directory, host: str) -> int | None:
+	"""Render ``url`` into ``directory``; returns the bytes written.
+
+	Returns None, writing nothing, when the response cannot be served as a
+	static file: anything but a plain 200, or one that sets cookies.
+	"""
+	response = _get_handler().get_response(_request(url, host))
+	if response.status_code != 200 or response.streaming or response.cookies:
+		return None
+	_write_atomic(Path(directory) / page_file(url), response.content)
+	return len(response.content)
+
+
+def _render_all(urls: list[str], directory, host: str, jobs: int) -> list[int | None]:
+	if jobs <= 1 or len(urls) <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+		return [render_page(url, directory, host) for url in urls]
+	# Forked workers inherit the settings and cache state; they must open their
+	# own database connections rather than share the parent's.
+	connections.close_all()
+	with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("fork")) as pool:
+		chunksize = max(1, len(urls) // (jobs * 4))
+		return list(pool.map(render_page, urls, repeat(str(directory)), repeat(host), chunksize=chunksize))
+
+
+def read_manifest(directory) -> dict:
+	try:
+		with open(Path(directory) / MANIFEST_NAME) as source:
+			return json.load(source)
+	except (FileNotFoundError, ValueError):
+		return {}
+
+
+def export_pages(directory, *, host: str, jobs: int = 1, force: bool = False) -> ExportResult:
+	"""Bring the static export in ``directory`` up to date with the current content."""
+	directory = Path(directory)
+	directory.mkdir(parents=True, exist_ok=True)
+	previous = read_manifest(directory).get("pages", {})
+	result = ExportResult()
+
+	entries = {}
+	stale = []
+	for page in list_pages():
+		entry = previous.get(page.url)
+		if not force and entry and entry["etag"] == page.etag and (directory / entry["file"]).exists():
+			entries[page.url] = entry
+			result.unchanged.append(page.url)
+		else:
+			stale.append(page)
+
+	sizes = _render_all([page.url for page in stale], directory, host, jobs)
+	for page, size in zip(stale, sizes):
+		if size is None:
+			result.skipped.append(page.url)
+		else:
+			entries[page.url] = {"file": page.file, "etag": page.etag, "bytes": size}
+			result.rendered.append(page.url)
+
+	for url, entry in previous.items():
+		if url not in entries:
+			(directory / entry["file"]).unlink(missing_ok=True)
+			result.removed.append(url)
+
+	manifest = {
+		"generated_at": timezone.now().isoformat(),
+		"release": settings.TODDE_RELEASE,
+		"host": host,
+		"pages": entries,
+	}
+	_write_atomic(directory / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+	return result
@@ -0,0 +1,206 @@
+"""
+Signal handlers that keep derived inventory data in step with catalogue writes.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .facets import refresh_facet_buckets
+from .listings import primary_images, refresh_primary_images, refresh_variant_listings
+from .models import (
+	CarManufacturer,
+	CarModel,
+	CarVariant,
+	CarVariantDetail,
+	CarVariantFeature,
+	CarVariantImage,
+	CarVariantSpecification,
+	FinancingBenefit,
+	FinancingPageConfig,
+	FinancingSnapshotItem,
+	HomepageBrandMetric,
+	HomepageCategory,
+	HomepageContactCard,
+	HomepageFeaturedVehicle,
+	HomepageFinancingHighlight,
+	HomepageFinancingStep,
+	HomepageHero,
+	HomepageSectionCopy,
+	HomepageValueProposition,
+	InventoryPageConfig,
+	NavigationLink,
+)
+from .versioning import CONTENT, INVENTORY, VEHICLE_PAGES, bump_version, bump_versions, variant_domain
+
+# Editorial models whose writes change page copy but not the inventory.
+CONTENT_MODELS = (
+	NavigationLink,
+	HomepageSectionCopy,
+	HomepageHero,
+	HomepageCategory,
+	HomepageFeaturedVehicle,
+	HomepageValueProposition,
+	HomepageFinancingStep,
+	HomepageFinancingHighlight,
+	HomepageBrandMetric,
+	HomepageContactCard,
+	InventoryPageConfig,
+	FinancingPageConfig,
+	FinancingSnapshotItem,
+	FinancingBenefit,
+)
+
+# Models that only appear on their variant's detail page.
+VARIANT_DETAIL_MODELS = (CarVariantDetail, CarVariantImage, CarVariantFeature, CarVariantSpecification)
+
+
+@receiver(pre_save, sender=CarVariant)
+def remember_previous_variant_model(sender, instance: CarVariant, raw=False, **kwargs):
+	if raw or not instance.pk:
+		instance._previous_model_id = None
+		return
+	instance._previous_model_id = (
+		CarVariant.objects.filter(pk=instance.pk).values_list("model_id", flat=True).first()
+	)
+
+
+@receiver(pre_save, sender=CarModel)
+def remember_previous_model_manufacturer(sender, instance: CarModel, raw=False, **kwargs):
+	if raw or not instance.pk:
+		instance._previous_manufacturer_id = None
+		return
+	instance._previous_manufacturer_id = (
+		CarModel.objects.filter(pk=instance.pk).values_list("manufacturer_id", flat=True).first()
+	)
+
+
+@receiver(pre_save, sender=CarVariant)
+def resolve_variant_primary_image(sender, instance: CarVariant, raw=False, **kwargs):
+	# A variant instance loaded before its images changed must not write back a
+	# stale primary image.
+	if raw or not instance.pk:
+		return
+	instance.primary_image_url, instance.primary_image_alt = primary_images({instance.pk})[instance.pk]
+
+
+@receiver(post_save, sender=CarVariant)
+@receiver(post_delete, sender=CarVariant)
+def refresh_variant_facets(sender, instance: CarVariant, raw=False, **kwargs):
+	if raw:
+		return
+	refresh_facet_buckets({instance.model_id, getattr(instance, "_previous_model_id", None)})
+	bump_version(INVENTORY)
+
+
+@receiver(post_save, sender=CarVariant)
+def refresh_variant_listing(sender, instance: CarVariant, raw=False, **kwargs):
+	if raw:
+		return
+	refresh_variant_listings(variant_ids={instance.pk})
+
+
+@receiver(post_save, sender=CarModel)
+def refresh_model_facets(sender, instance: CarModel, raw=False, **kwargs):
+	if raw:
+		return
+	refresh_variant_listings(model_ids={instance.pk})
+	refresh_facet_buckets({instance.pk})
+	bump_version(INVENTORY)
+
+
+@receiver(post_save, sender=CarManufacturer)
+def refresh_manufacturer_facets(sender, instance: CarManufacturer, raw=False, **kwargs):
+	if raw:
+		return
+	refresh_variant_listings(manufacturer_ids={instance.pk})
+	refresh_facet_buckets(instance.models.values_list("pk", flat=True))
+	bump_version(INVENTORY)
+
+
+@receiver(post_delete, sender=CarModel)
+@receiver(post_delete, sender=CarManufacturer)
+def invalidate_inventory(sender, instance, **kwargs):
+	bump_version(INVENTORY)
+
+
+def invalidate_variant_pages(manufacturer_ids, variant_ids=()) -> None:
+	"""Re-render the detail pages of ``variant_ids`` and of every variant of ``manufacturer_ids``.
+
+	A detail page shows its manufacturer's other variants as related cards.
+	"""
+	manufacturer_ids = {pk for pk in manufacturer_ids if pk is not None}
+	variant_ids = set(variant_ids)
+	if manufacturer_ids:
+		variant_ids.update(
+			CarVariant.objects.filter(model__manufacturer_id__in=manufacturer_ids).values_list("pk", flat=True)
+		)
+	bump_versions(variant_domain(variant_id) for variant_id in variant_ids)
+
+
+@receiver(post_save, sender=CarVariant)
+@receiver(post_delete, sender=CarVariant)
+def invalidate_variant_page(sender, instance: CarVariant, raw=False, **kwargs):
+	if raw:
+		return
+	model_ids = {instance.model_id, getattr(instance, "_previous_model_id", None)} - {None}
+	manufacturer_ids = CarModel.objects.filter(pk__in=model_ids).values_list("manufacturer_id", flat=True)
+	invalidate_variant_pages(manufacturer_ids, {instance.pk})
+
+
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def invalidate_model_variant_pages(sender, instance: CarModel, raw=False, **kwargs):
+	if raw:
+		return
+	invalidate_variant_pages({instance.manufacturer_id, getattr(instance, "_previous_manufacturer_id", None)})
+
+
+@receiver(post_save, sender=CarManufacturer)
+@receiver(post_delete, sender=CarManufacturer)
+def invalidate_vehicle_pages(sender, instance: CarManufacturer, raw=False, **kwargs):
+	# Every detail page lists the manufacturers.
+	if raw:
+		return
+	bump_version(VEHICLE_PAGES)
+
+
+@receiver(post_save, sender=CarVariantImage)
+@receiver(post_delete, sender=CarVariantImage)
+def refresh_variant_primary_image(sender, instance: CarVariantImage, raw=False, **kwargs):
+	if raw:
+		return
+	if refresh_primary_images({instance.variant_id}):
+		# Listing cards, search results and exports show the primary image.
+		bump_version(INVENTORY)
+		manufacturer_ids = CarVariant.objects.filter(pk=instance.variant_id).values_list("model__manufacturer_id", flat=True)
+		invalidate_variant_pages(manufacturer_ids)
+
+
+@receiver(post_save, sender=CarVariantImage)
+@receiver(post_delete, sender=CarVariantImage)
+def invalidate_featured_vehicle_image(sender, instance: CarVariantImage, raw=False, **kwargs):
+	# Featured cards on the homepage show the variant's primary image.
+	if raw:
+		return
+	if HomepageFeaturedVehicle.objects.filter(variant_id=instance.variant_id, is_active=True).exists():
+		bump_version(CONTENT)
+
+
+def invalidate_content(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	bump_version(CONTENT)
+
+
+def invalidate_variant_detail(sender, instance, raw=False, **kwargs):
+	if raw:
+		return
+	bump_version(variant_domain(instance.variant_id))
+
+
+for content_model in CONTENT_MODELS:
+	post_save.connect(invalidate_content, sender=content_model)
+	post_delete.connect(invalidate_content, sender=content_model)
+
+for detail_model in VARIANT_DETAIL_MODELS:
+	post_save.connect(invalidate_variant_detail, sender=detail_model)
+	post_delete.connect(invalidate_variant_detail, sender=detail_model)
@@ -0,0 +1,140 @@
+"""
+Versioned binary snapshot files for the columnar inventory engine.
+
+One process writes the snapshot for an inventory version; every worker then
+memory-maps it read-only, so the column data is held once in the OS page
+cache rather than once per worker. Files are written under a temporary name
+and renamed into place, so readers only ever see complete snapshots, and a
+worker still mapping an older file keeps a valid view after it is removed.
+
+Layout: ``MAGIC``, the header length as a little-endian uint64, a JSON
+header, then the raw bytes of each column at a 64-byte aligned offset.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+	import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+	fcntl = None
+
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+	np = None
+
+MAGIC = b"TODDECOL"
+FORMAT = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+_SNAPSHOT_NAME = re.compile(r"^inventory-(\d+)\.snapshot$")
+
+
+class SnapshotError(Exception):
+	"""The file is not a readable inventory snapshot."""
+
+
+def snapshot_path(directory, version: int) -> Path:
+	return Path(directory) / f"inventory-{version}.snapshot"
+
+
+def _aligned(offset: int) -> int:
+	return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+@contextmanager
+def build_lock(directory):
+	"""Hold an exclusive lock on ``directory`` so only one process builds at a time."""
+	directory = Path(directory)
+	directory.mkdir(parents=True, exist_ok=True)
+	with open(directory / ".inventory.lock", "a") as handle:
+		if fcntl is not None:
+			fcntl.flock(handle, fcntl.LOCK_EX)
+		try:
+			yield
+		finally:
+			if fcntl is not None:
+				fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def write_snapshot(directory, version: int, columns: dict, metadata: dict) -> Path:
+	"""Write ``columns`` and the JSON-serialisable ``metadata`` as the snapshot for ``version``."""
+	directory = Path(directory)
+	directory.mkdir(parents=True, exist_ok=True)
+	layout = {}
+	end = 0
+	for name, array in columns.items():
+		offset = _aligned(end)
+		layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+		end = offset + array.nbytes
+	header = json.dumps({"format": FORMAT, "version": version, "columns": layout, "metadata": metadata}).encode()
+	data_start = _aligned(_PREFIX.size + len(header))
+
+	path = snapshot_path(directory, version)
+	descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".inventory-", suffix=".tmp")
+	try:
+		with os.fdopen(descriptor, "wb") as output:
+			output.write(_PREFIX.pack(MAGIC, len(header)))
+			output.write(header)
+			for name, array in columns.items():
+				output.seek(data_start + layout[name]["offset"])
+				output.write(np.ascontiguousarray(array).tobytes())
+			output.truncate(data_start + end)
+			output.flush()
+			os.fsync(output.fileno())
+		# mkstemp creates the file owner-only; workers may run as another user.
+		os.chmod(temporary, 0o644)
+		os.replace(temporary, path)
+	except BaseException:
+		Path(temporary).unlink(missing_ok=True)
+		raise
+	return path
+
+
+def read_snapshot(path) -> tuple[int, dict, dict]:
+	"""Map ``path`` read-only and return its version, columns and metadata.
+
+	The column arrays are views of the mapping, not copies.
+	"""
+	with open(path, "rb") as source:
+		if os.fstat(source.fileno()).st_size < _PREFIX.size:
+			raise SnapshotError(f"{path} is truncated.")
+		mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+	magic, header_length = _PREFIX.unpack_from(mapping)
+	if magic != MAGIC:
+		raise SnapshotError(f"{path} is not an inventory snapshot.")
+	try:
+		header = json.loads(mapping[_PREFIX.size : _PREFIX.size + header_length])
+	except ValueError as error:
+		raise SnapshotError(f"{path} has an unreadable header.") from error
+	if header.get("format") != FORMAT:
+		raise SnapshotError(f"{path} uses snapshot format {header.get('format')}, expected {FORMAT}.")
+
+	data_start = _aligned(_PREFIX.size + header_length)
+	columns = {}
+	for name, column in header["columns"].items():
+		dtype = np.dtype(column["dtype"])
+		offset = data_start + column["offset"]
+		if offset + dtype.itemsize * column["length"] > len(mapping):
+			raise SnapshotError(f"{path} is truncated.")
+		columns[name] = np.frombuffer(mapping, dtype=dtype, count=column["length"], offset=offset)
+	return header["version"], columns, header["metadata"]
+
+
+def prune_snapshots(directory, *, before: int) -> int:
+	"""Delete snapshots older than version ``before``; returns how many were removed."""
+	removed = 0
+	for path in Path(directory).glob("inventory-*.snapshot"):
+		match = _SNAPSHOT_NAME.match(path.name)
+		if match and int(match.group(1)) < before:
+			path.unlink(missing_ok=True)
+			removed += 1
+	return removed
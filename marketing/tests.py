@@ -1,10 +1,36 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from dataclasses import replace
 from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
 
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.management import call_command
-from django.test import TestCase
+from django.db import connection
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.templatetags.static import static
 
+from . import columnar, prerender, views
+from .admin import CarModelAdmin
+from .checks import check_shared_version_cache
+from .cms import FINANCING_DEFAULTS, get_content
+from .context_processors import get_nav_categories, navigation_context
+from .catalogue import get_catalogue
+from .facets import build_inventory_facets, load_inventory_facets, refresh_facet_buckets
+from .filters import SORT_FIELDS, InventoryFilterSpec
+from .pagination import CountedPaginator, InventoryCountProvider, ResultCount, encode_cursor, paginate_by_keyset
+from .snapshot import SnapshotError, snapshot_path
+from .versioning import INVENTORY, bump_version, get_version
 from .models import (
 	CarManufacturer,
 	CarModel,
@@ -12,6 +38,7 @@ from .models import (
 	CarVariantDetail,
 	CarVariantFeature,
 	CarVariantImage,
+	CarVariantListing,
 	CarVariantSpecification,
 	FinancingBenefit,
 	FinancingPageConfig,
@@ -216,6 +243,9 @@ class MarketingPagesTests(TestCase):
 			]
 		)
 
+	def setUp(self):
+		cache.clear()
+
 	def test_homepage_renders(self):
 		response = self.client.get(reverse("marketing:home"))
 		self.assertEqual(response.status_code, 200)
@@ -313,6 +343,44 @@ class MarketingPagesTests(TestCase):
 		self.assertEqual(vehicle.display_image_url, "https://example.com/image-primary.jpg")
 		self.assertFalse(vehicle.display_image_is_placeholder)
 
+	def test_featured_cards_keep_curated_copy(self):
+		HomepageFeaturedVehicle.objects.filter(variant=self.primary_variant).update(price="₦19,900,000 promo")
+		detail_url = reverse("marketing:vehicle_detail", args=[self.primary_variant.pk])
+		response = self.client.get(reverse("marketing:home"))
+		self.assertContains(response, "Roadster Premium")
+		self.assertContains(response, "₦19,900,000 promo")
+		self.assertContains(response, f'href="{detail_url}"')
+
+		self.primary_variant.is_active = False
+		self.primary_variant.save()
+		response = self.client.get(reverse("marketing:home"))
+		self.assertContains(response, "Roadster Premium")
+		self.assertNotContains(response, f'href="{detail_url}"')
+
+	def test_anonymous_homepage_is_cached_until_content_changes(self):
+		url = reverse("marketing:home")
+		self.client.get(url)
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url, {"utm_source": "ads"})
+		self.assertEqual(len(queries), 0)
+		self.assertContains(response, "Own your dream car")
+
+		hero = HomepageHero.objects.get(title="Own your dream car")
+		hero.title = "Drive home today"
+		hero.save()
+		self.assertContains(self.client.get(url), "Drive home today")
+
+		image = self.primary_variant.images.first()
+		image.image_url = "https://example.com/image-featured.jpg"
+		image.save()
+		self.assertContains(self.client.get(url), "https://example.com/image-featured.jpg")
+
+		user = User.objects.create_user("editor", password="secret")
+		self.client.force_login(user)
+		with CaptureQueriesContext(connection) as queries:
+			self.client.get(url)
+		self.assertGreater(len(queries), 0)
+
 	def test_homepage_featured_vehicle_placeholder_when_missing_variant_image(self):
 		manufacturer = CarManufacturer.objects.first()
 		model = CarModel.objects.create(manufacturer=manufacturer, name="Placeholder Featured Model")
@@ -354,6 +422,546 @@ class MarketingPagesTests(TestCase):
 		page_obj = response.context["page_obj"]
 		self.assertTrue(all(item.transmission == CarVariant.Transmission.MANUAL for item in page_obj.object_list))
 
+	def test_inventory_facets_use_single_query(self):
+		queryset = CarVariant.objects.filter(model__manufacturer=self.primary_variant.model.manufacturer)
+		with self.assertNumQueries(1):
+			facets = build_inventory_facets(queryset)
+		self.assertEqual(facets.stats.min_price, Decimal("21000000"))
+		self.assertEqual(facets.stats.max_year, 2024)
+		self.assertEqual({option.value: option.count for option in facets.transmissions}, {"automatic": 1, "manual": 1})
+		self.assertEqual([option.count for option in facets.manufacturers], [2])
+		self.assertEqual([option.label for option in facets.models], ["Test Manufacturer Roadster"])
+
+	def test_facet_buckets_follow_catalogue_writes(self):
+		live_queryset = CarVariant.objects.filter(
+			is_active=True,
+			model__is_active=True,
+			model__manufacturer__is_active=True,
+		)
+		self.assertEqual(load_inventory_facets(), build_inventory_facets(live_queryset))
+
+		model = self.primary_variant.model
+		CarVariant.objects.create(
+			model=model,
+			year=2020,
+			price="9000000",
+			transmission=CarVariant.Transmission.CVT,
+			listing_type=CarVariant.ListingType.REGISTERED,
+		)
+		facets = load_inventory_facets(listing_type=CarVariant.ListingType.REGISTERED)
+		self.assertIn("cvt", [option.value for option in facets.transmissions])
+		self.assertEqual(facets, build_inventory_facets(live_queryset.filter(listing_type=CarVariant.ListingType.REGISTERED)))
+
+		model.is_active = False
+		model.save()
+		self.assertNotIn(model.id, [option.value for option in load_inventory_facets().models])
+
+		call_command("rebuild_inventory_facets")
+		self.assertEqual(load_inventory_facets(), build_inventory_facets(live_queryset))
+
+	def test_inventory_keyset_pagination_walks_all_pages(self):
+		model = self.primary_variant.model
+		for index in range(30):
+			CarVariant.objects.create(
+				model=model,
+				year=2000 + index % 5,
+				trim=f"Trim {index}",
+				price="15000000",
+				listing_type=CarVariant.ListingType.REGISTERED,
+			)
+		url = reverse("marketing:all_cars")
+		expected = list(
+			CarVariant.objects.filter(is_active=True, model__is_active=True, model__manufacturer__is_active=True)
+			.order_by("-year", "-id")
+			.values_list("id", flat=True)
+		)
+
+		seen = []
+		pages = []
+		response = self.client.get(url, {"sort": "year_new_old"})
+		while True:
+			page_obj = response.context["page_obj"]
+			self.assertEqual(page_obj.start_index(), len(seen) + 1)
+			pages.append([variant.id for variant in page_obj])
+			seen.extend(pages[-1])
+			if not page_obj.has_next():
+				break
+			response = self.client.get(url, {"sort": "year_new_old", "cursor": page_obj.next_cursor})
+		self.assertEqual(seen, expected)
+
+		page_obj = response.context["page_obj"]
+		response = self.client.get(url, {"sort": "year_new_old", "cursor": page_obj.previous_cursor})
+		self.assertEqual([variant.id for variant in response.context["page_obj"]], pages[-2])
+
+		response = self.client.get(url, {"sort": "year_new_old", "page": 2})
+		self.assertEqual([variant.id for variant in response.context["page_obj"]], pages[1])
+
+		response = self.client.get(url, {"cursor": "not-a-cursor"})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.context["page_obj"].start_index(), 1)
+
+	def test_tampered_keyset_cursors_are_ignored(self):
+		url = reverse("marketing:all_cars")
+		cursors = [
+			{"s": "price_low_high", "v": "1", "id": 10**23, "o": 0, "d": "n"},
+			{"s": "price_low_high", "v": "1", "id": 1, "o": -5, "d": "n"},
+			{"s": "price_low_high", "v": "1", "id": True, "o": 0, "d": "n"},
+			{"s": "year_new_old", "v": str(10**23), "id": 1, "o": 0, "d": "p"},
+		]
+		for payload in cursors:
+			with self.subTest(payload=payload):
+				response = self.client.get(url, {"sort": payload["s"], "cursor": encode_cursor(payload)}, follow=True)
+				self.assertEqual(response.status_code, 200)
+				self.assertEqual(response.context["page_obj"].start_index(), 1)
+
+	@override_settings(TODDE_INVENTORY_COUNT_ESTIMATE_THRESHOLD=12)
+	def test_offset_pages_past_an_estimated_count_are_not_clamped(self):
+		model = self.primary_variant.model
+		for index in range(40):
+			CarVariant.objects.create(model=model, year=2000 + index % 5, trim=f"Trim {index}", price="15000000")
+		url = reverse("marketing:all_cars")
+		expected = list(
+			CarVariant.objects.filter(is_active=True).order_by("-year", "-id").values_list("id", flat=True)
+		)
+		engines = ["orm", "columnar"] if columnar.np is not None else ["orm"]
+		for engine in engines:
+			cache.clear()
+			with self.subTest(engine=engine), override_settings(TODDE_INVENTORY_ENGINE=engine):
+				for _ in range(2):
+					response = self.client.get(url, {"sort": "year_new_old", "page": 3})
+					page_obj = response.context["page_obj"]
+					self.assertEqual(response.context["result_count"].display, "12+")
+					self.assertEqual(page_obj.number, 3)
+					self.assertEqual([variant.id for variant in page_obj], expected[24:36])
+					self.assertTrue(page_obj.has_next())
+					self.assertIn(4, [page.number for page in response.context["page_range"]])
+
+				last = -(-len(expected) // 12)
+				page_obj = self.client.get(url, {"sort": "year_new_old", "page": last}).context["page_obj"]
+				self.assertEqual([variant.id for variant in page_obj], expected[(last - 1) * 12 :])
+				self.assertFalse(page_obj.has_next())
+				self.assertEqual(page_obj.end_index(), len(expected))
+
+				page_obj = self.client.get(url, {"sort": "year_new_old", "page": last + 5}).context["page_obj"]
+				self.assertEqual(page_obj.number, last)
+				self.assertEqual([variant.id for variant in page_obj], expected[(last - 1) * 12 :])
+				self.assertFalse(page_obj.has_next())
+
+	def test_inventory_count_provider_caches_and_estimates(self):
+		queryset = CarVariant.objects.filter(model=self.primary_variant.model)
+		provider = InventoryCountProvider(version=get_version(INVENTORY), threshold=None)
+		self.assertEqual(provider.count(queryset, "roadster").value, 2)
+		with self.assertNumQueries(0):
+			self.assertEqual(provider.count(queryset, "roadster").value, 2)
+
+		estimating = InventoryCountProvider(version=get_version(INVENTORY), threshold=1)
+		estimate = estimating.count(queryset, "roadster")
+		self.assertTrue(estimate.is_estimate)
+		self.assertEqual(estimate.display, "1+")
+
+		CarVariant.objects.create(model=self.primary_variant.model, year=2019, price="8000000")
+		provider = InventoryCountProvider(version=get_version(INVENTORY), threshold=None)
+		self.assertEqual(provider.count(queryset, "roadster").value, 3)
+
+	def test_inventory_facets_reflect_other_active_filters(self):
+		manufacturer = self.primary_variant.model.manufacturer
+		live = CarVariant.objects.filter(is_active=True, model__is_active=True, model__manufacturer__is_active=True)
+		response = self.client.get(reverse("marketing:all_cars"), {"transmission": CarVariant.Transmission.MANUAL})
+		manufacturers = {option.value: option.count for option in response.context["available_manufacturers"]}
+		self.assertEqual(manufacturers[manufacturer.id], 1)
+		transmissions = {option.value: option.count for option in response.context["available_transmissions"]}
+		self.assertEqual(transmissions["automatic"], live.filter(transmission="automatic").count())
+
+		filters = {"manufacturer": manufacturer.id, "price_max": Decimal("22000000")}
+		with self.assertNumQueries(1):
+			facets = load_inventory_facets(filters=filters, queryset=CarVariantListing.objects.filter(is_visible=True))
+		self.assertEqual([(option.value, option.count) for option in facets.models], [(self.primary_variant.model_id, 1)])
+		self.assertEqual(facets.stats.max_price, Decimal("25000000"))
+
+	def test_inventory_histograms_count_price_bands_and_years(self):
+		live = CarVariantListing.objects.filter(is_visible=True)
+		facets = load_inventory_facets()
+		self.assertEqual(sum(histogram_bin.count for histogram_bin in facets.price_histogram), live.count())
+		band = next(histogram_bin for histogram_bin in facets.price_histogram if histogram_bin.lower == Decimal("20000000"))
+		self.assertEqual((band.upper, band.label), (Decimal("30000000"), "₦20M–₦30M"))
+		self.assertEqual(band.count, live.filter(price__gte=20_000_000, price__lt=30_000_000).count())
+		self.assertEqual(
+			{histogram_bin.lower: histogram_bin.count for histogram_bin in facets.year_histogram}[2022],
+			live.filter(year=2022).count(),
+		)
+
+		# Each histogram ignores its own range filter but honours the others.
+		filters = {"year_min": 2023, "price_max": Decimal("22000000")}
+		facets = load_inventory_facets(filters=filters, queryset=live)
+		self.assertEqual(sum(histogram_bin.count for histogram_bin in facets.price_histogram), live.filter(year__gte=2023).count())
+		self.assertEqual(sum(histogram_bin.count for histogram_bin in facets.year_histogram), live.filter(price__lte=22000000).count())
+
+		payload = self.client.get(reverse("marketing:all_cars_results"), {"year_min": 2023}).json()
+		self.assertEqual(sum(entry["count"] for entry in payload["histograms"]["price"]), live.filter(year__gte=2023).count())
+		self.assertEqual(max(entry["percent"] for entry in payload["histograms"]["year"]), 100)
+		self.assertContains(self.client.get(reverse("marketing:all_cars")), 'id="inventory-histograms"')
+
+	def test_inventory_filters_redirect_to_canonical_url(self):
+		url = reverse("marketing:all_cars")
+		response = self.client.get(f"{url}?transmission=manual&sort=price_low_high&price_min=&transmission=automatic&page=1&utm_source=mail")
+		self.assertEqual(response.status_code, 301)
+		self.assertEqual(response["Location"], f"{url}?transmission=automatic&transmission=manual&utm_source=mail")
+		self.assertEqual(self.client.get(response["Location"]).status_code, 200)
+
+		first = InventoryFilterSpec.from_querydict(QueryDict("year_min=2020&category=suv&price_max=100000000.00"))
+		second = InventoryFilterSpec.from_querydict(QueryDict("price_max=1E8&category=suv&year_min=2020&utm_source=ad"))
+		self.assertEqual(first, second)
+		self.assertEqual(first.key, second.key)
+		self.assertNotEqual(first.key, first.with_changes(sort="year_new_old").key)
+		self.assertEqual(first.filter_key, first.with_changes(sort="year_new_old").filter_key)
+
+	def test_inventory_result_page_is_cached_per_inventory_version(self):
+		url = reverse("marketing:all_cars")
+		params = {"transmission": CarVariant.Transmission.AUTOMATIC, "model": self.primary_variant.model_id}
+		get_catalogue()
+		get_content()
+		get_nav_categories()
+		with CaptureQueriesContext(connection) as first:
+			self.client.get(url, params)
+		with CaptureQueriesContext(connection) as repeat:
+			response = self.client.get(url, params)
+		# Facets, count and page ids come from the cache; only the vehicles are fetched.
+		self.assertEqual(len(first) - len(repeat), 2)
+		self.assertEqual([variant.id for variant in response.context["page_obj"]], [self.primary_variant.id])
+
+		newer = CarVariant.objects.create(
+			model=self.primary_variant.model,
+			year=2023,
+			price="9000000",
+			transmission=CarVariant.Transmission.AUTOMATIC,
+		)
+		response = self.client.get(url, params)
+		self.assertIn(newer.id, [variant.id for variant in response.context["page_obj"]])
+
+	def test_vehicle_card_fragments_follow_variant_and_image_changes(self):
+		url = reverse("marketing:all_cars")
+		params = {"model": self.primary_variant.model_id}
+		self.assertContains(self.client.get(url, params), "https://example.com/image-primary.jpg")
+
+		# Writes that skip updated_at keep serving the cached card.
+		CarVariant.objects.filter(pk=self.primary_variant.pk).update(trim="Uncached Trim")
+		self.assertNotContains(self.client.get(url, params), "Uncached Trim")
+
+		self.primary_variant.refresh_from_db()
+		self.primary_variant.save()
+		self.assertContains(self.client.get(url, params), "Uncached Trim")
+
+		image = self.primary_variant.images.first()
+		image.image_url = "https://example.com/image-replaced.jpg"
+		image.save()
+		response = self.client.get(url, params)
+		self.assertContains(response, "https://example.com/image-replaced.jpg")
+		self.assertContains(self.client.get(reverse("marketing:vehicle_detail", args=[self.secondary_variant.pk])), "https://example.com/image-replaced.jpg")
+
+	def test_inventory_results_endpoint_returns_fragment_and_counts(self):
+		params = {"transmission": CarVariant.Transmission.MANUAL, "model": self.primary_variant.model_id}
+		response = self.client.get(reverse("marketing:all_cars_results"), params)
+		self.assertEqual(response.status_code, 200)
+		payload = response.json()
+		self.assertEqual(payload["query"], f"transmission=manual&model={self.primary_variant.model_id}")
+		self.assertEqual(payload["count"], {"value": 1, "is_estimate": False, "display": "1"})
+		self.assertEqual(payload["facets"]["transmissions"], {"automatic": 1, "manual": 1})
+		self.assertIn(f"Ref: #{self.secondary_variant.id}", payload["html"])
+		self.assertNotIn("<header", payload["html"])
+
+		response = self.client.get(reverse("marketing:foreign_used_cars_results"), {"model": self.primary_variant.model_id})
+		self.assertEqual(response.json()["count"]["value"], 1)
+		self.assertIn(f"Ref: #{self.primary_variant.id}", response.json()["html"])
+
+	def test_inventory_count_preview_matches_results_and_is_cached(self):
+		params = {"transmission": CarVariant.Transmission.MANUAL, "price_max": "30000000"}
+		results = self.client.get(reverse("marketing:all_cars_results"), params).json()
+		with CaptureQueriesContext(connection) as first:
+			response = self.client.get(reverse("marketing:all_cars_count"), params)
+		self.assertEqual(response.status_code, 200)
+		payload = response.json()
+		self.assertEqual(payload["count"], results["count"])
+		self.assertEqual(payload["facets"], results["facets"])
+		self.assertNotIn("html", payload)
+		self.assertGreater(len(first), 0)
+		with CaptureQueriesContext(connection) as repeat:
+			self.client.get(reverse("marketing:all_cars_count"), params)
+		self.assertEqual(len(repeat), 0)
+
+		response = self.client.get(reverse("marketing:foreign_used_cars_count"), {"transmission": CarVariant.Transmission.MANUAL})
+		self.assertEqual(response.json()["count"]["value"], 0)
+		self.assertEqual(response.json()["facets"]["transmissions"]["manual"], 0)
+
+	def test_empty_results_offer_single_filter_relaxations(self):
+		url = reverse("marketing:all_cars")
+		model_id = self.primary_variant.model_id
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url, {"price_max": "22000000", "model": model_id, "year": 2024})
+		self.assertEqual(response.context["total_results"], 0)
+		self.assertEqual(sum("relaxation_" in query["sql"] for query in queries.captured_queries), 1)
+		relaxations = {relaxation.label: relaxation for relaxation in response.context["relaxations"]}
+		self.assertEqual(relaxations["Price up to ₦26.4M"].count, 1)
+		self.assertEqual(relaxations["Price up to ₦26.4M"].url, f"?price_max=26400000&model={model_id}&year=2024")
+		self.assertEqual(relaxations["Any year"].count, 1)
+		self.assertContains(response, "Any year")
+
+		response = self.client.get(url, {"transmission": CarVariant.Transmission.MANUAL, "model": model_id, "year": 2024})
+		relaxations = {relaxation.label: relaxation.count for relaxation in response.context["relaxations"]}
+		self.assertEqual(relaxations["Any transmission"], 1)
+		self.assertEqual(relaxations["Any year"], 1)
+
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url, {"model": model_id})
+		self.assertEqual(response.context["relaxations"], [])
+		self.assertFalse(any("relaxation_" in query["sql"] for query in queries.captured_queries))
+
+	def test_site_chrome_is_lazy_and_memoized_per_version(self):
+		get_nav_categories()
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(reverse("marketing:financing"))
+		self.assertNotIn("van", [category["value"] for category in response.context["nav_categories"]])
+		self.assertFalse(any("marketing_inventoryfacetbucket" in query["sql"] for query in queries.captured_queries))
+
+		CarModel.objects.filter(pk=self.primary_variant.model_id).update(body_type=CarModel.BodyType.VAN)
+		refresh_facet_buckets()
+		bump_version(INVENTORY)
+		self.assertIn("van", [category["value"] for category in get_nav_categories()])
+
+		request = RequestFactory().get("/admin/")
+		with CaptureQueriesContext(connection) as queries:
+			chrome = navigation_context(request)
+			self.assertIs(navigation_context(request), chrome)
+		self.assertEqual(len(queries), 0)
+		self.assertEqual(chrome["site_contact"]["city"], "Lagos")
+		self.assertEqual([link.label for link in chrome["nav_links"]], ["Home", "All Cars"])
+		NavigationLink.objects.create(label="Sell", href="/sell/", order=3)
+		self.assertEqual(len(navigation_context(RequestFactory().get("/"))["nav_links"]), 3)
+
+	def test_content_snapshot_serves_cms_pages_without_queries(self):
+		get_content()
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(reverse("marketing:financing"))
+			self.client.get(reverse("marketing:all_cars"))
+		self.assertEqual(response.context["hero_title"], "Finance your car in 48 hours")
+		cms_tables = ("marketing_homepage", "marketing_financing", "marketing_inventorypageconfig", "marketing_navigationlink")
+		self.assertFalse(any(table in query["sql"] for query in queries.captured_queries for table in cms_tables))
+
+		content = get_content()
+		with self.assertRaises(TypeError):
+			content.financing.copy["hero_title"] = "Edited in place"
+		self.assertEqual(content.section_copy["missing"].heading, "")
+
+		config = FinancingPageConfig.objects.get(slug=FinancingPageConfig.Slug.DEFAULT)
+		config.hero_title = ""
+		config.save()
+		self.assertIsNot(get_content(), content)
+		self.assertEqual(get_content().financing.copy["hero_title"], FINANCING_DEFAULTS["hero_title"])
+		self.assertEqual(self.client.get(reverse("marketing:financing")).context["hero_title"], FINANCING_DEFAULTS["hero_title"])
+
+	def test_variant_listings_follow_catalogue_writes(self):
+		listing = CarVariantListing.objects.get(pk=self.primary_variant.pk)
+		self.assertEqual(listing.manufacturer_name, "Test Manufacturer")
+		self.assertEqual(listing.image_url, "https://example.com/image-primary.jpg")
+		self.assertTrue(listing.is_visible)
+
+		manufacturer = self.primary_variant.model.manufacturer
+		manufacturer.name = "Renamed Manufacturer"
+		manufacturer.save()
+		self.assertEqual(CarVariantListing.objects.get(pk=self.primary_variant.pk).manufacturer_name, "Renamed Manufacturer")
+
+		model = self.primary_variant.model
+		model.is_active = False
+		model.save()
+		self.assertFalse(CarVariantListing.objects.filter(model=model, is_visible=True).exists())
+
+		with CaptureQueriesContext(connection) as queries:
+			response = self.client.get(reverse("marketing:all_cars"), {"sort": "year_new_old"})
+		self.assertNotIn(self.primary_variant.id, [listing.id for listing in response.context["page_obj"]])
+		listing_queries = [query["sql"] for query in queries.captured_queries if "marketing_carvariantlisting" in query["sql"]]
+		self.assertTrue(listing_queries)
+		self.assertFalse(any("JOIN" in sql for sql in listing_queries))
+
+		variant_id = self.primary_variant.pk
+		self.primary_variant.delete()
+		self.assertFalse(CarVariantListing.objects.filter(pk=variant_id).exists())
+
+	def test_primary_image_follows_image_writes(self):
+		stale = CarVariant.objects.get(pk=self.primary_variant.pk)
+		self.assertEqual(stale.primary_image_url, "https://example.com/image-primary.jpg")
+
+		first = CarVariantImage.objects.create(variant=self.primary_variant, order=0, image_url="https://example.com/image-first.jpg", alt_text="First")
+		variant = CarVariant.objects.get(pk=self.primary_variant.pk)
+		self.assertEqual((variant.primary_image_url, variant.primary_image_alt), ("https://example.com/image-first.jpg", "First"))
+		self.assertEqual(CarVariantListing.objects.get(pk=variant.pk).image_url, "https://example.com/image-first.jpg")
+
+		# Reordering moves the primary image, and saving an instance loaded earlier keeps it.
+		first.order = 5
+		first.save()
+		stale.save()
+		self.assertEqual(CarVariant.objects.get(pk=variant.pk).primary_image_url, "https://example.com/image-primary.jpg")
+
+		CarVariantImage.objects.filter(variant=variant).exclude(pk=first.pk).delete()
+		first.delete()
+		variant = CarVariant.objects.get(pk=variant.pk)
+		self.assertTrue(variant.primary_image_is_placeholder)
+		self.assertTrue(CarVariantListing.objects.get(pk=variant.pk).display_image_is_placeholder)
+
+		with CaptureQueriesContext(connection) as queries:
+			self.client.get(reverse("marketing:all_cars"))
+		self.assertFalse(any("marketing_carvariantimage" in query["sql"] for query in queries.captured_queries))
+
+	def test_primary_image_writes_change_the_inventory_etag(self):
+		url = reverse("marketing:all_cars")
+		etag = self.client.get(url)["ETag"]
+		image = CarVariantImage.objects.create(variant=self.secondary_variant, order=1, image_url="https://example.com/image-secondary.jpg")
+		response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(response.status_code, 200)
+		self.assertContains(response, "https://example.com/image-secondary.jpg")
+
+		# An image behind the primary one changes no listing.
+		etag = response["ETag"]
+		CarVariantImage.objects.create(variant=self.secondary_variant, order=9, image_url="https://example.com/image-later.jpg")
+		self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+		image.delete()
+		self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+	def test_catalogue_registry_resolves_slugs_and_titles(self):
+		model = self.primary_variant.model
+		manufacturer = model.manufacturer
+		url = reverse("marketing:all_cars")
+		response = self.client.get(url, {"manufacturer": manufacturer.slug})
+		self.assertEqual(response.status_code, 301)
+		self.assertEqual(response["Location"], f"{url}?manufacturer={manufacturer.id}")
+
+		catalogue = get_catalogue()
+		self.assertIs(get_catalogue(), catalogue)
+		with self.assertNumQueries(0):
+			title = views._generate_dynamic_title({"model": model.id, "year": 2024}, "All Cars")
+		self.assertEqual(title, "All Test Manufacturer Roadster 2024 Cars")
+
+		payload = self.client.get(reverse("marketing:api_search"), {"q": "roadst"}).json()
+		model_result = next(result for result in payload["results"] if result["type"] == "model")
+		self.assertEqual(model_result["url"], f"{url}?model={model.id}")
+
+		response = self.client.get(reverse("marketing:api_car_variants"), {"model": model.slug})
+		self.assertEqual(response.json()["model"]["manufacturer"]["slug"], manufacturer.slug)
+		response = self.client.get(reverse("marketing:api_car_models"), {"manufacturer": manufacturer.id, "manufacturer_slug": "other"})
+		self.assertEqual(response.status_code, 404)
+
+		manufacturer.name = "Renamed Manufacturer"
+		manufacturer.save()
+		self.assertIsNot(get_catalogue(), catalogue)
+		self.assertEqual(get_catalogue().model(model.slug).full_name, "Renamed Manufacturer Roadster")
+
+	def test_inventory_export_streams_csv_and_gzipped_jsonl(self):
+		response = self.client.get(reverse("marketing:api_inventory_export"))
+		self.assertTrue(response.streaming)
+		rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+		exported = {int(row["id"]): row for row in rows}
+		self.assertEqual(len(rows), CarVariantListing.objects.filter(is_visible=True).count())
+		primary = exported[self.primary_variant.pk]
+		self.assertEqual(primary["manufacturer"], "Test Manufacturer")
+		self.assertEqual(primary["image_url"], "https://example.com/image-primary.jpg")
+		self.assertEqual(primary["location"], "Lagos, Nigeria")
+		self.assertEqual(primary["url"], f"http://testserver/cars/{self.primary_variant.pk}/")
+
+		response = self.client.get(reverse("marketing:api_inventory_export"), {"format": "jsonl", "gzip": "1"})
+		self.assertEqual(response["Content-Type"], "application/gzip")
+		lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+		self.assertEqual({json.loads(line)["id"] for line in lines}, set(exported))
+
+		self.assertEqual(self.client.get(reverse("marketing:api_inventory_export"), {"format": "xml"}).status_code, 400)
+
+		output = StringIO()
+		call_command("export_inventory", "--format", "jsonl", stdout=output)
+		self.assertEqual(len(output.getvalue().splitlines()), len(rows))
+
+	def test_deploy_check_requires_a_shared_version_cache(self):
+		self.assertEqual([error.id for error in check_shared_version_cache(None)], ["marketing.E001"])
+		shared = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "todde_cache"}}
+		with override_settings(CACHES=shared):
+			self.assertEqual(check_shared_version_cache(None), [])
+
+	def test_conditional_get_follows_content_versions(self):
+		url = reverse("marketing:all_cars")
+		etag = self.client.get(url)["ETag"]
+		with self.assertNumQueries(0):
+			response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(response.status_code, 304)
+
+		NavigationLink.objects.create(label="Sell", href="/sell/", order=3)
+		self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+		primary_url = reverse("marketing:vehicle_detail", args=[self.primary_variant.pk])
+		secondary_url = reverse("marketing:vehicle_detail", args=[self.secondary_variant.pk])
+		primary_etag = self.client.get(primary_url)["ETag"]
+		secondary_etag = self.client.get(secondary_url)["ETag"]
+		CarVariantFeature.objects.create(variant=self.primary_variant, order=2, text="Heated seats")
+		self.assertEqual(self.client.get(primary_url, HTTP_IF_NONE_MATCH=primary_etag).status_code, 200)
+		self.assertEqual(self.client.get(secondary_url, HTTP_IF_NONE_MATCH=secondary_etag).status_code, 304)
+
+		api_url = reverse("marketing:api_car_manufacturers")
+		api_etag = self.client.get(api_url)["ETag"]
+		self.assertEqual(self.client.get(api_url, HTTP_IF_NONE_MATCH=api_etag).status_code, 304)
+		self.primary_variant.save()
+		self.assertEqual(self.client.get(api_url, HTTP_IF_NONE_MATCH=api_etag).status_code, 200)
+
+	def test_powertrain_backfill_filter_and_facet(self):
+		tesla = CarManufacturer.objects.create(name="Tesla")
+		model_3 = CarModel.objects.create(manufacturer=tesla, name="Model 3")
+		prius = CarModel.objects.create(manufacturer=self.primary_variant.model.manufacturer, name="Prius")
+		electric = CarVariant.objects.create(model=model_3, year=2023, price="45000000", transmission=CarVariant.Transmission.AUTOMATIC)
+		CarVariant.objects.create(model=prius, year=2021, price="18000000", transmission=CarVariant.Transmission.AUTOMATIC)
+
+		call_command("backfill_powertrain", stdout=StringIO())
+		self.assertEqual(CarModel.objects.get(pk=model_3.pk).powertrain, CarModel.Powertrain.ELECTRIC)
+		self.assertEqual(CarModel.objects.get(pk=prius.pk).powertrain, CarModel.Powertrain.HYBRID)
+		self.assertEqual(CarModel.objects.get(pk=self.primary_variant.model_id).powertrain, CarModel.Powertrain.PETROL)
+		self.assertEqual(CarVariantListing.objects.get(pk=electric.pk).powertrain, CarModel.Powertrain.ELECTRIC)
+
+		url = reverse("marketing:all_cars")
+		response = self.client.get(f"{url}?manufacturer={tesla.pk}&electric=true")
+		self.assertEqual(response.status_code, 301)
+		self.assertEqual(response["Location"], f"{url}?manufacturer={tesla.pk}&powertrain=electric")
+
+		response = self.client.get(response["Location"])
+		self.assertEqual([listing.id for listing in response.context["page_obj"]], [electric.id])
+		powertrains = {option.value: option.count for option in response.context["facets"].powertrains}
+		self.assertEqual(powertrains[CarModel.Powertrain.ELECTRIC], 1)
+
+	def test_powertrain_backfill_keeps_admin_choices(self):
+		leaf = CarModel.objects.create(
+			manufacturer=self.primary_variant.model.manufacturer,
+			name="Leaf",
+			slug="leaf",
+			powertrain=CarModel.Powertrain.ELECTRIC,
+		)
+		request = RequestFactory().post("/admin/")
+		request.user = User.objects.create_superuser("admin", password="secret")
+		model_admin = CarModelAdmin(CarModel, admin.site)
+		data = {
+			"manufacturer": leaf.manufacturer_id,
+			"name": leaf.name,
+			"slug": leaf.slug,
+			"body_type": leaf.body_type,
+			"powertrain": CarModel.Powertrain.PETROL,
+			"is_active": "on",
+		}
+		form = model_admin.get_form(request, leaf, change=True)(data, instance=leaf)
+		self.assertTrue(form.is_valid(), form.errors)
+		model_admin.save_model(request, form.save(commit=False), form, change=True)
+
+		call_command("backfill_powertrain", stdout=StringIO())
+		leaf.refresh_from_db()
+		self.assertTrue(leaf.powertrain_classified)
+		self.assertEqual(leaf.powertrain, CarModel.Powertrain.PETROL)
+		self.assertTrue(CarModel.objects.get(pk=self.primary_variant.model_id).powertrain_classified)
+
+		call_command("backfill_powertrain", "--overwrite", stdout=StringIO())
+		leaf.refresh_from_db()
+		self.assertEqual(leaf.powertrain, CarModel.Powertrain.ELECTRIC)
+
 	def test_registered_cars_page_filters_listing_type(self):
 		response = self.client.get(reverse("marketing:registered_cars"))
 		self.assertEqual(response.status_code, 200)
@@ -371,6 +979,64 @@ class MarketingPagesTests(TestCase):
 		self.assertEqual(response.context["summary_badge_label"], "foreign used vehicles")
 		self.assertEqual(response.context["page_config"].slug, InventoryPageConfig.Slug.FOREIGN_USED)
 
+	def test_prerender_pages_writes_manifest_and_only_rerenders_changes(self):
+		model = self.primary_variant.model
+		landing_url = f"/cars/?manufacturer={model.manufacturer_id}&model={model.pk}"
+		detail_url = reverse("marketing:vehicle_detail", args=[self.primary_variant.pk])
+		with tempfile.TemporaryDirectory() as directory:
+			call_command("prerender_pages", directory=directory, jobs=1, stdout=StringIO())
+			with open(f"{directory}/manifest.json") as source:
+				pages = json.load(source)["pages"]
+			self.assertIn(f"/cars/?manufacturer={model.manufacturer_id}", pages)
+			self.assertEqual(pages[landing_url]["file"], f"cars/index.manufacturer={model.manufacturer_id}&model={model.pk}.html")
+			self.assertEqual(
+				{"/", "/financing/", "/cars/", "/registered-cars/", "/foreign-used/", detail_url} - set(pages),
+				set(),
+			)
+			with open(f"{directory}/{pages[detail_url]['file']}") as source:
+				self.assertIn("Feature packed coupe", source.read())
+
+			self.assertEqual(prerender.export_pages(directory, host="localhost").rendered, [])
+
+			CarVariantDetail.objects.filter(variant=self.primary_variant).get().save()
+			result = prerender.export_pages(directory, host="localhost")
+			self.assertEqual(result.rendered, [detail_url])
+
+			self.secondary_variant.is_active = False
+			self.secondary_variant.save()
+			result = prerender.export_pages(directory, host="localhost")
+			secondary_url = reverse("marketing:vehicle_detail", args=[self.secondary_variant.pk])
+			self.assertEqual(result.removed, [secondary_url])
+			self.assertNotIn(secondary_url, result.rendered)
+			self.assertIn("/", result.rendered)
+			self.assertFalse(os.path.exists(f"{directory}/{pages[secondary_url]['file']}"))
+
+	def test_prerender_rerenders_only_the_changed_variants_detail_pages(self):
+		other_model = CarModel.objects.create(manufacturer=CarManufacturer.objects.create(name="Other Make"), name="Saloon")
+		other = CarVariant.objects.create(model=other_model, year=2020, price="9000000", transmission=CarVariant.Transmission.MANUAL)
+		detail_urls = {
+			variant.pk: reverse("marketing:vehicle_detail", args=[variant.pk])
+			for variant in CarVariant.objects.filter(listing__is_visible=True)
+		}
+		with tempfile.TemporaryDirectory() as directory:
+			prerender.export_pages(directory, host="localhost")
+
+			self.primary_variant.price = Decimal("24500000")
+			self.primary_variant.save()
+			rendered = set(prerender.export_pages(directory, host="localhost").rendered)
+			# Its manufacturer's other variant shows it as a related card; listing pages show it too.
+			self.assertEqual(
+				rendered & set(detail_urls.values()),
+				{detail_urls[self.primary_variant.pk], detail_urls[self.secondary_variant.pk]},
+			)
+			self.assertIn("/cars/", rendered)
+
+			other_model.manufacturer.name = "Other Motors"
+			other_model.manufacturer.save()
+			rendered = set(prerender.export_pages(directory, host="localhost").rendered)
+			self.assertEqual(rendered & set(detail_urls.values()), set(detail_urls.values()))
+			self.assertIn(detail_urls[other.pk], rendered)
+
 	def test_seed_homepage_command_is_idempotent(self):
 		nav_count_before = NavigationLink.objects.count()
 		category_count_before = HomepageCategory.objects.count()
@@ -415,3 +1081,189 @@ class MarketingPagesTests(TestCase):
 		)
 		self.assertEqual(CarVariantFeature.objects.count(), CarVariantFeature.objects.values("variant", "text").distinct().count())
 		self.assertEqual(CarVariantSpecification.objects.count(), CarVariantSpecification.objects.values("variant", "label").distinct().count())
+
+
+@skipUnless(columnar.np is not None, "NumPy is not installed")
+class ColumnarInventoryParityTests(TestCase):
+	"""The columnar engine must answer exactly as the ORM path does."""
+
+	PER_PAGE = 5
+
+	@classmethod
+	def setUpTestData(cls):
+		body_types = [CarModel.BodyType.SEDAN, CarModel.BodyType.SUV, CarModel.BodyType.TRUCK]
+		powertrains = [CarModel.Powertrain.PETROL, CarModel.Powertrain.HYBRID, CarModel.Powertrain.ELECTRIC]
+		transmissions = [CarVariant.Transmission.AUTOMATIC, CarVariant.Transmission.MANUAL, CarVariant.Transmission.CVT]
+		listing_types = [CarVariant.ListingType.FOREIGN_USED, CarVariant.ListingType.REGISTERED]
+		models = []
+		for index, name in enumerate(["Alpha", "Bravo", "Charlie"]):
+			manufacturer = CarManufacturer.objects.create(name=f"{name} Motors")
+			for number in range(2):
+				models.append(
+					CarModel.objects.create(
+						manufacturer=manufacturer,
+						name=f"Model {number}",
+						body_type=body_types[(index + number) % 3],
+						powertrain=powertrains[(index * 2 + number) % 3],
+					)
+				)
+		prices = ["4500000", "12000000.50", "12000000.50", "19999999.99", "20000000", "31000000", "75000000", "250000000"]
+		for index in range(48):
+			CarVariant.objects.create(
+				model=models[index % len(models)],
+				year=2015 + (index * 7) % 9,
+				trim=f"Trim {index}",
+				price=prices[(index * 5) % len(prices)],
+				transmission=transmissions[(index // 2) % 3],
+				listing_type=listing_types[(index // 3) % 2],
+				is_active=index % 11 != 5,
+			)
+
+	QUERIES = [
+		"",
+		"category=suv",
+		"transmission=automatic&transmission=cvt",
+		"price_min=12000000.5&price_max=31000000",
+		"price_min=12000000.25",
+		"price_max=19999999.995",
+		"year_min=2017&year_max=2021&powertrain=hybrid",
+		"year=2019",
+		"manufacturer={manufacturer}",
+		"manufacturer={manufacturer}&model={model}&transmission=manual",
+		"category=van",
+		"listing_type=registered&price_min=20000000",
+		"powertrain=electric&category=sedan&year_min=2030",
+	]
+
+	def setUp(self):
+		cache.clear()
+		self.engine = columnar.ColumnarInventory.load(get_version(INVENTORY))
+		model = CarModel.objects.filter(manufacturer__name="Bravo Motors").order_by("pk").first()
+		self.placeholders = {"manufacturer": model.manufacturer_id, "model": model.pk}
+
+	def _specs(self, extra=""):
+		for query in self.QUERIES:
+			query = "&".join(part for part in (query.format(**self.placeholders), extra) if part)
+			yield query, InventoryFilterSpec.from_querydict(QueryDict(query))
+
+	def _orm_page(self, spec, queryset, result_count):
+		field, descending = spec.ordering_field
+		filtered = spec.filter_queryset(queryset)
+		if spec.page:
+			ordering = (f"-{field}", "-pk") if descending else (field, "pk")
+			return CountedPaginator(filtered.order_by(*ordering), self.PER_PAGE, result_count=result_count).get_page(spec.page)
+		return paginate_by_keyset(
+			filtered,
+			field=field,
+			descending=descending,
+			sort=spec.sort,
+			cursor=spec.cursor,
+			per_page=self.PER_PAGE,
+		)
+
+	def _assert_same_page(self, query, spec, listing_type):
+		queryset = views._inventory_queryset(listing_type=listing_type)
+		result_count = ResultCount(spec.filter_queryset(queryset).count())
+		expected = self._orm_page(spec, queryset, result_count)
+		actual = self.engine.paginate(spec, listing_type=listing_type, queryset=queryset, per_page=self.PER_PAGE, result_count=result_count)
+		message = f"{query} ({listing_type})"
+		self.assertEqual([item.pk for item in actual.object_list], [item.pk for item in expected.object_list], message)
+		self.assertEqual(actual.has_next(), expected.has_next(), message)
+		self.assertEqual(actual.has_previous(), expected.has_previous(), message)
+		if getattr(expected, "is_keyset", False):
+			self.assertEqual(actual.next_cursor, expected.next_cursor, message)
+			self.assertEqual(actual.previous_cursor, expected.previous_cursor, message)
+			self.assertEqual(actual.offset, expected.offset, message)
+		else:
+			self.assertEqual(actual.number, expected.number, message)
+		return expected
+
+	def test_facets_and_counts_match_the_orm(self):
+		for listing_type in (None, CarVariant.ListingType.FOREIGN_USED, CarVariant.ListingType.REGISTERED):
+			queryset = views._inventory_queryset(listing_type=listing_type)
+			for query, spec in self._specs():
+				filters = spec.as_selected_filters()
+				with self.subTest(query=query, listing_type=listing_type):
+					self.assertEqual(
+						self.engine.facets(filters, listing_type=listing_type),
+						load_inventory_facets(listing_type=listing_type, filters=filters, queryset=queryset),
+					)
+					self.assertEqual(
+						self.engine.count(filters, listing_type=listing_type),
+						spec.filter_queryset(queryset).count(),
+					)
+
+	def test_keyset_walks_match_the_orm(self):
+		for sort in SORT_FIELDS:
+			for listing_type in (None, CarVariant.ListingType.REGISTERED):
+				for query, spec in self._specs(f"sort={sort}"):
+					with self.subTest(query=query, listing_type=listing_type):
+						page = self._assert_same_page(query, spec, listing_type)
+						cursors = []
+						while page.next_cursor:
+							cursors.append(page.next_cursor)
+							page = self._assert_same_page(query, replace(spec, cursor=page.next_cursor), listing_type)
+						while page.previous_cursor:
+							page = self._assert_same_page(query, replace(spec, cursor=page.previous_cursor), listing_type)
+						self.assertEqual(page.offset, 0)
+
+	def test_cursor_between_rows_and_offset_pages_match_the_orm(self):
+		for sort, (field, _) in SORT_FIELDS.items():
+			value = "12000000.505" if field == "price" else "2019"
+			for direction in ("n", "p"):
+				cursor = encode_cursor({"s": sort, "v": value, "id": 0, "o": 10, "d": direction})
+				spec = InventoryFilterSpec.from_querydict(QueryDict(f"sort={sort}&cursor={cursor}"))
+				with self.subTest(sort=sort, direction=direction):
+					self._assert_same_page(sort, spec, None)
+			for number in (2, 4, 99):
+				spec = InventoryFilterSpec.from_querydict(QueryDict(f"sort={sort}&page={number}"))
+				with self.subTest(sort=sort, page=number):
+					self._assert_same_page(sort, spec, None)
+
+	def test_inventory_results_use_the_engine_and_follow_versions(self):
+		url = reverse("marketing:all_cars")
+		expected = self.client.get(url, {"transmission": "automatic", "sort": "year_new_old"})
+		cache.clear()
+		with override_settings(TODDE_INVENTORY_ENGINE="columnar"), CaptureQueriesContext(connection) as queries:
+			response = self.client.get(url, {"transmission": "automatic", "sort": "year_new_old"})
+		self.assertEqual(
+			[variant.pk for variant in response.context["page_obj"]],
+			[variant.pk for variant in expected.context["page_obj"]],
+		)
+		self.assertEqual(response.context["facets"], expected.context["facets"])
+		self.assertFalse(any("COUNT(" in query["sql"] for query in queries.captured_queries))
+
+		variant = CarVariant.objects.filter(is_active=True, transmission=CarVariant.Transmission.AUTOMATIC).order_by("-year", "-pk").first()
+		variant.is_active = False
+		variant.save()
+		with override_settings(TODDE_INVENTORY_ENGINE="columnar"):
+			response = self.client.get(url, {"transmission": "automatic", "sort": "year_new_old"})
+			self.assertEqual(columnar.get_columnar_inventory().version, get_version(INVENTORY))
+		self.assertNotIn(variant.pk, [listing.pk for listing in response.context["page_obj"]])
+
+	def test_shared_snapshot_is_mapped_read_only_and_swapped_per_version(self):
+		with tempfile.TemporaryDirectory() as directory:
+			shared = columnar.ColumnarInventory.shared(self.engine.version, directory)
+			old_path = snapshot_path(directory, self.engine.version)
+			self.assertTrue(old_path.exists())
+			self.assertFalse(shared.ids.flags.writeable)
+			for query, spec in self._specs():
+				filters = spec.as_selected_filters()
+				with self.subTest(query=query):
+					self.assertEqual(shared.facets(filters), self.engine.facets(filters))
+					self.assertEqual(list(shared.match(filters)), list(self.engine.match(filters)))
+
+			variant = CarVariant.objects.filter(is_active=True).order_by("pk").first()
+			variant.price = Decimal("1000")
+			variant.save()
+			swapped = columnar.ColumnarInventory.shared(get_version(INVENTORY), directory)
+			self.assertFalse(old_path.exists())
+			self.assertEqual(swapped.facets().stats.min_price, Decimal("1000"))
+			self.assertEqual(shared.count({}), self.engine.count({}))
+
+			new_path = snapshot_path(directory, swapped.version)
+			new_path.write_bytes(b"not a snapshot")
+			with self.assertRaises(SnapshotError):
+				columnar.ColumnarInventory.open_snapshot(new_path)
+			rebuilt = columnar.ColumnarInventory.shared(swapped.version, directory)
+			self.assertEqual(rebuilt.count({}), swapped.count({}))
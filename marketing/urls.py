@@ -1,6 +1,7 @@
 from django.urls import path
 
 from . import views
+from .models import CarVariant
 
 app_name = "marketing"
 
@@ -9,10 +10,37 @@ urlpatterns = [
     path("registered-cars/", views.registered_cars, name="registered_cars"),
     path("foreign-used/", views.foreign_used_cars, name="foreign_used_cars"),
     path("cars/", views.all_cars, name="all_cars"),
+    path("cars/results/", views.inventory_results, name="all_cars_results"),
+    path(
+        "registered-cars/results/",
+        views.inventory_results,
+        {"listing_type": CarVariant.ListingType.REGISTERED},
+        name="registered_cars_results",
+    ),
+    path(
+        "foreign-used/results/",
+        views.inventory_results,
+        {"listing_type": CarVariant.ListingType.FOREIGN_USED},
+        name="foreign_used_cars_results",
+    ),
+    path("cars/count/", views.inventory_count, name="all_cars_count"),
+    path(
+        "registered-cars/count/",
+        views.inventory_count,
+        {"listing_type": CarVariant.ListingType.REGISTERED},
+        name="registered_cars_count",
+    ),
+    path(
+        "foreign-used/count/",
+        views.inventory_count,
+        {"listing_type": CarVariant.ListingType.FOREIGN_USED},
+        name="foreign_used_cars_count",
+    ),
     path("cars/<int:variant_id>/", views.vehicle_detail, name="vehicle_detail"),
     path("financing/", views.financing, name="financing"),
     path("api/car-manufacturers/", views.car_manufacturers_api, name="api_car_manufacturers"),
     path("api/car-models/", views.car_models_api, name="api_car_models"),
     path("api/car-variants/", views.car_variants_api, name="api_car_variants"),
     path("api/search/", views.search_api, name="api_search"),
+    path("api/inventory-export/", views.inventory_export_api, name="api_inventory_export"),
 ]
@@ -0,0 +1,76 @@
+"""
+Generation counters used to invalidate cached data per content domain.
+
+Counters live in the default cache so every worker sharing that cache sees a
+bump immediately. A missing counter is seeded from the clock, which means an
+evicted counter invalidates everything derived from it instead of reviving
+stale entries. The ``marketing.E001`` deploy check rejects cache backends that
+are private to one process.
+"""
+from __future__ import annotations
+
+import time
+
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+INVENTORY = "inventory"
+CONTENT = "content"
+# Shared by every vehicle detail page: manufacturer writes (the sidebar lists
+# them) and bulk rebuilds that bypass the per-variant signals bump it.
+VEHICLE_PAGES = "vehicle-pages"
+
+
+def variant_domain(variant_id: int) -> str:
+	"""Domain for one variant's detail page: the variant, its detail data and its related cards."""
+	return f"variant:{variant_id}"
+
+
+def _version_key(domain: str) -> str:
+	return f"marketing:version:{domain}"
+
+
+def get_version(domain: str) -> int:
+	key = _version_key(domain)
+	version = cache.get(key)
+	if version is None:
+		cache.add(key, time.time_ns(), timeout=None)
+		version = cache.get(key)
+	return version
+
+
+def bump_version(domain: str) -> None:
+	"""Invalidate ``domain`` now and again once the surrounding transaction commits.
+
+	The second bump discards anything cached by readers that ran between the
+	write and the commit and therefore still saw the old rows.
+	"""
+
+	def bump() -> None:
+		key = _version_key(domain)
+		try:
+			cache.incr(key)
+		except ValueError:
+			cache.set(key, time.time_ns(), timeout=None)
+
+	bump()
+	transaction.on_commit(bump)
+
+
+def bump_versions(domains: Iterable[str]) -> None:
+	"""Invalidate many domains in one round-trip, now and again once the transaction commits.
+
+	The counters are dropped rather than incremented; the next read reseeds
+	each one from the clock.
+	"""
+	keys = [_version_key(domain) for domain in domains]
+	if not keys:
+		return
+
+	def drop() -> None:
+		cache.delete_many(keys)
+
+	drop()
+	transaction.on_commit(drop)
@@ -1,68 +1,53 @@
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP, getcontext
+from decimal import Decimal, ROUND_HALF_UP, getcontext
 from types import SimpleNamespace
 from urllib.parse import urlencode
-from collections import defaultdict
 
-from django.core.paginator import Paginator
-from django.db.models import Avg, Count, Max, Min, Q, Prefetch
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page
+from django.db.models import Count, Q, Prefetch
+from django.http import Http404, HttpResponsePermanentRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
 from django.templatetags.static import static
+from django.urls import reverse
 from django.views.decorators.http import require_GET
 
+from .catalogue import get_catalogue
+from .cms import get_content
+from .columnar import get_columnar_inventory
+from .conditional import inventory_condition, page_condition, page_etag, variant_page_condition
+from .export import EXPORT_FORMATS, export_inventory
+from .facets import load_inventory_facets
+from .filters import SORT_OPTIONS, InventoryFilterSpec
+from .page_cache import cache_anonymous_page
+from .pagination import CountedPaginator, InventoryCountProvider, KeysetPage, ResultCount, paginate_by_keyset
 from .models import (
-	CarManufacturer,
 	CarModel,
 	CarVariant,
 	CarVariantDetail,
 	CarVariantFeature,
 	CarVariantImage,
+	CarVariantListing,
 	CarVariantSpecification,
-	FinancingBenefit,
-	FinancingPageConfig,
-	FinancingSnapshotItem,
-	HomepageBrandMetric,
-	HomepageCategory,
-	HomepageContactCard,
 	HomepageFeaturedVehicle,
-	HomepageFinancingHighlight,
-	HomepageFinancingStep,
-	HomepageHero,
-	HomepageSectionCopy,
-	HomepageValueProposition,
 	InventoryPageConfig,
-	NavigationLink,
 )
+from .versioning import INVENTORY, get_version
 
 
-def _build_section_copy_map():
-	default_factory = lambda: SimpleNamespace(heading="", subheading="", supporting_text="", cta_label="", cta_url="")
-	mapping = defaultdict(default_factory)
-	for entry in HomepageSectionCopy.objects.filter(is_active=True):
-		mapping[entry.slug] = entry
-	return mapping
+INVENTORY_PAGE_SIZE = 12
 
 
+@page_condition
+@cache_anonymous_page(page_etag)
 def homepage(request):
-	section_copy = _build_section_copy_map()
-	hero_slides = HomepageHero.objects.filter(is_active=True).order_by("order")
-	categories = HomepageCategory.objects.filter(is_active=True).order_by("order")
+	content = get_content()
+	section_copy = content.section_copy
 	featured = (
 		HomepageFeaturedVehicle.objects.filter(is_active=True)
-		.select_related("variant", "variant__model", "variant__model__manufacturer")
-		.prefetch_related(
-			Prefetch(
-				"variant__images",
-				queryset=CarVariantImage.objects.filter(is_active=True).order_by("order", "id"),
-			)
-		)
+		.select_related("variant__listing")
 	)
-	value_props = HomepageValueProposition.objects.filter(is_active=True)
-	brand_metrics = HomepageBrandMetric.objects.filter(is_active=True)
-	financing_highlights = HomepageFinancingHighlight.objects.filter(is_active=True)
-	nav_links = NavigationLink.objects.filter(is_active=True)
-	financing_steps = HomepageFinancingStep.objects.filter(is_active=True)
-	contact_cards = HomepageContactCard.objects.filter(is_active=True)
 
 	placeholder_image_url = static("images/vehicle-placeholder.svg")
 	featured_list = []
@@ -70,11 +55,11 @@ def homepage(request):
 		display_url = placeholder_image_url
 		display_alt = vehicle.name
 		is_placeholder = True
-		if vehicle.variant:
-			image_info = _resolve_variant_primary_image(vehicle.variant, placeholder_image_url)
-			display_url = image_info.source_url
-			display_alt = image_info.alt_text or vehicle.name
-			is_placeholder = image_info.is_placeholder
+		listing = getattr(vehicle.variant, "listing", None) if vehicle.variant else None
+		if listing is not None:
+			display_url = listing.display_image_url
+			display_alt = listing.display_image_alt or vehicle.name
+			is_placeholder = listing.display_image_is_placeholder
 		elif vehicle.image_url:
 			display_url = vehicle.image_url
 			display_alt = vehicle.name
@@ -82,20 +67,21 @@ def homepage(request):
 		vehicle.display_image_url = display_url
 		vehicle.display_image_alt = display_alt
 		vehicle.display_image_is_placeholder = is_placeholder
+		# Only a visible listing gets the linked card; anything else keeps the curated markup.
+		vehicle.card_listing = listing if listing is not None and listing.is_visible else None
 		featured_list.append(vehicle)
 
 	context = {
-		"nav_links": nav_links,
-		"hero_slides": hero_slides,
-		"categories": categories,
+		"hero_slides": content.hero_slides,
+		"categories": content.homepage_categories,
 		"featured_vehicles": featured_list,
-		"value_props": value_props,
-		"brand_metrics": brand_metrics,
-		"financing_highlights": financing_highlights,
-		"financing_steps": financing_steps,
-		"contact_cards": contact_cards,
+		"value_props": content.value_props,
+		"brand_metrics": content.brand_metrics,
+		"financing_highlights": content.financing_highlights,
+		"financing_steps": content.financing_steps,
+		"contact_cards": content.contact_cards,
 		"section_copy": section_copy,
-		"car_manufacturers": CarManufacturer.objects.filter(is_active=True).order_by("name"),
+		"car_manufacturers": list(get_catalogue().manufacturers.values()),
 		"meta": {
 			"title": section_copy["meta"].heading or "Todde Integrated Services | Empowering Nigerians to own cars with flexible financing",
 			"description": section_copy["meta"].subheading or "Shop certified vehicles, access Todde's flexible financing, and drive home with confidence in 48 hours.",
@@ -104,110 +90,56 @@ def homepage(request):
 	return render(request, "marketing/home.html", context)
 
 
+@page_condition
 def financing(request):
-	section_copy = _build_section_copy_map()
-	config = FinancingPageConfig.objects.filter(is_active=True).order_by("slug").first()
-
-	defaults = {
-		"hero_title": "Buy your dream car, now. Pay monthly.",
-		"hero_subtitle": "Todde Financing makes car ownership accessible with transparent offers, fair interest rates, and bundled protection.",
-		"hero_primary_cta_label": "Start now",
-		"hero_primary_cta_url": "/financing/",
-		"hero_secondary_cta_label": "Explore inventory",
-		"hero_secondary_cta_url": "/#inventory",
-		"hero_background_image_url": "https://images.unsplash.com/photo-1517677129300-07b130802f46?auto=format&fit=crop&w=1400&q=80",
-		"hero_callout_title": "Need advice?",
-		"hero_callout_text": "Book a free financing clinic every Friday at Todde hubs nationwide.",
-		"steps_heading": "How Todde Financing works",
-		"steps_subheading": "Eight clear steps to owning your vehicle with confidence.",
-		"benefits_heading": "What you get with every plan",
-		"benefits_subheading": "",
-		"eligibility_heading": "Eligibility snapshot",
-		"eligibility_description": "Minimum monthly income of ₦250,000, verifiable employment, and BVN confirmation.",
-		"eligibility_cta_label": "Review full requirements",
-		"eligibility_cta_url": "/financing/",
-		"testimonial_image_url": "https://images.unsplash.com/photo-1502877338535-766e1452684a?auto=format&fit=crop&w=900&q=80",
-		"testimonial_card_title": "Todde customer stories",
-		"testimonial_card_text": "“Financing with Todde helped our logistics business scale in 3 months.”",
-		"corporate_heading": "Bring Todde Financing to your business fleets",
-		"corporate_subheading": "Talk to us about flexible corporate plans, driver training, and maintenance coordination.",
-		"corporate_primary_cta_label": "Partner with Todde",
-		"corporate_primary_cta_url": "mailto:partners@todde.africa",
-		"corporate_secondary_cta_label": "Call +234 1700 1234",
-		"corporate_secondary_cta_url": "tel:+23417001234",
-		"corporate_availability_heading": "Available nationwide",
-		"corporate_availability_description": "Lagos • Abuja • Port Harcourt • Ibadan • Enugu",
-	}
-
-	def resolve(field: str) -> str:
-		if config:
-			return config.resolve(field, defaults[field])
-		return defaults[field]
+	content = get_content()
+	section_copy = content.section_copy
+	copy = content.financing.copy
 
-	snapshot_items = list(
-		FinancingSnapshotItem.objects.filter(is_active=True).order_by("order", "id")
-	)
-	if not snapshot_items:
-		snapshot_items = [
-			SimpleNamespace(text="Pay only 30% upfront and get your keys within 48 hours of approval."),
-			SimpleNamespace(text="Automated payment reminders and flexible repayment channels."),
-			SimpleNamespace(text="Roadside assistance, insurance, and maintenance bundles included."),
-		]
-
-	benefits = list(
-		FinancingBenefit.objects.filter(is_active=True).order_by("order", "id")
-	)
-	if not benefits:
-		benefits = [
-			SimpleNamespace(title="Comprehensive insurance", description="Comprehensive insurance coverage and annual renewals handled by Todde.", icon="heroicons:shield-check"),
-			SimpleNamespace(title="Dedicated support", description="Dedicated support agents for servicing, documentation, and payment plans.", icon="heroicons:lifebuoy"),
-			SimpleNamespace(title="Transparent pricing", description="Transparent pricing and zero hidden charges on every contract.", icon="heroicons:banknotes"),
-		]
 	context = {
-		"nav_links": NavigationLink.objects.filter(is_active=True),
-		"financing_steps": HomepageFinancingStep.objects.filter(is_active=True),
-		"financing_highlights": HomepageFinancingHighlight.objects.filter(is_active=True),
-		"financing_snapshot_items": snapshot_items,
-		"financing_benefits": benefits,
-		"hero_background_image_url": resolve("hero_background_image_url"),
+		"financing_steps": content.financing_steps,
+		"financing_highlights": content.financing_highlights,
+		"financing_snapshot_items": content.financing.snapshot_items,
+		"financing_benefits": content.financing.benefits,
+		"hero_background_image_url": copy["hero_background_image_url"],
 		"hero_primary_cta": {
-			"label": resolve("hero_primary_cta_label"),
-			"url": resolve("hero_primary_cta_url"),
+			"label": copy["hero_primary_cta_label"],
+			"url": copy["hero_primary_cta_url"],
 		},
 		"hero_secondary_cta": {
-			"label": resolve("hero_secondary_cta_label"),
-			"url": resolve("hero_secondary_cta_url"),
+			"label": copy["hero_secondary_cta_label"],
+			"url": copy["hero_secondary_cta_url"],
 		},
-		"hero_title": resolve("hero_title"),
-		"hero_subtitle": resolve("hero_subtitle"),
-		"hero_callout_title": resolve("hero_callout_title"),
-		"hero_callout_text": resolve("hero_callout_text"),
-		"steps_heading": resolve("steps_heading"),
-		"steps_subheading": resolve("steps_subheading"),
-		"benefits_heading": resolve("benefits_heading"),
-		"benefits_subheading": resolve("benefits_subheading"),
+		"hero_title": copy["hero_title"],
+		"hero_subtitle": copy["hero_subtitle"],
+		"hero_callout_title": copy["hero_callout_title"],
+		"hero_callout_text": copy["hero_callout_text"],
+		"steps_heading": copy["steps_heading"],
+		"steps_subheading": copy["steps_subheading"],
+		"benefits_heading": copy["benefits_heading"],
+		"benefits_subheading": copy["benefits_subheading"],
 		"eligibility": {
-			"heading": resolve("eligibility_heading"),
-			"description": resolve("eligibility_description"),
-			"cta_label": resolve("eligibility_cta_label"),
-			"cta_url": resolve("eligibility_cta_url"),
+			"heading": copy["eligibility_heading"],
+			"description": copy["eligibility_description"],
+			"cta_label": copy["eligibility_cta_label"],
+			"cta_url": copy["eligibility_cta_url"],
 		},
 		"testimonial": {
-			"image_url": resolve("testimonial_image_url"),
-			"card_title": resolve("testimonial_card_title"),
-			"card_text": resolve("testimonial_card_text"),
+			"image_url": copy["testimonial_image_url"],
+			"card_title": copy["testimonial_card_title"],
+			"card_text": copy["testimonial_card_text"],
 		},
 		"corporate": {
-			"heading": resolve("corporate_heading"),
-			"subheading": resolve("corporate_subheading"),
-			"primary_label": resolve("corporate_primary_cta_label"),
-			"primary_url": resolve("corporate_primary_cta_url"),
-			"secondary_label": resolve("corporate_secondary_cta_label"),
-			"secondary_url": resolve("corporate_secondary_cta_url"),
-			"availability_heading": resolve("corporate_availability_heading"),
-			"availability_description": resolve("corporate_availability_description"),
+			"heading": copy["corporate_heading"],
+			"subheading": copy["corporate_subheading"],
+			"primary_label": copy["corporate_primary_cta_label"],
+			"primary_url": copy["corporate_primary_cta_url"],
+			"secondary_label": copy["corporate_secondary_cta_label"],
+			"secondary_url": copy["corporate_secondary_cta_url"],
+			"availability_heading": copy["corporate_availability_heading"],
+			"availability_description": copy["corporate_availability_description"],
 		},
-		"page_config": config,
+		"page_config": content.financing.config,
 		"meta": {
 			"title": section_copy["financing_meta"].heading or "Todde Car Financing | Spread payments and own your dream car",
 			"description": section_copy["financing_meta"].subheading or "Pay only 30% upfront and finance the rest with Todde. See how our 8-step process gets you on the road fast.",
@@ -216,35 +148,6 @@ def financing(request):
 	return render(request, "marketing/financing.html", context)
 
 
-def _parse_decimal(value: str | None) -> Decimal | None:
-	if not value:
-		return None
-	try:
-		return Decimal(value)
-	except (InvalidOperation, TypeError):
-		return None
-
-
-def _parse_int(value: str | None) -> int | None:
-	if not value:
-		return None
-	try:
-		return int(value)
-	except (TypeError, ValueError):
-		return None
-
-
-def _encode_filters(selected_filters: dict[str, object]) -> str:
-	params: list[tuple[str, str]] = []
-	for key, value in selected_filters.items():
-		if key == "transmission":
-			for transmission_value in value:
-				params.append(("transmission", str(transmission_value)))
-		else:
-			params.append((key, str(value)))
-	return urlencode(params)
-
-
 def _compute_financing_summary(
 	*,
 	price: Decimal,
@@ -277,47 +180,8 @@ def _compute_financing_summary(
 	}
 
 
-def _resolve_variant_primary_image(variant: CarVariant, placeholder_url: str) -> SimpleNamespace:
-	manufacturer_name = variant.model.manufacturer.name if variant.model and variant.model.manufacturer else ""
-	model_name = variant.model.name if variant.model else ""
-	year_value = getattr(variant, "year", "")
-	default_alt_components = [component for component in (manufacturer_name, model_name, year_value) if component]
-	default_alt_text = " ".join(map(str, default_alt_components)) or "Todde vehicle"
-	images_manager = getattr(variant, "images", None)
-	if images_manager is not None:
-		image_candidates = images_manager.all()
-		for image in image_candidates:
-			source = getattr(image, "source_url", "") or ""
-			source = source.strip()
-			if source:
-				alt_text = getattr(image, "alt_text", "") or default_alt_text
-				return SimpleNamespace(
-					source_url=source,
-					alt_text=alt_text,
-					is_placeholder=False,
-				)
-	return SimpleNamespace(
-		source_url=placeholder_url,
-		alt_text=default_alt_text,
-		is_placeholder=True,
-	)
-
-
 def _inventory_queryset(listing_type: str | None = None):
-	queryset = (
-		CarVariant.objects.filter(
-			is_active=True,
-			model__is_active=True,
-			model__manufacturer__is_active=True,
-		)
-		.select_related("model", "model__manufacturer")
-		.prefetch_related(
-			Prefetch(
-				"images",
-				queryset=CarVariantImage.objects.filter(is_active=True).order_by("order", "id"),
-			)
-		)
-	)
+	queryset = CarVariantListing.objects.filter(is_visible=True)
 	if listing_type:
 		queryset = queryset.filter(listing_type=listing_type)
 	return queryset
@@ -335,7 +199,7 @@ def _resolve_inventory_copy(
 	is_dynamic_title: bool = False,
 	is_dynamic_intro: bool = False,
 ):
-	config = InventoryPageConfig.objects.filter(slug=slug, is_active=True).first()
+	config = get_content().inventory_configs.get(slug)
 	if not config:
 		return {
 			"config": None,
@@ -365,11 +229,11 @@ def _resolve_inventory_copy(
 def _generate_dynamic_intro_text(selected_filters: dict, default_intro: str) -> str:
 	"""Generate dynamic intro text based on applied filters."""
 	category = selected_filters.get("category")
-	electric = selected_filters.get("electric")
+	powertrain = selected_filters.get("powertrain")
 	listing_type = selected_filters.get("listing_type")
 	
 	# Handle electric vehicles first
-	if electric == "true":
+	if powertrain == CarModel.Powertrain.ELECTRIC:
 		return "Discover our collection of electric vehicles, featuring zero-emission technology and cutting-edge innovation. All electric cars are thoroughly inspected by Todde engineers for quality and reliability."
 	
 	# Handle listing type-based intro text
@@ -395,31 +259,33 @@ def _generate_dynamic_intro_text(selected_filters: dict, default_intro: str) ->
 
 
 def _generate_dynamic_title(selected_filters: dict, default_title: str) -> str:
-	"""Generate a dynamic title based on applied filters."""
+	"""Generate a dynamic title based on applied filters.
+
+	Names come from the catalogue registry, so this makes no queries.
+	"""
+	catalogue = get_catalogue()
 	manufacturer_id = selected_filters.get("manufacturer")
 	model_id = selected_filters.get("model")
 	year = selected_filters.get("year")
 	category = selected_filters.get("category")
-	electric = selected_filters.get("electric")
+	powertrain = selected_filters.get("powertrain")
 	listing_type = selected_filters.get("listing_type")
 	
 	title_parts = []
 	
-	# Handle electric vehicles first
-	if electric == "true":
-		base_title = "All Electric Cars"
+	# Handle powertrain (electric, hybrid, ...) first
+	if powertrain:
+		powertrain_label = dict(CarModel.Powertrain.choices).get(powertrain, powertrain.title())
+		base_title = f"All {powertrain_label} Cars"
 		
-		# Add manufacturer to electric if specified
-		if manufacturer_id:
-			try:
-				manufacturer = CarManufacturer.objects.get(id=manufacturer_id, is_active=True)
-				return f"All {manufacturer.name} Electric Cars"
-			except CarManufacturer.DoesNotExist:
-				pass
+		# Add manufacturer to powertrain if specified
+		manufacturer = catalogue.manufacturer(manufacturer_id)
+		if manufacturer:
+			return f"All {manufacturer.name} {powertrain_label} Cars"
 		
-		# Add year to electric if specified
+		# Add year to powertrain if specified
 		if year:
-			return f"All {year} Electric Cars"
+			return f"All {year} {powertrain_label} Cars"
 			
 		return base_title
 	
@@ -432,12 +298,9 @@ def _generate_dynamic_title(selected_filters: dict, default_title: str) -> str:
 		base_title = listing_type_titles.get(listing_type, f"All {listing_type.replace('-', ' ').title()} Cars")
 		
 		# Add manufacturer to listing type if specified
-		if manufacturer_id:
-			try:
-				manufacturer = CarManufacturer.objects.get(id=manufacturer_id, is_active=True)
-				return f"All {manufacturer.name} {listing_type.replace('-', ' ').title()} Cars"
-			except CarManufacturer.DoesNotExist:
-				pass
+		manufacturer = catalogue.manufacturer(manufacturer_id)
+		if manufacturer:
+			return f"All {manufacturer.name} {listing_type.replace('-', ' ').title()} Cars"
 		
 		# Add category to listing type if specified
 		if category:
@@ -464,12 +327,9 @@ def _generate_dynamic_title(selected_filters: dict, default_title: str) -> str:
 		base_title = category_titles.get(category, f"All {category.title()} Cars")
 		
 		# Add manufacturer to category if specified
-		if manufacturer_id:
-			try:
-				manufacturer = CarManufacturer.objects.get(id=manufacturer_id, is_active=True)
-				return f"All {manufacturer.name} {category.title()} Cars"
-			except CarManufacturer.DoesNotExist:
-				pass
+		manufacturer = catalogue.manufacturer(manufacturer_id)
+		if manufacturer:
+			return f"All {manufacturer.name} {category.title()} Cars"
 		
 		# Add year to category if specified
 		if year:
@@ -478,22 +338,16 @@ def _generate_dynamic_title(selected_filters: dict, default_title: str) -> str:
 		return base_title
 	
 	# Get manufacturer name if filtered by manufacturer
-	if manufacturer_id:
-		try:
-			manufacturer = CarManufacturer.objects.get(id=manufacturer_id, is_active=True)
-			title_parts.append(manufacturer.name)
-		except CarManufacturer.DoesNotExist:
-			pass
+	manufacturer = catalogue.manufacturer(manufacturer_id)
+	if manufacturer:
+		title_parts.append(manufacturer.name)
 	
 	# Get model name if filtered by model
-	if model_id:
-		try:
-			model = CarModel.objects.get(id=model_id, is_active=True)
-			if not manufacturer_id:  # If manufacturer wasn't already added
-				title_parts.append(model.manufacturer.name)
-			title_parts.append(model.name)
-		except CarModel.DoesNotExist:
-			pass
+	model = catalogue.model(model_id)
+	if model:
+		if not manufacturer_id:  # If manufacturer wasn't already added
+			title_parts.append(model.manufacturer.name)
+		title_parts.append(model.name)
 	
 	# Add year if specified
 	if year:
@@ -507,196 +361,239 @@ def _generate_dynamic_title(selected_filters: dict, default_title: str) -> str:
 			return f"All {title_parts[0]} {title_parts[1]} Cars"
 		else:
 			return f"All {' '.join(title_parts)} Cars"
-	
+
 	return default_title
-def _build_inventory_context(
-	request,
-	*,
-	listing_type: str | None,
-	page_slug: str,
-	default_page_title: str,
-	default_intro_text: str,
-	default_meta_title: str,
-	default_meta_description: str,
-	default_page_kicker: str = "Inventory",
-	default_summary_badge_label: str = "vehicles available",
-):
-	base_queryset = _inventory_queryset(listing_type=listing_type)
 
-	available_stats = base_queryset.aggregate(
-		min_price=Min("price"),
-		max_price=Max("price"),
-		min_year=Min("year"),
-		max_year=Max("year"),
-	)
 
-	category_counts = {
-		entry["model__body_type"]: entry["total"]
-		for entry in base_queryset.values("model__body_type").annotate(total=Count("id"))
-	}
-	available_categories = [
-		{
-			"value": body_value,
-			"label": body_label,
-			"count": category_counts.get(body_value, 0),
+def _inventory_link(spec: InventoryFilterSpec, **changes) -> str:
+	return f"?{spec.with_changes(extra=(), **changes).querystring()}"
+
+
+def _inventory_page_link(spec: InventoryFilterSpec, number: int) -> str:
+	return _inventory_link(spec, page=number if number > 1 else None, cursor=None)
+
+
+def _canonical_inventory_redirect(request, spec: InventoryFilterSpec):
+	"""Send equivalent filter URLs to the one canonical query string."""
+	canonical = spec.querystring()
+	if canonical == request.META.get("QUERY_STRING", ""):
+		return None
+	return HttpResponsePermanentRedirect(f"{request.path}?{canonical}" if canonical else request.path)
+
+
+def _load_inventory_results(spec: InventoryFilterSpec, *, listing_type: str | None):
+	"""Return the page, facets and result count for ``spec``.
+
+	The ids on the page, the facets and the pagination state are cached under the
+	canonical spec key and the inventory version, so a repeated result page costs
+	one primary-key lookup for its vehicles.
+	"""
+	base_queryset = _inventory_queryset(listing_type=listing_type)
+	filtered_queryset = spec.filter_queryset(base_queryset)
+	sort_field, sort_descending = spec.ordering_field
+	ordering = (f"-{sort_field}", "-pk") if sort_descending else (sort_field, "pk")
+
+	cache_key = f"marketing:inventory-page:{get_version(INVENTORY)}:{listing_type or ''}:{spec.key}"
+	cached = cache.get(cache_key)
+	if cached is not None:
+		variants = {variant.pk: variant for variant in base_queryset.filter(pk__in=cached["ids"])}
+		object_list = [variants[pk] for pk in cached["ids"] if pk in variants]
+		result_count = ResultCount(*cached["count"])
+		if cached["page"] is None:
+			page_obj = KeysetPage(object_list, **cached["keyset"])
+		else:
+			paginator = CountedPaginator(
+				filtered_queryset.order_by(*ordering),
+				INVENTORY_PAGE_SIZE,
+				result_count=result_count,
+				rows_seen=cached.get("rows_seen", 0),
+			)
+			page_obj = Page(object_list, cached["page"], paginator)
+		return page_obj, cached["facets"], result_count
+
+	count_provider = InventoryCountProvider(version=get_version(INVENTORY))
+	engine = get_columnar_inventory()
+	if engine is not None:
+		filters = spec.as_selected_filters()
+		facets = engine.facets(filters, listing_type=listing_type)
+		result_count = count_provider.for_total(engine.count(filters, listing_type=listing_type))
+		page_obj = engine.paginate(
+			spec,
+			listing_type=listing_type,
+			queryset=base_queryset,
+			per_page=INVENTORY_PAGE_SIZE,
+			result_count=result_count,
+		)
+	else:
+		facets = load_inventory_facets(listing_type=listing_type, filters=spec.as_selected_filters(), queryset=base_queryset)
+		result_count = count_provider.count(filtered_queryset, f"{listing_type or ''}:{spec.filter_key}")
+		if spec.page:
+			# Offset paging is kept for links that already carry a page number.
+			paginator = CountedPaginator(filtered_queryset.order_by(*ordering), INVENTORY_PAGE_SIZE, result_count=result_count)
+			page_obj = paginator.get_page(spec.page)
+		else:
+			page_obj = paginate_by_keyset(
+				filtered_queryset,
+				field=sort_field,
+				descending=sort_descending,
+				sort=spec.sort,
+				cursor=spec.cursor,
+				per_page=INVENTORY_PAGE_SIZE,
+			)
+
+	if not getattr(page_obj, "is_keyset", False):
+		state = {"page": page_obj.number, "rows_seen": page_obj.paginator.rows_seen, "keyset": None}
+	else:
+		state = {
+			"page": None,
+			"keyset": {
+				"offset": page_obj.offset,
+				"per_page": page_obj.per_page,
+				"has_next": page_obj.has_next(),
+				"has_previous": page_obj.has_previous(),
+				"next_cursor": page_obj.next_cursor,
+				"previous_cursor": page_obj.previous_cursor,
+			},
 		}
-		for body_value, body_label in CarModel.BodyType.choices
-		if category_counts.get(body_value, 0) > 0
-	]
 
-	transmission_counts = {
-		entry["transmission"]: entry["total"]
-		for entry in base_queryset.values("transmission").annotate(total=Count("id"))
-	}
-	available_transmissions = [
+	cache.set(
+		cache_key,
 		{
-			"value": transmission_value,
-			"label": CarVariant.Transmission(transmission_value).label,
-			"count": transmission_counts.get(transmission_value, 0),
-		}
-		for transmission_value, _ in CarVariant.Transmission.choices
-		if transmission_counts.get(transmission_value, 0) > 0
+			"ids": [variant.pk for variant in page_obj.object_list],
+			"facets": facets,
+			"count": (result_count.value, result_count.is_estimate),
+			**state,
+		},
+		getattr(settings, "TODDE_INVENTORY_PAGE_CACHE_TIMEOUT", 600),
+	)
+	return page_obj, facets, result_count
+
+
+def _build_pagination_links(spec: InventoryFilterSpec, page_obj) -> tuple[SimpleNamespace, list | None]:
+	if getattr(page_obj, "is_keyset", False):
+		links = SimpleNamespace(
+			first=_inventory_link(spec, page=None, cursor=None),
+			previous=_inventory_link(spec, cursor=page_obj.previous_cursor) if page_obj.previous_cursor else None,
+			next=_inventory_link(spec, cursor=page_obj.next_cursor) if page_obj.next_cursor else None,
+		)
+		return links, None
+
+	links = SimpleNamespace(
+		first=_inventory_page_link(spec, 1),
+		previous=_inventory_page_link(spec, page_obj.previous_page_number()) if page_obj.has_previous() else None,
+		next=_inventory_page_link(spec, page_obj.next_page_number()) if page_obj.has_next() else None,
+	)
+	page_range = [
+		SimpleNamespace(
+			number=number,
+			url=None if number == page_obj.paginator.ELLIPSIS else _inventory_page_link(spec, number),
+		)
+		for number in page_obj.paginator.get_elided_page_range(page_obj.number, on_each_side=2, on_ends=1)
 	]
+	return links, page_range
 
-	# Get available manufacturers
-	manufacturer_counts = {
-		entry["model__manufacturer__id"]: {
-			"name": entry["model__manufacturer__name"],
-			"count": entry["total"]
-		}
-		for entry in base_queryset.values("model__manufacturer__id", "model__manufacturer__name").annotate(total=Count("id"))
-		if entry["model__manufacturer__id"]
-	}
-	available_manufacturers = [
+
+def _histogram_payload(bins) -> list[dict[str, object]]:
+	"""JSON-ready histogram bins; ``percent`` is the bar height relative to the fullest bin."""
+	fullest = max((histogram_bin.count for histogram_bin in bins), default=0)
+	return [
 		{
-			"value": manufacturer_id,
-			"label": manufacturer_data["name"],
-			"count": manufacturer_data["count"],
+			"min": None if histogram_bin.lower is None else int(histogram_bin.lower),
+			"max": None if histogram_bin.upper is None else int(histogram_bin.upper),
+			"label": histogram_bin.label,
+			"count": histogram_bin.count,
+			"percent": round(histogram_bin.count * 100 / fullest) if fullest else 0,
 		}
-		for manufacturer_id, manufacturer_data in manufacturer_counts.items()
+		for histogram_bin in bins
 	]
-	available_manufacturers.sort(key=lambda x: x["label"])
-
-	# Get available models (optionally filtered by manufacturer)
-	model_queryset = base_queryset
-	selected_manufacturer = request.GET.get("manufacturer")
-	if selected_manufacturer:
-		try:
-			manufacturer_id = int(selected_manufacturer)
-			model_queryset = model_queryset.filter(model__manufacturer__id=manufacturer_id)
-		except (ValueError, TypeError):
-			pass
-	
-	model_counts = {
-		entry["model__id"]: {
-			"name": entry["model__name"],
-			"manufacturer": entry["model__manufacturer__name"],
-			"count": entry["total"]
-		}
-		for entry in model_queryset.values("model__id", "model__name", "model__manufacturer__name").annotate(total=Count("id"))
-		if entry["model__id"]
-	}
-	available_models = [
-		{
-			"value": model_id,
-			"label": f"{model_data['manufacturer']} {model_data['name']}",
-			"count": model_data["count"],
-		}
-		for model_id, model_data in model_counts.items()
+
+
+def _relaxation_links(spec: InventoryFilterSpec, *, listing_type: str | None) -> list[SimpleNamespace]:
+	"""Links that each loosen one filter of an empty result, with the cars each would show.
+
+	Counted by the columnar engine when it is enabled, otherwise in a single
+	conditional aggregate over the listings.
+	"""
+	relaxations = spec.relaxations()
+	if not relaxations:
+		return []
+	engine = get_columnar_inventory()
+	if engine is not None:
+		counts = [engine.count(relaxed.as_selected_filters(), listing_type=listing_type) for _, relaxed in relaxations]
+	else:
+		totals = _inventory_queryset(listing_type=listing_type).aggregate(
+			**{
+				f"relaxation_{index}": Count("pk", filter=relaxed.filter_q() or None)
+				for index, (_, relaxed) in enumerate(relaxations)
+			}
+		)
+		counts = [totals[f"relaxation_{index}"] for index in range(len(relaxations))]
+	return [
+		SimpleNamespace(label=label, count=count, url=_inventory_link(relaxed))
+		for (label, relaxed), count in zip(relaxations, counts)
+		if count
 	]
-	available_models.sort(key=lambda x: x["label"])
-
-	selected_filters: dict[str, object] = {}
-	filtered_queryset = base_queryset
-
-	price_min = _parse_decimal(request.GET.get("price_min"))
-	price_max = _parse_decimal(request.GET.get("price_max"))
-	if price_min is not None:
-		filtered_queryset = filtered_queryset.filter(price__gte=price_min)
-		selected_filters["price_min"] = price_min
-	if price_max is not None:
-		filtered_queryset = filtered_queryset.filter(price__lte=price_max)
-		selected_filters["price_max"] = price_max
-
-	year_min = _parse_int(request.GET.get("year_min"))
-	year_max = _parse_int(request.GET.get("year_max"))
-	if year_min is not None:
-		filtered_queryset = filtered_queryset.filter(year__gte=year_min)
-		selected_filters["year_min"] = year_min
-	if year_max is not None:
-		filtered_queryset = filtered_queryset.filter(year__lte=year_max)
-		selected_filters["year_max"] = year_max
-
-	category_value = request.GET.get("category")
-	if category_value in dict(CarModel.BodyType.choices):
-		filtered_queryset = filtered_queryset.filter(model__body_type=category_value)
-		selected_filters["category"] = category_value
-
-	transmission_values = [value for value in request.GET.getlist("transmission") if value in dict(CarVariant.Transmission.choices)]
-	if transmission_values:
-		filtered_queryset = filtered_queryset.filter(transmission__in=transmission_values)
-		selected_filters["transmission"] = transmission_values
-
-	# Manufacturer filtering
-	manufacturer_id = _parse_int(request.GET.get("manufacturer"))
-	if manufacturer_id is not None:
-		filtered_queryset = filtered_queryset.filter(model__manufacturer__id=manufacturer_id)
-		selected_filters["manufacturer"] = manufacturer_id
-
-	# Model filtering
-	model_id = _parse_int(request.GET.get("model"))
-	if model_id is not None:
-		filtered_queryset = filtered_queryset.filter(model__id=model_id)
-		selected_filters["model"] = model_id
-
-	# Exact year filtering (different from year range)
-	year = _parse_int(request.GET.get("year"))
-	if year is not None:
-		filtered_queryset = filtered_queryset.filter(year=year)
-		selected_filters["year"] = year
-
-	# Special handling for electric vehicles (for now, filter by model names containing "electric" keywords)
-	electric_filter = request.GET.get("electric")
-	if electric_filter == "true":
-		# Filter by models that are likely electric (Tesla, Nissan Leaf, etc.)
-		electric_keywords = ["tesla", "leaf", "bolt", "i3", "i8", "model s", "model 3", "model x", "model y", "prius"]
-		electric_q = Q()
-		for keyword in electric_keywords:
-			electric_q |= Q(model__name__icontains=keyword) | Q(model__manufacturer__name__icontains=keyword)
-		filtered_queryset = filtered_queryset.filter(electric_q)
-		selected_filters["electric"] = "true"
-
-	# Listing type filtering (when passed as URL parameter)
-	listing_type_param = request.GET.get("listing_type")
-	if listing_type_param in dict(CarVariant.ListingType.choices):
-		filtered_queryset = filtered_queryset.filter(listing_type=listing_type_param)
-		selected_filters["listing_type"] = listing_type_param
-
-	sort_key = request.GET.get("sort", "price_low_high")
-	sort_mappings = {
-		"price_low_high": "price",
-		"price_high_low": "-price",
-		"year_new_old": "-year",
-		"year_old_new": "year",
-	}
-	ordering = sort_mappings.get(sort_key, "price")
-	selected_filters["sort"] = sort_key if sort_key in sort_mappings else "price_low_high"
 
-	filtered_queryset = filtered_queryset.order_by(ordering, "model__manufacturer__name")
 
-	paginator = Paginator(filtered_queryset, 12)
-	page_number = request.GET.get("page")
-	page_obj = paginator.get_page(page_number)
+def _build_inventory_results_context(spec: InventoryFilterSpec, *, listing_type: str | None) -> dict[str, object]:
+	"""Context for the parts of an inventory page that change with the filters."""
+	selected_filters = spec.as_selected_filters()
+	page_obj, facets, result_count = _load_inventory_results(spec, listing_type=listing_type)
+	selected_filters["sort"] = spec.sort
+	pagination_links, page_range = _build_pagination_links(spec, page_obj)
+	relaxations = _relaxation_links(spec, listing_type=listing_type) if result_count.value == 0 else []
+	histograms = {
+		"price": _histogram_payload(facets.price_histogram),
+		"year": _histogram_payload(facets.year_histogram),
+	}
 
-	encoded_filters = _encode_filters({k: v for k, v in selected_filters.items() if k != "sort"})
+	return {
+		"page_obj": page_obj,
+		"page_range": page_range,
+		"relaxations": relaxations,
+		"total_results": result_count.value,
+		"result_count": result_count,
+		"facets": facets,
+		"available_stats": facets.stats,
+		"available_categories": facets.categories,
+		"available_transmissions": facets.transmissions,
+		"available_manufacturers": facets.manufacturers,
+		"available_models": facets.models,
+		"available_powertrains": facets.powertrains,
+		"histograms": histograms,
+		"price_histogram": histograms["price"],
+		"year_histogram": histograms["year"],
+		"selected_filters": selected_filters,
+		"selected_category": selected_filters.get("category"),
+		"selected_transmissions": selected_filters.get("transmission", []),
+		"selected_manufacturer": selected_filters.get("manufacturer"),
+		"selected_model": selected_filters.get("model"),
+		"selected_powertrain": selected_filters.get("powertrain"),
+		"selected_sort": spec.sort,
+		"filters_querystring": urlencode(spec.filter_params()),
+		"pagination_links": pagination_links,
+		"clear_filters_url": _inventory_link(InventoryFilterSpec(sort=spec.sort)),
+		"sort_options": SORT_OPTIONS,
+	}
 
-	placeholder_image_url = static("images/vehicle-placeholder.svg")
-	for variant in page_obj:
-		image_info = _resolve_variant_primary_image(variant, placeholder_image_url)
-		variant.display_image = image_info.source_url
-		variant.display_image_url = image_info.source_url
-		variant.display_image_alt = image_info.alt_text or f"{variant.model.manufacturer.name} {variant.model.name}"
-		variant.display_image_is_placeholder = image_info.is_placeholder
+
+def _build_inventory_context(
+	request,
+	*,
+	spec: InventoryFilterSpec,
+	listing_type: str | None,
+	page_slug: str,
+	results_url: str,
+	count_url: str,
+	default_page_title: str,
+	default_intro_text: str,
+	default_meta_title: str,
+	default_meta_description: str,
+	default_page_kicker: str = "Inventory",
+	default_summary_badge_label: str = "vehicles available",
+):
+	results = _build_inventory_results_context(spec, listing_type=listing_type)
+	selected_filters = results["selected_filters"]
 
 	# Generate dynamic title based on filters
 	dynamic_title = _generate_dynamic_title(selected_filters, default_page_title)
@@ -704,7 +601,7 @@ def _build_inventory_context(
 	# Check if we have any filters that would make the title dynamic
 	has_filters = bool(
 		selected_filters.get("category") or 
-		selected_filters.get("electric") or 
+		selected_filters.get("powertrain") or 
 		selected_filters.get("manufacturer") or 
 		selected_filters.get("model") or 
 		selected_filters.get("year") or
@@ -728,31 +625,13 @@ def _build_inventory_context(
 	)
 
 	context = {
-		"nav_links": NavigationLink.objects.filter(is_active=True),
 		"meta": {
 			"title": copy["meta_title"],
 			"description": copy["meta_description"],
 		},
-		"page_obj": page_obj,
-		"total_results": paginator.count,
-		"available_stats": available_stats,
-		"available_categories": available_categories,
-		"available_transmissions": available_transmissions,
-		"available_manufacturers": available_manufacturers,
-		"available_models": available_models,
-		"selected_filters": selected_filters,
-		"selected_category": selected_filters.get("category"),
-		"selected_transmissions": selected_filters.get("transmission", []),
-		"selected_manufacturer": selected_filters.get("manufacturer"),
-		"selected_model": selected_filters.get("model"),
-		"selected_sort": selected_filters.get("sort", "price_low_high"),
-		"filters_querystring": encoded_filters,
-		"sort_options": [
-			{"value": "price_low_high", "label": "Price: Low to High"},
-			{"value": "price_high_low", "label": "Price: High to Low"},
-			{"value": "year_new_old", "label": "Year: New to Old"},
-			{"value": "year_old_new", "label": "Year: Old to New"},
-		],
+		**results,
+		"results_url": results_url,
+		"count_url": count_url,
 		"page_kicker": copy["page_kicker"],
 		"page_title": copy["page_title"],
 		"intro_text": copy["intro_text"],
@@ -762,40 +641,16 @@ def _build_inventory_context(
 	return context
 
 
+@page_condition
 def all_cars(request):
+	spec = InventoryFilterSpec.from_querydict(request.GET)
+	redirect = _canonical_inventory_redirect(request, spec)
+	if redirect is not None:
+		return redirect
+
 	# Get selected filters for dynamic content
-	selected_filters = {}
-	
-	# Category filtering
-	category_value = request.GET.get("category")
-	if category_value in dict(CarModel.BodyType.choices):
-		selected_filters["category"] = category_value
-	
-	# Electric vehicle filtering
-	electric_filter = request.GET.get("electric")
-	if electric_filter == "true":
-		selected_filters["electric"] = "true"
-	
-	# Manufacturer filtering
-	manufacturer_id = _parse_int(request.GET.get("manufacturer"))
-	if manufacturer_id is not None:
-		selected_filters["manufacturer"] = manufacturer_id
-	
-	# Model filtering
-	model_id = _parse_int(request.GET.get("model"))
-	if model_id is not None:
-		selected_filters["model"] = model_id
-	
-	# Year filtering
-	year = _parse_int(request.GET.get("year"))
-	if year is not None:
-		selected_filters["year"] = year
-	
-	# Listing type filtering
-	listing_type_value = request.GET.get("listing_type")
-	if listing_type_value in dict(CarVariant.ListingType.choices):
-		selected_filters["listing_type"] = listing_type_value
-	
+	selected_filters = spec.as_selected_filters()
+
 	# Generate dynamic content
 	default_title = "All Cars"
 	default_intro = "Discover certified cars inspected by Todde. Use the filters to zero in on the right price, year, transmission, or body style."
@@ -808,8 +663,11 @@ def all_cars(request):
 	
 	context = _build_inventory_context(
 		request,
+		spec=spec,
 		listing_type=context_listing_type,
 		page_slug=InventoryPageConfig.Slug.ALL,
+		results_url=reverse("marketing:all_cars_results"),
+		count_url=reverse("marketing:all_cars_count"),
 		default_page_title=dynamic_title,
 		default_intro_text=dynamic_intro,
 		default_meta_title="Todde Inventory | Browse certified cars",
@@ -818,11 +676,20 @@ def all_cars(request):
 	return render(request, "marketing/inventory.html", context)
 
 
+@page_condition
 def registered_cars(request):
+	spec = InventoryFilterSpec.from_querydict(request.GET)
+	redirect = _canonical_inventory_redirect(request, spec)
+	if redirect is not None:
+		return redirect
+
 	context = _build_inventory_context(
 		request,
+		spec=spec,
 		listing_type=CarVariant.ListingType.REGISTERED,
 		page_slug=InventoryPageConfig.Slug.REGISTERED,
+		results_url=reverse("marketing:registered_cars_results"),
+		count_url=reverse("marketing:registered_cars_count"),
 		default_page_title="Registered Cars",
 		default_intro_text="Browse Nigerian-registered vehicles with verified history and trusted ownership records.",
 		default_meta_title="Todde Registered Cars | Locally owned, certified inventory",
@@ -832,11 +699,20 @@ def registered_cars(request):
 	return render(request, "marketing/inventory.html", context)
 
 
+@page_condition
 def foreign_used_cars(request):
+	spec = InventoryFilterSpec.from_querydict(request.GET)
+	redirect = _canonical_inventory_redirect(request, spec)
+	if redirect is not None:
+		return redirect
+
 	context = _build_inventory_context(
 		request,
+		spec=spec,
 		listing_type=CarVariant.ListingType.FOREIGN_USED,
 		page_slug=InventoryPageConfig.Slug.FOREIGN_USED,
+		results_url=reverse("marketing:foreign_used_cars_results"),
+		count_url=reverse("marketing:foreign_used_cars_count"),
 		default_page_title="Foreign Used Cars",
 		default_intro_text="Shop Tokunbo cars sourced from top international auctions, freshly inspected by Todde.",
 		default_meta_title="Todde Foreign Used Cars | Tokunbo vehicles you can trust",
@@ -846,6 +722,90 @@ def foreign_used_cars(request):
 	return render(request, "marketing/inventory.html", context)
 
 
+@require_GET
+@inventory_condition
+def inventory_results(request, listing_type: str | None = None):
+	"""Results grid, pagination and facet counts for in-page filtering.
+
+	Returns only what changes when a filter changes, so the inventory pages can
+	update without re-rendering the header, footer and filter copy.
+	"""
+	spec = InventoryFilterSpec.from_querydict(request.GET)
+	context = _build_inventory_results_context(spec, listing_type=listing_type or spec.listing_type)
+	return JsonResponse(
+		{
+			"query": spec.querystring(),
+			"count": _count_payload(context["result_count"]),
+			"facets": _facet_counts_payload(context["facets"]),
+			"histograms": context["histograms"],
+			"html": render_to_string("marketing/partials/inventory_results.html", context),
+		}
+	)
+
+
+def _count_payload(result_count: ResultCount) -> dict[str, object]:
+	return {
+		"value": result_count.value,
+		"is_estimate": result_count.is_estimate,
+		"display": result_count.display,
+	}
+
+
+def _facet_counts_payload(facets) -> dict[str, dict[str, int]]:
+	"""Result count per facet option, keyed by the option's form value."""
+	return {
+		name: {str(option.value): option.count for option in getattr(facets, name)}
+		for name in ("categories", "transmissions", "manufacturers", "models", "powertrains")
+	}
+
+
+def _load_inventory_preview(spec: InventoryFilterSpec, *, listing_type: str | None):
+	"""Return the result count and facets for ``spec`` without loading a page.
+
+	Answered by the columnar engine when it is enabled, otherwise from the facet
+	buckets and the cached count, and cached per filter selection either way.
+	"""
+	version = get_version(INVENTORY)
+	cache_key = f"marketing:inventory-preview:{version}:{listing_type or ''}:{spec.filter_key}"
+	cached = cache.get(cache_key)
+	if cached is not None:
+		return cached
+
+	count_provider = InventoryCountProvider(version=version)
+	filters = spec.as_selected_filters()
+	engine = get_columnar_inventory()
+	if engine is not None:
+		result_count = count_provider.for_total(engine.count(filters, listing_type=listing_type))
+		facets = engine.facets(filters, listing_type=listing_type)
+	else:
+		base_queryset = _inventory_queryset(listing_type=listing_type)
+		result_count = count_provider.count(spec.filter_queryset(base_queryset), f"{listing_type or ''}:{spec.filter_key}")
+		facets = load_inventory_facets(listing_type=listing_type, filters=filters, queryset=base_queryset)
+	preview = (result_count, facets)
+	cache.set(cache_key, preview, getattr(settings, "TODDE_INVENTORY_PAGE_CACHE_TIMEOUT", 600))
+	return preview
+
+
+@require_GET
+@inventory_condition
+def inventory_count(request, listing_type: str | None = None):
+	"""Matching count and facet counts for a filter selection.
+
+	Lets the filter form preview "Show 37 cars" on every change without
+	rendering or paginating any results.
+	"""
+	spec = InventoryFilterSpec.from_querydict(request.GET)
+	result_count, facets = _load_inventory_preview(spec, listing_type=listing_type or spec.listing_type)
+	return JsonResponse(
+		{
+			"query": spec.querystring(),
+			"count": _count_payload(result_count),
+			"facets": _facet_counts_payload(facets),
+		}
+	)
+
+
+@variant_page_condition
 def vehicle_detail(request, variant_id: int):
 	variant_queryset = (
 		CarVariant.objects.filter(
@@ -926,12 +886,11 @@ def vehicle_detail(request, variant_id: int):
 	]
 
 	related_variants = (
-		CarVariant.objects.filter(
-			is_active=True,
-			model__manufacturer=variant.model.manufacturer,
+		CarVariantListing.objects.filter(
+			is_visible=True,
+			manufacturer_id=variant.model.manufacturer_id,
 		)
 		.exclude(pk=variant.pk)
-		.select_related("model", "model__manufacturer")
 		.order_by("-year")[:3]
 	)
 
@@ -943,7 +902,7 @@ def vehicle_detail(request, variant_id: int):
 		}
 		for value, label in CarModel.BodyType.choices
 	]
-	manufacturers = CarManufacturer.objects.filter(is_active=True).order_by("name")[:10]
+	manufacturers = list(get_catalogue().manufacturers.values())[:10]
 	recent_variants = (
 		CarVariant.objects.filter(is_active=True)
 		.select_related("model", "model__manufacturer")
@@ -951,7 +910,6 @@ def vehicle_detail(request, variant_id: int):
 	)
 
 	context = {
-		"nav_links": NavigationLink.objects.filter(is_active=True),
 		"variant": variant,
 		"detail": detail,
 		"gallery": gallery,
@@ -973,58 +931,62 @@ def vehicle_detail(request, variant_id: int):
 	return render(request, "marketing/vehicle_detail.html", context)
 
 
+def _resolve_catalogue_entry(kind: str, *, value: str | None, slug: str | None):
+	"""Find an active manufacturer or model by id (or slug) and/or explicit slug; both must agree."""
+	catalogue = get_catalogue()
+	candidates = []
+	if value:
+		candidates.append(getattr(catalogue, kind)(value))
+	if slug:
+		candidates.append(getattr(catalogue, f"{kind}_by_slug")(slug))
+	entry = candidates[0]
+	if entry is None or any(candidate != entry for candidate in candidates):
+		raise Http404(f"No active {kind} matches the request.")
+	return entry
+
+
+def _manufacturer_payload(manufacturer) -> dict[str, object]:
+	return {"id": manufacturer.id, "name": manufacturer.name, "slug": manufacturer.slug}
+
+
 @require_GET
+@inventory_condition
 def car_manufacturers_api(request):
-	manufacturers = CarManufacturer.objects.filter(is_active=True).order_by("name")
-	data = [
-		{"id": manufacturer.id, "name": manufacturer.name, "slug": manufacturer.slug}
-		for manufacturer in manufacturers
-	]
+	data = [_manufacturer_payload(manufacturer) for manufacturer in get_catalogue().manufacturers.values()]
 	return JsonResponse({"manufacturers": data})
 
 
 @require_GET
+@inventory_condition
 def car_models_api(request):
 	manufacturer_id = request.GET.get("manufacturer")
 	manufacturer_slug = request.GET.get("manufacturer_slug")
 	if not manufacturer_id and not manufacturer_slug:
 		return JsonResponse({"error": "Missing manufacturer parameter."}, status=400)
 
-	manufacturer_filters = {"is_active": True}
-	if manufacturer_id:
-		manufacturer_filters["pk"] = manufacturer_id
-	if manufacturer_slug:
-		manufacturer_filters["slug"] = manufacturer_slug
-
-	manufacturer = get_object_or_404(CarManufacturer, **manufacturer_filters)
-	models = manufacturer.models.filter(is_active=True).order_by("name")
+	manufacturer = _resolve_catalogue_entry("manufacturer", value=manufacturer_id, slug=manufacturer_slug)
 	data = [
 		{"id": model.id, "name": model.name, "slug": model.slug}
-		for model in models
+		for model in get_catalogue().models_for(manufacturer.id)
 	]
 	return JsonResponse(
 		{
-			"manufacturer": {"id": manufacturer.id, "name": manufacturer.name, "slug": manufacturer.slug},
+			"manufacturer": _manufacturer_payload(manufacturer),
 			"models": data,
 		}
 	)
 
 
 @require_GET
+@inventory_condition
 def car_variants_api(request):
 	model_id = request.GET.get("model")
 	model_slug = request.GET.get("model_slug")
 	if not model_id and not model_slug:
 		return JsonResponse({"error": "Missing model parameter."}, status=400)
 
-	model_filters = {"is_active": True, "manufacturer__is_active": True}
-	if model_id:
-		model_filters["pk"] = model_id
-	if model_slug:
-		model_filters["slug"] = model_slug
-
-	model = get_object_or_404(CarModel, **model_filters)
-	variants = model.variants.filter(is_active=True).order_by("-year", "trim")
+	model = _resolve_catalogue_entry("model", value=model_id, slug=model_slug)
+	variants = CarVariantListing.objects.filter(model_id=model.id, is_visible=True).order_by("-year", "trim")
 	data = [
 		{
 			"id": variant.id,
@@ -1042,11 +1004,7 @@ def car_variants_api(request):
 				"id": model.id,
 				"name": model.name,
 				"slug": model.slug,
-				"manufacturer": {
-					"id": model.manufacturer.id,
-					"name": model.manufacturer.name,
-					"slug": model.manufacturer.slug,
-				},
+				"manufacturer": _manufacturer_payload(model.manufacturer),
 			},
 			"variants": data,
 		}
@@ -1054,6 +1012,7 @@ def car_variants_api(request):
 
 
 @require_GET
+@inventory_condition
 def search_api(request):
 	query = request.GET.get("q", "").strip()
 	
@@ -1066,11 +1025,11 @@ def search_api(request):
 	# Search across manufacturers, models, and variants
 	results = []
 	
-	# Search manufacturers
-	manufacturers = CarManufacturer.objects.filter(
-		is_active=True,
-		name__icontains=query
-	).order_by("name")[:5]
+	# Search manufacturers and models in the catalogue registry
+	catalogue = get_catalogue()
+	needle = query.casefold()
+	all_cars_url = reverse("marketing:all_cars")
+	manufacturers = [entry for entry in catalogue.manufacturers.values() if needle in entry.name.casefold()][:5]
 	
 	for manufacturer in manufacturers:
 		results.append({
@@ -1078,66 +1037,62 @@ def search_api(request):
 			"id": manufacturer.id,
 			"title": manufacturer.name,
 			"subtitle": "Manufacturer",
-			"url": f"/cars/?manufacturer={manufacturer.slug}",
+			"url": f"{all_cars_url}?{InventoryFilterSpec(manufacturer=manufacturer.id).querystring()}",
 			"image": None
 		})
 	
-	# Search models
-	models = CarModel.objects.filter(
-		is_active=True,
-		manufacturer__is_active=True,
-		name__icontains=query
-	).select_related("manufacturer").order_by("name")[:5]
+	models = [entry for entry in catalogue.models.values() if needle in entry.name.casefold()][:5]
 	
 	for model in models:
 		results.append({
 			"type": "model",
 			"id": model.id,
-			"title": f"{model.manufacturer.name} {model.name}",
+			"title": model.full_name,
 			"subtitle": "Model",
-			"url": f"/cars/?model={model.slug}",
+			"url": f"{all_cars_url}?{InventoryFilterSpec(model=model.id).querystring()}",
 			"image": None
 		})
 	
 	# Search variants (cars)
-	variants = CarVariant.objects.filter(
-		is_active=True,
-		model__is_active=True,
-		model__manufacturer__is_active=True
-	).select_related("model", "model__manufacturer").prefetch_related(
-		Prefetch(
-			"images",
-			queryset=CarVariantImage.objects.filter(is_active=True).order_by("order", "id"),
-		)
-	)
-	
-	# Filter variants by manufacturer name, model name, year, or trim
-	from django.db.models import Q
-	variant_filter = (
-		Q(model__manufacturer__name__icontains=query) |
-		Q(model__name__icontains=query) |
+	variants = CarVariantListing.objects.filter(
+		Q(manufacturer_name__icontains=query) |
+		Q(model_name__icontains=query) |
 		Q(trim__icontains=query) |
-		Q(year__icontains=query)
-	)
-	
-	variants = variants.filter(variant_filter).order_by("-year", "model__manufacturer__name", "model__name")[:8]
-	
-	placeholder_image_url = static("images/vehicle-placeholder.svg")
+		Q(year__icontains=query),
+		is_visible=True,
+	).order_by("-year", "manufacturer_name", "model_name")[:8]
 	
 	for variant in variants:
-		# Get primary image
-		image_info = _resolve_variant_primary_image(variant, placeholder_image_url)
-		
 		results.append({
 			"type": "variant",
 			"id": variant.id,
-			"title": f"{variant.model.manufacturer.name} {variant.model.name} {variant.year}",
+			"title": f"{variant.manufacturer_name} {variant.model_name} {variant.year}",
 			"subtitle": f"{variant.trim} • {variant.formatted_price}",
 			"url": f"/cars/{variant.id}/",
-			"image": image_info.source_url if not image_info.is_placeholder else None
+			"image": variant.image_url or None
 		})
 	
 	# Limit total results
 	results = results[:10]
 	
 	return JsonResponse({"results": results})
+
+
+@require_GET
+@inventory_condition
+def inventory_export_api(request):
+	"""Stream the active inventory as CSV or JSON Lines, optionally gzipped."""
+	export_format = request.GET.get("format", "csv")
+	if export_format not in EXPORT_FORMATS:
+		return JsonResponse({"error": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}."}, status=400)
+	compress = request.GET.get("gzip") in ("1", "true")
+
+	filename = f"todde-inventory.{export_format}"
+	content_type = EXPORT_FORMATS[export_format]
+	if compress:
+		filename += ".gz"
+		content_type = "application/gzip"
+	chunks = export_inventory(export_format, compress=compress, base_url=request.build_absolute_uri("/").rstrip("/"))
+	response = StreamingHttpResponse(chunks, content_type=content_type)
+	response["Content-Disposition"] = f'attachment; filename="{filename}"'
+	return response
@@ -4,7 +4,6 @@
 document.addEventListener('DOMContentLoaded', function() {
     const manufacturerInputs = document.querySelectorAll('input[name="manufacturer"]');
     const modelSection = document.querySelector('.model-filter-section');
-    const form = document.querySelector('form[method="get"]');
     
     // Handle manufacturer selection to dynamically update models
     manufacturerInputs.forEach(input => {
@@ -52,15 +51,219 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    // Auto-submit form when filters change (optional enhancement)
-    const autoSubmitInputs = document.querySelectorAll('select[name="sort"]');
-    autoSubmitInputs.forEach(input => {
-        input.addEventListener('change', function() {
-            if (form) {
-                form.submit();
+    // Refresh results in place when filters change
+    const filterForm = document.querySelector('form[data-inventory-filters]');
+    const resultsContainer = document.querySelector('[data-inventory-results]');
+    const countBadge = document.querySelector('[data-inventory-count]');
+    const resultsUrl = filterForm ? filterForm.dataset.resultsUrl : '';
+    let pendingRequest = null;
+
+    function filterQuery(extra) {
+        const params = new URLSearchParams(new FormData(filterForm));
+        const sortSelect = resultsContainer.querySelector('select[name="sort"]');
+        if (sortSelect) {
+            params.set('sort', sortSelect.value);
+        }
+        Object.entries(extra || {}).forEach(([key, value]) => params.set(key, value));
+        return params.toString();
+    }
+
+    function updateFacetCounts(facets) {
+        const inputNames = {
+            categories: 'category',
+            transmissions: 'transmission',
+            manufacturers: 'manufacturer',
+            models: 'model',
+            powertrains: 'powertrain',
+        };
+        Object.entries(inputNames).forEach(([facet, inputName]) => {
+            const counts = facets[facet] || {};
+            filterForm.querySelectorAll(`input[name="${inputName}"]`).forEach(input => {
+                const countLabel = input.closest('label') && input.closest('label').querySelector('span.text-xs');
+                if (countLabel) {
+                    countLabel.textContent = `(${counts[input.value] || 0})`;
+                }
+            });
+        });
+    }
+
+    // Price and year histograms: bar heights, click-to-select and range estimates
+    const histogramData = document.getElementById('inventory-histograms');
+    let histograms = histogramData ? JSON.parse(histogramData.textContent) : {};
+    const histogramInputs = {
+        price: ['price_min', 'price_max'],
+        year: ['year_min', 'year_max'],
+    };
+
+    function renderHistograms() {
+        Object.keys(histogramInputs).forEach(name => {
+            const container = document.querySelector(`[data-histogram="${name}"]`);
+            if (!container) {
+                return;
             }
+            container.innerHTML = (histograms[name] || []).map(bin => `
+                <button
+                    type="button"
+                    data-histogram-bin
+                    data-min="${bin.min === null ? '' : bin.min}"
+                    data-max="${bin.max === null ? '' : bin.max}"
+                    title="${bin.label}: ${bin.count}"
+                    style="height: ${bin.percent || 2}%"
+                    class="min-h-[2px] flex-1 rounded-t bg-todde-blue/25 transition hover:bg-todde-blue/60"
+                ></button>
+            `).join('');
+            updateHistogramEstimate(name);
         });
-    });
+    }
+
+    function updateHistogramEstimate(name) {
+        const estimate = document.querySelector(`[data-histogram-estimate="${name}"]`);
+        const [minName, maxName] = histogramInputs[name];
+        const minInput = document.querySelector(`input[name="${minName}"]`);
+        const maxInput = document.querySelector(`input[name="${maxName}"]`);
+        if (!estimate || !minInput || !maxInput) {
+            return;
+        }
+        if (!minInput.value && !maxInput.value) {
+            estimate.textContent = '';
+            return;
+        }
+        const low = minInput.value ? parseFloat(minInput.value) : -Infinity;
+        const high = maxInput.value ? parseFloat(maxInput.value) : Infinity;
+        // Bins that overlap the range; the edge bins may only partly match.
+        const total = (histograms[name] || [])
+            .filter(bin => (bin.max === null || bin.max > low) && (bin.min === null || bin.min <= high))
+            .reduce((sum, bin) => sum + bin.count, 0);
+        estimate.textContent = `Up to ${total} matching car${total === 1 ? '' : 's'}`;
+    }
+
+    // Live "Show N cars" preview while the range inputs are being edited
+    const countUrl = filterForm ? filterForm.dataset.countUrl : '';
+    const applyButton = filterForm ? filterForm.querySelector('[data-inventory-apply]') : null;
+    const applyLabel = applyButton ? applyButton.textContent : '';
+    let previewTimer = null;
+    let pendingPreview = null;
+
+    async function previewCount() {
+        if (pendingPreview) {
+            pendingPreview.abort();
+        }
+        pendingPreview = new AbortController();
+        try {
+            const response = await fetch(`${countUrl}?${filterQuery()}`, {
+                headers: { 'Accept': 'application/json' },
+                signal: pendingPreview.signal,
+            });
+            if (!response.ok) {
+                throw new Error(`Unexpected status ${response.status}`);
+            }
+            const data = await response.json();
+            applyButton.textContent = `Show ${data.count.display} car${data.count.value === 1 ? '' : 's'}`;
+            updateFacetCounts(data.facets);
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                applyButton.textContent = applyLabel;
+            }
+        }
+    }
+
+    async function refreshResults(query) {
+        if (pendingRequest) {
+            pendingRequest.abort();
+        }
+        pendingRequest = new AbortController();
+        try {
+            const response = await fetch(`${resultsUrl}?${query}`, {
+                headers: { 'Accept': 'application/json' },
+                signal: pendingRequest.signal,
+            });
+            if (!response.ok) {
+                throw new Error(`Unexpected status ${response.status}`);
+            }
+            const data = await response.json();
+            resultsContainer.innerHTML = data.html;
+            if (countBadge) {
+                countBadge.textContent = data.count.display;
+            }
+            updateFacetCounts(data.facets);
+            if (applyButton) {
+                applyButton.textContent = applyLabel;
+            }
+            if (data.histograms) {
+                histograms = data.histograms;
+                renderHistograms();
+            }
+            window.history.replaceState(null, '', data.query ? `?${data.query}` : window.location.pathname);
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                window.location.search = query;
+            }
+        }
+    }
+
+    if (filterForm) {
+        filterForm.addEventListener('input', function(event) {
+            Object.entries(histogramInputs).forEach(([name, inputs]) => {
+                if (inputs.includes(event.target.name)) {
+                    updateHistogramEstimate(name);
+                }
+            });
+            // Checkboxes and radios refresh the results directly on change.
+            if (countUrl && applyButton && resultsContainer && !event.target.matches('input[type="checkbox"], input[type="radio"]')) {
+                clearTimeout(previewTimer);
+                previewTimer = setTimeout(previewCount, 150);
+            }
+        });
+        filterForm.addEventListener('click', function(event) {
+            const bar = event.target.closest('[data-histogram-bin]');
+            if (!bar) {
+                return;
+            }
+            const name = bar.parentElement.dataset.histogram;
+            const [minName, maxName] = histogramInputs[name];
+            // Bin upper bounds are exclusive while the max filters are inclusive.
+            filterForm.querySelector(`input[name="${minName}"]`).value = bar.dataset.min;
+            filterForm.querySelector(`input[name="${maxName}"]`).value = bar.dataset.max ? parseInt(bar.dataset.max, 10) - 1 : '';
+            updateHistogramEstimate(name);
+            filterForm.requestSubmit();
+        });
+        Object.keys(histogramInputs).forEach(updateHistogramEstimate);
+    }
+
+    if (filterForm && resultsContainer && resultsUrl) {
+        filterForm.addEventListener('change', function(event) {
+            if (event.target.matches('input[type="checkbox"], input[type="radio"]')) {
+                refreshResults(filterQuery());
+            }
+        });
+        filterForm.addEventListener('submit', function(event) {
+            if (event.submitter && event.submitter.name) {
+                return;
+            }
+            event.preventDefault();
+            refreshResults(filterQuery());
+        });
+        resultsContainer.addEventListener('change', function(event) {
+            if (event.target.matches('select[name="sort"]')) {
+                refreshResults(filterQuery());
+            }
+        });
+        resultsContainer.addEventListener('click', function(event) {
+            const link = event.target.closest('a[href^="?"]');
+            if (!link || link.closest('article')) {
+                return;
+            }
+            event.preventDefault();
+            refreshResults(link.getAttribute('href').slice(1));
+            resultsContainer.scrollIntoView({ behavior: 'smooth', block: 'start' });
+        });
+    } else {
+        document.querySelectorAll('select[name="sort"]').forEach(input => {
+            input.addEventListener('change', function() {
+                this.form.submit();
+            });
+        });
+    }
     
     // Price range validation
     const priceMinInput = document.querySelector('input[name="price_min"]');
@@ -92,6 +92,36 @@ DATABASES = {
 }
 
 
+# Cache
+# Version counters and cached inventory data must be shared by every worker, so
+# production should point REDIS_URL at a Redis instance. Without it, production
+# falls back to a database table (create it with ``manage.py createcachetable``)
+# rather than a per-process cache that would let workers drift apart; only the
+# development server keeps everything in memory.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'todde_cache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -137,3 +167,33 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Inventory listings
+
+# Above this many matches the listing pages show an estimate ("1,000+") instead
+# of running an exact COUNT. Set to None to always count exactly.
+TODDE_INVENTORY_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('TODDE_INVENTORY_COUNT_ESTIMATE_THRESHOLD', '1000')) or None
+TODDE_INVENTORY_COUNT_CACHE_TIMEOUT = 600
+TODDE_INVENTORY_PAGE_CACHE_TIMEOUT = 600
+
+# "columnar" answers inventory filters, sorting and facets from an in-memory
+# column snapshot per worker (requires NumPy); "orm" queries the database.
+TODDE_INVENTORY_ENGINE = os.environ.get('TODDE_INVENTORY_ENGINE', 'orm')
+# When set, the columnar engine writes one snapshot file per inventory version
+# here and every worker process memory-maps it instead of loading its own copy.
+TODDE_INVENTORY_SNAPSHOT_DIR = os.environ.get('TODDE_INVENTORY_SNAPSHOT_DIR') or None
+
+# Conditional GET
+
+# Mixed into every ETag, so a deploy that changes templates invalidates browser
+# and crawler caches even when no content version has moved.
+TODDE_RELEASE = os.environ.get('TODDE_RELEASE', '')
+
+# Anonymous homepage responses are cached whole under their ETag, so content
+# saves purge them implicitly; this only bounds how long unused entries live.
+TODDE_PAGE_CACHE_TIMEOUT = 3600
+
+# Static export written by the prerender_pages command, for the web server or a
+# CDN to answer anonymous requests without reaching Django.
+TODDE_PRERENDER_DIR = os.environ.get('TODDE_PRERENDER_DIR') or None